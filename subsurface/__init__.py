@@ -1,18 +1,29 @@
-import subsurface.modules.reader
-import subsurface.api.interfaces
-import subsurface.modules.writer
+import importlib
+from datetime import datetime
+
 from . import core
-from .modules import visualization
 from subsurface.core.structs import *
-from datetime import datetime
-import dotenv
 
-dotenv.load_dotenv()
+# Subpackages that pull in optional backends (pyvista/VTK, matplotlib, omf...)
+# are only imported on first access, e.g. `subsurface.visualization`.
+_LAZY_SUBMODULES = {
+        "api"          : "subsurface.api",
+        "modules"      : "subsurface.modules",
+        "visualization": "subsurface.modules.visualization",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_SUBMODULES[name])
+    globals()[name] = module
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
 
-try:
-    from subsurface import visualization
-except ImportError:
-    pass
 
 # Version.
 try:
@@ -0,0 +1,100 @@
+"""Assignment of depth intervals (e.g. lithologies) to the stations of many wells.
+
+Vertices and intervals are matched per well. Both are sorted by (well, depth)
+so every interval covers a contiguous run of the sorted vertices, which is found
+with two binary searches, instead of one full-length mask per interval. The
+runs are then expanded to find the last interval of every vertex, so the cost
+is O((V + I) log(V + I) + M) time and O(V + I + M) memory, where M is the number
+of (vertex, interval) matches: about V unless the intervals overlap heavily.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+__all__ = ['IntervalAssignment', 'assign_intervals']
+
+
+@dataclass
+class IntervalAssignment:
+    """Result of `assign_intervals`.
+
+    Attributes:
+        interval (np.ndarray): NDArray[(n_vertex,), IntX] position of the interval
+         assigned to each vertex or -1 if the vertex falls in none. If several
+         intervals contain a vertex the last one wins.
+        n_intervals (np.ndarray): NDArray[(n_vertex,), IntX] number of intervals
+         containing each vertex
+    """
+    interval: np.ndarray
+    n_intervals: np.ndarray
+
+    @property
+    def unassigned(self) -> np.ndarray:
+        """Indices of the vertices that are not in any interval."""
+        return np.flatnonzero(self.n_intervals == 0)
+
+    @property
+    def overlapping(self) -> np.ndarray:
+        """Indices of the vertices that are in more than one interval."""
+        return np.flatnonzero(self.n_intervals > 1)
+
+
+def assign_intervals(vertex_well: np.ndarray, vertex_depth: np.ndarray,
+                     interval_well: np.ndarray, interval_bottom: np.ndarray,
+                     interval_top: np.ndarray) -> IntervalAssignment:
+    """Find the interval ``bottom <= depth <= top`` of the same well for every vertex.
+
+    Args:
+        vertex_well (np.ndarray): NDArray[(n_vertex,), IntX] well of each vertex
+        vertex_depth (np.ndarray): NDArray[(n_vertex,), FloatX]
+        interval_well (np.ndarray): NDArray[(n_intervals,), IntX] well of each interval
+        interval_bottom (np.ndarray): NDArray[(n_intervals,), FloatX] lowest depth of the interval
+        interval_top (np.ndarray): NDArray[(n_intervals,), FloatX] highest depth of the interval
+
+    Returns:
+        IntervalAssignment
+    """
+    vertex_well = np.asarray(vertex_well, dtype=np.int64)
+    vertex_depth = np.asarray(vertex_depth, dtype=float)
+    interval_well = np.asarray(interval_well, dtype=np.int64)
+    interval_bottom = np.asarray(interval_bottom, dtype=float)
+    interval_top = np.asarray(interval_top, dtype=float)
+    n_vertex = vertex_depth.size
+
+    # * Integer (well, depth) keys. Depths are replaced by their rank so the
+    # * comparisons stay exact
+    unique_depths, depth_rank = np.unique(
+        np.concatenate([vertex_depth, interval_bottom, interval_top]),
+        return_inverse=True
+    )
+    n_ranks = max(unique_depths.size, 1)
+    vertex_rank, bottom_rank, top_rank = np.split(depth_rank, [n_vertex, n_vertex + interval_bottom.size])
+
+    vertex_key = vertex_well * n_ranks + vertex_rank
+    order = np.argsort(vertex_key, kind='stable')
+    sorted_key = vertex_key[order]
+
+    # * Each interval covers the sorted vertices [start, stop)
+    start = np.searchsorted(sorted_key, interval_well * n_ranks + bottom_rank, side='left')
+    stop = np.searchsorted(sorted_key, interval_well * n_ranks + top_rank, side='right')
+    length = np.maximum(stop - start, 0)
+
+    n_covering = np.cumsum(
+        np.bincount(start[length > 0], minlength=n_vertex + 1) -
+        np.bincount(stop[length > 0], minlength=n_vertex + 1)
+    )[:n_vertex]
+
+    # * Expand the runs. The total length is the number of (vertex, interval)
+    # * matches, i.e. ~n_vertex unless the intervals overlap heavily
+    run_offsets = np.cumsum(length) - length
+    covered = np.arange(length.sum()) - np.repeat(run_offsets - start, length)
+    winner = np.full(n_vertex, -1, dtype=np.int64)
+    np.maximum.at(winner, covered, np.repeat(np.arange(length.size), length))
+
+    # * Back to the original vertex order
+    interval = np.empty_like(winner)
+    interval[order] = winner
+    n_intervals = np.empty_like(n_covering)
+    n_intervals[order] = n_covering
+
+    return IntervalAssignment(interval=interval, n_intervals=n_intervals)
@@ -0,0 +1,238 @@
+"""Batched minimum curvature for many wells at once.
+
+The survey of every well is passed as one flat (md, inc, azi) array plus the
+offsets where each well starts, i.e. well ``i`` spans
+``md[offsets[i]:offsets[i + 1]]``. All the geometry is computed with a single
+NumPy pass over the flat arrays. The maths follows ``wellpathpy``:
+``minimum_curvature`` for the survey stations and ``minimum_curvature.resample``
+(spherical interpolation along the arc of each segment) for the resampled
+stations.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+__all__ = ['ResampledTrajectories', 'resample_minimum_curvature']
+
+
+@dataclass
+class ResampledTrajectories:
+    """Stations of every well resampled at a regular measured depth step.
+
+    Attributes:
+        northing (np.ndarray): NDArray[(n_samples,), FloatX]
+        easting (np.ndarray): NDArray[(n_samples,), FloatX]
+        tvd (np.ndarray): NDArray[(n_samples,), FloatX] true vertical depth
+        md (np.ndarray): NDArray[(n_samples,), FloatX] measured depth of each sample
+        well (np.ndarray): NDArray[(n_samples,), IntX] position of the well each
+         sample belongs to
+        offsets (np.ndarray): NDArray[(n_wells + 1,), IntX] where the samples of
+         each well start
+    """
+    northing: np.ndarray
+    easting: np.ndarray
+    tvd: np.ndarray
+    md: np.ndarray
+    well: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def n_samples_per_well(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def local_index(self) -> np.ndarray:
+        """Position of each sample within its own well."""
+        return np.arange(self.well.size) - np.repeat(self.offsets[:-1], self.n_samples_per_well)
+
+    def segments(self) -> tuple[np.ndarray, np.ndarray]:
+        """Line cells connecting consecutive samples of the same well.
+
+        Returns:
+            Tuple with the cells NDArray[(n_cells, 2), IntX] and the well each
+            cell belongs to.
+        """
+        upper = np.flatnonzero(self.well[:-1] == self.well[1:])
+        cells = np.column_stack([upper, upper + 1])
+        return cells, self.well[upper]
+
+
+def resample_minimum_curvature(md: np.ndarray, inc: np.ndarray, azi: np.ndarray,
+                               offsets: np.ndarray, step: float) -> ResampledTrajectories:
+    """Compute the minimum curvature trajectories of many wells and resample them
+    every ``step`` measured depth units.
+
+    Each well is sampled at ``0, step, 2 * step, ...`` up to its last measured
+    depth, keeping only the samples that fall within its surveyed interval. This
+    is equivalent to calling ``wellpathpy.deviation(md, inc, azi).minimum_curvature()
+    .resample(depths=range(0, int(md[-1]) + 1, step))`` on every well.
+
+    Args:
+        md (np.ndarray): NDArray[(n_stations,), FloatX] measured depth, strictly
+         increasing within each well
+        inc (np.ndarray): NDArray[(n_stations,), FloatX] inclination in degrees
+        azi (np.ndarray): NDArray[(n_stations,), FloatX] azimuth in degrees
+        offsets (np.ndarray): NDArray[(n_wells + 1,), IntX] where the stations of
+         each well start. The last item is the total number of stations
+        step (float): measured depth between two resampled stations
+
+    Returns:
+        ResampledTrajectories
+    """
+    md = np.asarray(md, dtype=float)
+    inc = np.deg2rad(np.asarray(inc, dtype=float))
+    azi = np.deg2rad(np.asarray(azi, dtype=float))
+    offsets = np.asarray(offsets, dtype=np.int_)
+
+    n_wells = offsets.size - 1
+    n_stations = np.diff(offsets)
+    _validate_stations(md, inc, azi, offsets, n_stations)
+
+    # * Every station but the last one of each well is the upper end of a segment
+    is_upper = np.ones(md.size, dtype=bool)
+    is_upper[offsets[1:] - 1] = False
+    upper = np.flatnonzero(is_upper)
+    lower = upper + 1
+    n_segments = n_stations - 1
+    segment_offsets = offsets - np.arange(n_wells + 1)
+
+    # * Survey stations. Positions are (northing, easting, tvd)
+    tangents = np.column_stack([
+            np.sin(inc) * np.cos(azi),
+            np.sin(inc) * np.sin(azi),
+            np.cos(inc)
+    ])
+    t_upper = tangents[upper]
+    t_lower = tangents[lower]
+    dogleg = _angle_between(t_upper, t_lower)
+    ratio_factor = np.ones_like(dogleg)
+    curved = dogleg != 0
+    ratio_factor[curved] = 2 * np.tan(dogleg[curved] / 2) / dogleg[curved]
+
+    md_upper = md[upper]
+    md_diff = md[lower] - md_upper
+    increments = (md_diff * ratio_factor / 2)[:, np.newaxis] * (t_upper + t_lower)
+    stations = np.zeros((md.size, 3))
+    stations[lower] = _segmented_cumsum(increments, segment_offsets)
+
+    # * Arc of every segment. See wellpathpy.minimum_curvature.resample for the geometry
+    a = stations[upper]
+    b = stations[lower]
+    ab = b - a
+    t_co = _normalize(np.cross(t_upper, t_lower))
+    normal = _normalize(np.cross(t_lower, t_co))
+    alpha = _angle_between(ab, t_upper)
+    omega = 2 * alpha
+    sin_alpha = 2 * np.sin(alpha)
+    sin_alpha[sin_alpha == 0] = 1
+    radius = np.linalg.norm(ab, axis=1) / sin_alpha
+    centre = b - normal * radius[:, np.newaxis]
+
+    # * Samples
+    sample_md, sample_well, sample_offsets = _sample_depths(md, offsets, step)
+    segment = _locate_segments(md, offsets, sample_md, sample_well, n_segments, segment_offsets)
+
+    t = (sample_md - md_upper[segment]) / md_diff[segment]
+    omega_s = omega[segment]
+    sin_omega = np.sin(omega_s)
+    is_arc = sin_omega != 0
+    safe_sin = np.where(is_arc, sin_omega, 1)
+    v0 = np.where(is_arc, np.sin((1 - t) * omega_s) / safe_sin, 1 - t)
+    v1 = np.where(is_arc, np.sin(t * omega_s) / safe_sin, t)
+    c = centre[segment]
+    positions = v0[:, np.newaxis] * (a[segment] - c) + v1[:, np.newaxis] * (b[segment] - c) + c
+
+    return ResampledTrajectories(
+        northing=positions[:, 0],
+        easting=positions[:, 1],
+        tvd=positions[:, 2],
+        md=sample_md,
+        well=sample_well,
+        offsets=sample_offsets
+    )
+
+
+def _validate_stations(md, inc, azi, offsets, n_stations):
+    if not (md.shape == inc.shape == azi.shape):
+        raise ValueError('md, inc, and azi must be the same shape')
+    if offsets[0] != 0 or offsets[-1] != md.size or (n_stations < 0).any():
+        raise ValueError('offsets must go from 0 to the number of stations in increasing order')
+    if (n_stations < 2).any():
+        raise ValueError('Every well needs at least two survey stations.')
+    for prop, arr in {'md': md, 'inc': inc, 'azi': azi}.items():
+        if np.isnan(arr).any():
+            raise ValueError(f'{prop} cannot contain nan values')
+
+    same_well = np.ones(md.size - 1, dtype=bool)
+    same_well[offsets[1:-1] - 1] = False
+    if not (md[1:] > md[:-1])[same_well].all():
+        raise ValueError('md must have strictly increasing values within each well')
+
+
+def _sample_depths(md, offsets, step):
+    """Measured depths ``k * step`` that fall within the survey of each well."""
+    md_first = md[offsets[:-1]]
+    md_last = md[offsets[1:] - 1]
+
+    # ? range(0, int(md_last) + 1, step) -> k in [0, int(md_last) // step]
+    last_depth = np.trunc(md_last).astype(np.int_)
+    k_stop = np.where(last_depth >= 0, last_depth // step, -1).astype(np.int_)
+
+    # First k with k * step >= md_first, guarding the float division
+    k_start = np.ceil(np.maximum(md_first, 0) / step).astype(np.int_)
+    k_start -= (k_start - 1) * step >= md_first
+    k_start = np.maximum(k_start, 0)
+    k_start += k_start * step < md_first
+
+    n_samples = np.maximum(k_stop - k_start + 1, 0)
+    sample_offsets = np.zeros(n_samples.size + 1, dtype=np.int_)
+    np.cumsum(n_samples, out=sample_offsets[1:])
+
+    sample_well = np.repeat(np.arange(n_samples.size), n_samples)
+    k = np.arange(sample_offsets[-1]) - np.repeat(sample_offsets[:-1] - k_start, n_samples)
+    return (k * step).astype(float), sample_well, sample_offsets
+
+
+def _locate_segments(md, offsets, sample_md, sample_well, n_segments, segment_offsets):
+    """Global index of the segment ``md_upper <= sample_md < md_lower`` of each
+    sample. The last segment of each well also includes its lower station."""
+    n_stations = np.diff(offsets)
+    station_well = np.repeat(np.arange(n_stations.size), n_stations)
+
+    keys = np.concatenate([md, sample_md])
+    wells = np.concatenate([station_well, sample_well])
+    is_sample = np.concatenate([np.zeros(md.size, dtype=bool), np.ones(sample_md.size, dtype=bool)])
+
+    # Stations go before samples at the same depth so md_upper <= sample_md
+    order = np.lexsort((is_sample, keys, wells))
+    sorted_is_sample = is_sample[order]
+    stations_so_far = np.cumsum(~sorted_is_sample)[sorted_is_sample]
+
+    local = stations_so_far - offsets[sample_well] - 1
+    local = np.clip(local, 0, n_segments[sample_well] - 1)
+    return segment_offsets[sample_well] + local
+
+
+def _segmented_cumsum(values, offsets):
+    """Cumulative sum along axis 0 restarting at each offset."""
+    cumsum = np.cumsum(values, axis=0)
+    starts = offsets[:-1]
+    counts = np.diff(offsets)
+    base = np.zeros((counts.size, *values.shape[1:]))
+    has_previous = starts > 0
+    base[has_previous] = cumsum[starts[has_previous] - 1]
+    return cumsum - np.repeat(base, counts, axis=0)
+
+
+def _normalize(v):
+    norm = np.linalg.norm(v, axis=1)
+    norm[norm == 0] = 1
+    return v / norm[:, np.newaxis]
+
+
+def _angle_between(u, v):
+    u = _normalize(u)
+    v = _normalize(v)
+    norm_sub = np.linalg.norm(v - u, axis=1)
+    norm_add = np.linalg.norm(v + u, axis=1)
+    return 2.0 * np.arctan(norm_sub / norm_add)
@@ -8,6 +8,8 @@ import xarray as xr
 from subsurface import optional_requirements
 from ...structs.unstructured_elements import LineSet
 from ...structs.base_structures import UnstructuredData
+from ._intervals import IntervalAssignment, assign_intervals
+from ._min_curvature import ResampledTrajectories, resample_minimum_curvature
 
 STEP = 30
 RADIUS = 10
@@ -48,33 +50,57 @@ class Survey:
     def get_well_id(self, well_string_id: Union[str, Hashable]) -> int:
         return self.well_id_mapper.get(well_string_id, None)
     
-    def update_survey_with_lith(self, lith: pd.DataFrame):
-        arrays_dict = _combine_survey_and_lith(lith, self)
+    def update_survey_with_lith(self, lith: pd.DataFrame) -> IntervalAssignment:
+        """Label every trajectory vertex with the lithology interval that contains it.
+
+        Args:
+            lith (pd.DataFrame): Indexed by well name with columns top, base and
+             component lith as returned by `read_lith`
+
+        Returns:
+            IntervalAssignment: lithology row assigned to each vertex and the
+            number of intervals containing it. Use ``unassigned`` and ``overlapping``
+            to find the vertices with no interval or more than one.
+        """
+        arrays_dict, assignment = _combine_survey_and_lith(lith, self)
         self.survey_trajectory.data = arrays_dict
+        return assignment
     
     
-def _combine_survey_and_lith(lith: pd.DataFrame, survey: Survey) -> UnstructuredData:
+def _combine_survey_and_lith(lith: pd.DataFrame, survey: Survey) -> tuple[UnstructuredData, IntervalAssignment]:
     # Import moved to top for clarity and possibly avoiding repeated imports if called multiple times
     from ...structs.base_structures._unstructured_data_constructor import raw_attributes_to_dict_data_arrays
 
 
     # Accessing trajectory data more succinctly
     trajectory = survey.survey_trajectory.data.data["vertex_attrs"]
-    well_ids = trajectory.sel({'vertex_attr': 'well_id'})
-    depths = trajectory.sel({'vertex_attr': 'depth'})
+    well_ids = trajectory.sel({'vertex_attr': 'well_id'}).values.astype(np.int64)
+    depths = trajectory.sel({'vertex_attr': 'depth'}).values.astype(float)
 
     new_attrs = survey.survey_trajectory.data.points_attributes
     new_attrs['lith_ids'] = np.full(trajectory.shape[0], np.nan)  # Use np.nan and np.full for initialization
 
-    for index, row in lith.iterrows():
-        well_id = survey.get_well_id(index)
-        if well_id is None:
-            print(f'Well ID {index} not found in survey trajectory. Skipping lithology assignment.')
-        
-        well_id_mask = well_ids == well_id
-        spatial_mask = ((depths <= row['top']) & (depths >= row['base']))
-        mask = well_id_mask & spatial_mask
-        new_attrs.loc[mask.values, 'component lith'] = row['component lith']
+    lith_well_ids = lith.index.map(survey.well_id_mapper).to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(lith_well_ids)
+    if missing.any():
+        print(f'Well IDs {lith.index[missing].unique().to_list()} not found in survey trajectory. Skipping lithology assignment.')
+
+    assignment = assign_intervals(
+        vertex_well=well_ids,
+        vertex_depth=depths,
+        interval_well=lith_well_ids[~missing],
+        interval_bottom=lith['base'].to_numpy(dtype=float)[~missing],
+        interval_top=lith['top'].to_numpy(dtype=float)[~missing]
+    )
+    # Report positions in the original lith DataFrame. No interval may match at all
+    assigned = assignment.interval >= 0
+    lith_rows = np.full(assignment.interval.size, -1, dtype=np.int64)
+    lith_rows[assigned] = np.flatnonzero(~missing)[assignment.interval[assigned]]
+    assignment.interval = lith_rows
+
+    component_lith = np.full(lith_rows.size, np.nan, dtype=object)
+    component_lith[assigned] = lith['component lith'].to_numpy()[lith_rows[assigned]]
+    new_attrs['component lith'] = component_lith
 
     # Factorize lith components directly in-place
     new_attrs['lith_ids'], _ = pd.factorize(new_attrs['component lith'], use_na_sentinel=True)
@@ -88,7 +114,7 @@ def _combine_survey_and_lith(lith: pd.DataFrame, survey: Survey) -> Unstructured
     )
 
     # Inline construction of UnstructuredData
-    return UnstructuredData.from_data_arrays_dict(
+    unstruct = UnstructuredData.from_data_arrays_dict(
         xarray_dict={
                 "vertex"      : survey.survey_trajectory.data.data["vertex"],
                 "cells"       : survey.survey_trajectory.data.data["cells"],
@@ -99,76 +125,63 @@ def _combine_survey_and_lith(lith: pd.DataFrame, survey: Survey) -> Unstructured
         default_cells_attributes_name=survey.survey_trajectory.data.cells_attr_name,
         default_points_attributes_name=survey.survey_trajectory.data.vertex_attr_name
     )
+    return unstruct, assignment
 
 
 def _correct_angles(df: pd.DataFrame) -> pd.DataFrame:
-    def correct_inclination(inc: float) -> float:
-        if inc < 0:
-            inc = inc % 360  # Normalize to 0-360 range first if negative
-        if 0 <= inc <= 180:
-            return inc - 0.000001
-        elif 180 < inc < 360:
-            return 360 - inc  # Reflect angles greater than 180 back into the 0-180 range
-        else:
-            raise ValueError(f'Inclination value {inc} is out of the expected range of 0 to 360 degrees')
-
-    def correct_azimuth(azi: float) -> float:
-        return azi % 360  # Normalize azimuth to 0-360 range
-
-    df['inc'] = df['inc'].apply(correct_inclination)
-    df['azi'] = df['azi'].apply(correct_azimuth)
+    inc = df['inc'].to_numpy(dtype=float)
+    inc = np.where(inc < 0, inc % 360, inc)  # Normalize to 0-360 range first if negative
+    if ((inc < 0) | (inc >= 360)).any():
+        wrong = inc[(inc < 0) | (inc >= 360)][0]
+        raise ValueError(f'Inclination value {wrong} is out of the expected range of 0 to 360 degrees')
 
-    return df
+    # Reflect angles greater than 180 back into the 0-180 range
+    df['inc'] = np.where(inc <= 180, inc - 0.000001, 360 - inc)
+    df['azi'] = df['azi'] % 360  # Normalize azimuth to 0-360 range
 
+    return df
 
 
 def _data_frame_to_unstructured_data(df: 'pd.DataFrame'):
-    import numpy as np
-    
-    wp = optional_requirements.require_wellpathpy()
     pd = optional_requirements.require_pandas()
-    
-    vertex: np.ndarray = np.empty((0, 3), dtype=np.float_)
-    cells: np.ndarray = np.empty((0, 2), dtype=np.int_)
-    cell_attr: pd.DataFrame = pd.DataFrame(columns=['well_id'])
-    vertex_attr: pd.DataFrame = pd.DataFrame(columns=['well_id'])
-
-    for e, (borehole_id, data) in enumerate(df.groupby(level=0)):
-        dev: wp.deviation = wp.deviation(
-            md=data['md'],
-            inc=data['inc'],
-            azi=data['azi']
-        )
-        depths = list(range(0, int(dev.md[-1]) + 1, STEP))
-        pos: wp.minimum_curvature = dev.minimum_curvature().resample(depths=depths)
-        vertex_count = vertex.shape[0]
 
-        vertex = np.vstack([
-                vertex,
-                np.vstack([pos.easting, pos.northing, pos.depth]).T]
-        )
+    # * Flatten the survey grouped by well, in the same order as df.groupby(level=0)
+    codes, borehole_ids = pd.factorize(df.index, sort=True)
+    order = np.argsort(codes, kind='stable')
+    order = order[codes[order] >= 0]
+    n_stations = np.bincount(codes[order], minlength=borehole_ids.size)
+    offsets = np.zeros(borehole_ids.size + 1, dtype=np.int_)
+    np.cumsum(n_stations, out=offsets[1:])
+
+    trajectories: ResampledTrajectories = resample_minimum_curvature(
+        md=df['md'].to_numpy(dtype=float)[order],
+        inc=df['inc'].to_numpy(dtype=float)[order],
+        azi=df['azi'].to_numpy(dtype=float)[order],
+        offsets=offsets,
+        step=STEP
+    )
 
-        n_vertex_shift_0 = np.arange(0, len(pos.depth) - 1, dtype=np.int_)
-        n_vertex_shift_1 = np.arange(1, len(pos.depth), dtype=np.int_)
-        cell_per_well = np.vstack([n_vertex_shift_0, n_vertex_shift_1]).T + vertex_count
-        cells = np.vstack([cells, cell_per_well], dtype=np.int_)
-        
-        
-        # Add the id (e), to cell_attr and vertex_attr
-        cell_attr = pd.concat([cell_attr, pd.DataFrame({'well_id': [e] * len(cell_per_well)})])
-        vertex_attr = pd.concat([vertex_attr, pd.DataFrame(
-            {
-                    'well_id': [e] * len(pos.depth),
-                    'well_name': borehole_id,
-                    'depth': pos.depth,
-             }
-        )])
+    vertex = np.column_stack([trajectories.easting, trajectories.northing, trajectories.tvd])
+    cells, cell_well_id = trajectories.segments()
+    local_index = trajectories.local_index
+
+    # Add the id (e), to cell_attr and vertex_attr
+    cell_attr = pd.DataFrame({
+            'index'  : local_index[cells[:, 0]],
+            'well_id': cell_well_id
+    })
+    vertex_attr = pd.DataFrame({
+            'index'    : local_index,
+            'well_id'  : trajectories.well,
+            'well_name': np.asarray(borehole_ids, dtype=object)[trajectories.well],
+            'depth'    : trajectories.tvd,
+    })
 
     unstruct = UnstructuredData.from_array(
         vertex=vertex,
         cells=cells,
-        vertex_attr=vertex_attr.reset_index(),
-        cells_attr=cell_attr.reset_index()
+        vertex_attr=vertex_attr,
+        cells_attr=cell_attr
     )
 
     return unstruct
@@ -1,8 +1,9 @@
-from typing import Union, Dict, Literal, List
+from typing import Union, Dict, Literal, List, Mapping, Hashable, Any, Optional, Tuple, Sequence
 
 import numpy as np
 import pandas as pd
 import xarray as xr
+from xarray.indexes import PandasIndex
 
 from subsurface.core.structs.base_structures.base_structures_enum import SpecialCellCase
 
@@ -67,3 +68,153 @@ def _data_array_attributes_from_raw_data(raw_data: Union[None, pd.DataFrame],
     else:
         raise ValueError("cells_attributes must be either pd.DataFrame or " "None/default.")
     return data_array
+
+
+AttributesArg = Union[None, pd.DataFrame, Mapping[Hashable, np.ndarray]]
+
+
+class DatasetBuilder:
+    """Builds the Dataset of an `UnstructuredData` straight from numpy arrays.
+
+    The Dataset is identical to the one of `UnstructuredData.from_array` (without
+    `coords`), but it is assembled from its variables and indexes in one step
+    instead of merging DataArrays. Indexes of the attribute names are cached, so
+    building many objects with the same attributes reuses them.
+    """
+
+    def __init__(self, cells_attr_name: str = "cell_attrs", vertex_attr_name: str = "vertex_attrs"):
+        self.cells_attr_name = cells_attr_name
+        self.vertex_attr_name = vertex_attr_name
+        self._names_indexes: Dict[tuple, Tuple[PandasIndex, xr.Variable]] = {}
+
+    def build(self, vertex: np.ndarray, cells: Union[np.ndarray, Literal["lines", "points"], SpecialCellCase],
+              cells_attr: AttributesArg = None, vertex_attr: AttributesArg = None,
+              xarray_attributes: Mapping[Hashable, Any] = None) -> xr.Dataset:
+        vertex = np.asarray(vertex)
+        if vertex.ndim != 2 or vertex.shape[1] != 3:
+            raise ValueError(f"vertex must have shape (n, 3), not {vertex.shape}.")
+        n_vertex = vertex.shape[0]
+        if type(cells) is not np.ndarray:
+            cells = _create_default_cells_arg(cells=cells, n_vertex=n_vertex)
+        if cells.ndim != 2:
+            raise ValueError(f"cells must be a 2D array, not {cells.ndim}D.")
+        n_cells = cells.shape[0]
+
+        cells_values, cells_names = _attributes_values(cells_attr, n_cells)
+        vertex_values, vertex_names = _attributes_values(vertex_attr, n_vertex)
+        return self.build_from_values(vertex, cells, cells_values, cells_names, vertex_values, vertex_names,
+                                      xarray_attributes)
+
+    def build_from_values(self, vertex: np.ndarray, cells: np.ndarray,
+                          cells_values: np.ndarray, cells_names: Optional[Sequence[Hashable]],
+                          vertex_values: np.ndarray, vertex_names: Optional[Sequence[Hashable]],
+                          xarray_attributes: Mapping[Hashable, Any] = None) -> xr.Dataset:
+        """Same as `build` with the attributes as 2D arrays and their column
+        names (None if there are no attributes). The arrays are not copied."""
+        n_vertex, n_cells = vertex.shape[0], cells.shape[0]
+        if cells_values.shape[0] != n_cells:
+            raise AttributeError('Attributes and cells must have the same length.')
+        if vertex_values.shape[0] != n_vertex:
+            raise AttributeError('points_attributes and vertex must have the same length.')
+
+        points_index = PandasIndex(pd.RangeIndex(n_vertex, name="points"), "points")
+        cell_attr_index, cell_attr_variable = self._names_index(cells_names, "cell_attr")
+        vertex_attr_index, vertex_attr_variable = self._names_index(vertex_names, "vertex_attr")
+        indexes = {"XYZ": _XYZ_INDEX, "points": points_index, "cell_attr": cell_attr_index,
+                   "vertex_attr": vertex_attr_index}
+
+        data_vars = {
+                "vertex"             : xr.Variable(("points", "XYZ"), vertex),
+                "cells"              : xr.Variable(("cell", "nodes"), cells),
+                self.cells_attr_name : xr.Variable(("cell", "cell_attr"), cells_values),
+                self.vertex_attr_name: xr.Variable(("points", "vertex_attr"), vertex_values),
+        }
+        coords = {
+                "cell"       : xr.Variable("cell", np.arange(n_cells)),
+                "cell_attr"  : cell_attr_variable,
+                "vertex_attr": vertex_attr_variable,
+                # Index variables are immutable, so they can be shared
+                "XYZ"        : _XYZ_VARIABLE,
+                **points_index.create_variables(),
+        }
+        attrs = dict(xarray_attributes or {})
+
+        # The indexes are given, so xarray does not build them from the coordinates
+        return xr.Dataset(data_vars, coords=xr.Coordinates(coords, indexes=indexes), attrs=attrs)
+
+    def _names_index(self, names: Optional[Sequence[Hashable]], dim: str) -> Tuple[PandasIndex, xr.Variable]:
+        key = (dim, None if names is None else tuple(names))
+        cached = self._names_indexes.get(key)
+        if cached is None:
+            # No attributes: same RangeIndex as an empty DataFrame
+            pandas_index = pd.RangeIndex(0) if names is None else pd.Index(names)
+            index = PandasIndex(pandas_index.rename(dim), dim)
+            cached = self._names_indexes[key] = (index, index.create_variables()[dim])
+        return cached
+
+
+_XYZ_INDEX = PandasIndex(pd.Index(["X", "Y", "Z"], name="XYZ"), "XYZ", coord_dtype=np.dtype("<U1"))
+_XYZ_VARIABLE = _XYZ_INDEX.create_variables()["XYZ"]
+
+
+def _attributes_values(raw_attributes: AttributesArg, n_rows: int) -> Tuple[np.ndarray, Optional[pd.Index]]:
+    if raw_attributes is None:
+        return np.zeros((n_rows, 0)), None
+    if type(raw_attributes) is pd.DataFrame:
+        return raw_attributes.values, raw_attributes.columns if raw_attributes.shape[1] > 0 else None
+    if isinstance(raw_attributes, Mapping):
+        if len(raw_attributes) == 0:
+            return np.zeros((n_rows, 0)), None
+        # Column-major, like DataFrame.values, so every attribute is a contiguous column
+        columns = [np.asarray(column) for column in raw_attributes.values()]
+        values = np.empty((len(columns[0]), len(columns)), dtype=np.result_type(*columns), order="F")
+        for i, column in enumerate(columns):
+            values[:, i] = column
+        return values, pd.Index(list(raw_attributes.keys()))
+    raise ValueError("Attributes must be either pd.DataFrame, a dict of 1D arrays or None.")
+
+
+def concat_attributes(values: List[np.ndarray], names: List[List[Hashable]], n_rows: List[int],
+                      source_values: Optional[np.ndarray] = None) -> Tuple[np.ndarray, List[Hashable]]:
+    """Stack attribute arrays with different columns into one preallocated array.
+
+    Columns are the union of `names` in order of appearance. Rows of an array
+    without a column are NaN (integer and boolean columns are promoted to float).
+
+    Args:
+        values: 2D attributes array of every object
+        names: Column names of every array
+        n_rows: Number of rows of every array
+        source_values: If given, value of an extra last column for every array
+
+    Returns:
+        Stacked array and column names
+    """
+    all_names = list(dict.fromkeys(name for object_names in names for name in object_names))
+    columns = {name: i for i, name in enumerate(all_names)}
+    dtypes = [array.dtype for array, object_names in zip(values, names) if len(object_names) > 0]
+    dtype = np.result_type(*dtypes) if dtypes else np.dtype(float)
+    complete = all(len(object_names) == len(all_names) for object_names in names)
+    if not complete and dtype.kind in "biu":
+        dtype = np.result_type(dtype, np.float64)
+    if source_values is not None:
+        dtype = np.result_type(dtype, source_values.dtype)
+
+    n_columns = len(all_names) + (source_values is not None)
+    result = np.empty((sum(n_rows), n_columns), dtype=dtype)
+    if not complete:
+        result[:, :len(all_names)] = np.nan
+
+    start = 0
+    for array, object_names, n, i in zip(values, names, n_rows, range(len(values))):
+        stop = start + n
+        if len(object_names) == 0:
+            pass  # Attribute-less arrays have shape (0, 0)
+        elif list(object_names) == all_names:
+            result[start:stop, :len(all_names)] = array
+        else:
+            result[start:stop, [columns[name] for name in object_names]] = array
+        if source_values is not None:
+            result[start:stop, -1] = source_values[i]
+        start = stop
+    return result, all_names
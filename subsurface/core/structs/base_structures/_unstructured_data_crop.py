@@ -0,0 +1,154 @@
+"""Vectorized helpers of `UnstructuredData.crop`.
+
+Regions are an extent (a box, unbounded in z if it has 4 values) or a polygon
+in the XY plane (a prism unbounded in z). Convex regions are also described as
+the intersection of half-spaces ``points @ normal >= offset``, which is what the
+clipping of triangles uses.
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def parse_region(extent, polygon) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Bounding box of the region and the polygon (if any) as (n, 2) array."""
+    if (extent is None) == (polygon is None):
+        raise ValueError("Pass either extent or polygon.")
+
+    if extent is not None:
+        extent = np.asarray(extent, dtype=float)
+        if extent.size not in (4, 6):
+            raise ValueError("extent must be [x_min, x_max, y_min, y_max] or [x_min, x_max, y_min, y_max, z_min, z_max].")
+        if extent.size == 4:
+            extent = np.append(extent, [-np.inf, np.inf])
+        box_min, box_max = extent[0::2], extent[1::2]
+        if (box_min > box_max).any():
+            raise ValueError(f"extent {extent} has a minimum larger than its maximum.")
+        return box_min, box_max, None
+
+    polygon = np.asarray(polygon, dtype=float)
+    if polygon.ndim != 2 or polygon.shape[1] != 2 or polygon.shape[0] < 3:
+        raise ValueError("polygon must be an array of at least 3 XY points with shape (n, 2).")
+    if np.array_equal(polygon[0], polygon[-1]):
+        polygon = polygon[:-1]
+    box_min = np.append(polygon.min(axis=0), -np.inf)
+    box_max = np.append(polygon.max(axis=0), np.inf)
+    return box_min, box_max, polygon
+
+
+def points_in_box(points: np.ndarray, box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+    return ((points >= box_min) & (points <= box_max)).all(axis=1)
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Crossing number test of the XY of `points`, one vectorized pass per edge."""
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros(points.shape[0], dtype=bool)
+    for (x0, y0), (x1, y1) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        crosses = (y0 > y) != (y1 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= crosses & (x < x_cross)
+    return inside
+
+
+def half_spaces(box_min: np.ndarray, box_max: np.ndarray,
+                polygon: Optional[np.ndarray]) -> List[Tuple[np.ndarray, float]]:
+    """(normal, offset) of the half-spaces whose intersection is the region.
+    Only valid for convex polygons."""
+    if polygon is None:
+        planes = []
+        for axis in range(3):
+            normal = np.zeros(3)
+            normal[axis] = 1
+            if np.isfinite(box_min[axis]):
+                planes.append((normal, box_min[axis]))
+            if np.isfinite(box_max[axis]):
+                planes.append((-normal, -box_max[axis]))
+        return planes
+
+    edges = np.roll(polygon, -1, axis=0) - polygon
+    cross = edges[:, 0] * np.roll(edges, -1, axis=0)[:, 1] - edges[:, 1] * np.roll(edges, -1, axis=0)[:, 0]
+    if not ((cross >= 0).all() or (cross <= 0).all()):
+        raise ValueError("Triangles can only be clipped by extents or convex polygons.")
+    orientation = 1 if cross.sum() >= 0 else -1  # Inside is to the left of counter-clockwise edges
+    planes = []
+    for start, edge in zip(polygon, edges):
+        normal = orientation * np.array([-edge[1], edge[0], 0.])
+        planes.append((normal, normal[:2] @ start))
+    return planes
+
+
+def cells_in_box(vertex: np.ndarray, cells: np.ndarray, box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+    """Cells that may intersect the box: all but those with every vertex beyond
+    the same side of the box (Cohen-Sutherland outcodes)."""
+    outcode = np.zeros(vertex.shape[0], dtype=np.uint8)
+    for axis in range(3):
+        outcode |= (vertex[:, axis] < box_min[axis]).astype(np.uint8) << (2 * axis)
+        outcode |= (vertex[:, axis] > box_max[axis]).astype(np.uint8) << (2 * axis + 1)
+    return np.bitwise_and.reduce(outcode[cells], axis=1) == 0
+
+
+def clip_triangles(vertex: np.ndarray, vertex_values: np.ndarray, cells: np.ndarray, cells_values: np.ndarray,
+                   planes: List[Tuple[np.ndarray, float]]):
+    """Clip triangles by every half-space in turn.
+
+    Triangles are kept, dropped or split in one or two triangles by each plane.
+    One vertex is added per cut edge and shared by the triangles of that edge.
+    Vertex attributes are interpolated linearly on the edge.
+
+    Returns:
+        vertex, vertex_values, cells, cells_values. The vertex are not compacted
+    """
+    for normal, offset in planes:
+        distance = vertex @ normal - offset
+        inside = distance >= 0
+        cell_inside = inside[cells]
+        n_inside = cell_inside.sum(axis=1)
+        if (n_inside == 3).all():
+            continue
+
+        # Rotate the triangles cut by the plane so the odd vertex is first. Rotations keep the orientation
+        cut = np.flatnonzero((n_inside == 1) | (n_inside == 2))
+        odd = np.where(n_inside[cut] == 1, cell_inside[cut].argmax(axis=1), (~cell_inside[cut]).argmax(axis=1))
+        rotated = cells[cut][np.arange(cut.size)[:, None], (odd[:, None] + np.arange(3)) % 3]
+
+        # One new vertex per cut edge, computed from its lowest index end so shared edges match exactly
+        edges = np.concatenate([rotated[:, [0, 1]], rotated[:, [0, 2]]])
+        edges.sort(axis=1)
+        unique_edges, edge_index = np.unique(edges, axis=0, return_inverse=True)
+        edge_index = edge_index.reshape(2, -1)
+        start, end = unique_edges[:, 0], unique_edges[:, 1]
+        t = (distance[start] / (distance[start] - distance[end]))[:, None]
+        new_vertex = vertex[start] + t * (vertex[end] - vertex[start])
+        new_values = vertex_values[start] + t * (vertex_values[end] - vertex_values[start])
+
+        # Ends on the plane are reused instead of duplicated
+        edge_vertex = np.where(distance[start] == 0, start,
+                               np.where(distance[end] == 0, end, np.arange(start.size) + vertex.shape[0]))
+        e01, e02 = edge_vertex[edge_index[0]], edge_vertex[edge_index[1]]
+        a, b, c = rotated.T
+        one_inside = n_inside[cut] == 1
+        two_inside = ~one_inside
+
+        kept = n_inside == 3
+        cells = np.concatenate([
+                cells[kept],
+                np.column_stack([a, e01, e02])[one_inside],
+                # Odd vertex outside: the quad b, c, e02, e01 as two triangles
+                np.column_stack([e01, b, c])[two_inside],
+                np.column_stack([e01, c, e02])[two_inside],
+        ]).astype(cells.dtype, copy=False)
+        cells_values = np.concatenate([
+                cells_values[kept],
+                cells_values[cut][one_inside],
+                cells_values[cut][two_inside],
+                cells_values[cut][two_inside],
+        ])
+        # Triangles that only touch the plane collapse to a segment or a point
+        collapsed = (cells[:, 0] == cells[:, 1]) | (cells[:, 1] == cells[:, 2]) | (cells[:, 0] == cells[:, 2])
+        cells, cells_values = cells[~collapsed], cells_values[~collapsed]
+        vertex = np.concatenate([vertex, new_vertex])
+        vertex_values = np.concatenate([vertex_values, new_values.astype(vertex_values.dtype, copy=False)])
+
+    return vertex, vertex_values, cells, cells_values
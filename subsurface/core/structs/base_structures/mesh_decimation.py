@@ -0,0 +1,93 @@
+"""Level of detail pyramids of triangulated surfaces.
+
+Every level is decimated from the previous one by vertex clustering (see
+`UnstructuredData.decimate`), which is O(n) and keeps the attributes: vertex
+attributes are averaged and the triangles that survive keep theirs. Clustering
+does not preserve the topology, so thin parts and small holes can close, which
+is acceptable for rendering and previews.
+
+The size of the grid of a level is chosen from the area of the surface: a
+surface of area A on a grid of size h has about 2 * A / h ** 2 triangles.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+from .unstructured_data import UnstructuredData
+
+
+class LodPyramid:
+    """Meshes of decreasing detail. Level 0 is the original mesh.
+
+    Args:
+        levels: Meshes, each one with fewer cells than the previous one
+    """
+
+    def __init__(self, levels: List[UnstructuredData]):
+        self.levels = levels
+
+    @classmethod
+    def from_mesh(cls, mesh: UnstructuredData, min_triangles: int = 1000, reduction: float = 4.,
+                  max_levels: int = 16) -> "LodPyramid":
+        """Decimate a triangulated surface until it has fewer than `min_triangles`.
+
+        Args:
+            mesh: UnstructuredData with triangle cells
+            min_triangles: Levels are added while the last one has more triangles
+            reduction: Target ratio between the triangles of consecutive levels
+            max_levels: Maximum number of levels, including the original mesh
+
+        Returns:
+            LodPyramid
+        """
+        if reduction <= 1:
+            raise ValueError(f"reduction must be larger than 1, not {reduction}.")
+        levels = [mesh]
+        while levels[-1].n_elements > min_triangles and len(levels) < max_levels:
+            level = _decimate_by(levels[-1], reduction)
+            if level is None:
+                break
+            levels.append(level)
+        return cls(levels)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __getitem__(self, lod: int) -> UnstructuredData:
+        return self.levels[lod]
+
+    @property
+    def coarsest_level(self) -> int:
+        return len(self.levels) - 1
+
+    @property
+    def n_triangles(self) -> List[int]:
+        return [level.n_elements for level in self.levels]
+
+    def select(self, max_triangles: Optional[int] = None) -> int:
+        """Most detailed level with at most `max_triangles`, or the coarsest one
+        if none is small enough. Level 0 if `max_triangles` is None."""
+        if max_triangles is None:
+            return 0
+        fits = np.flatnonzero(np.array(self.n_triangles) <= max_triangles)
+        return int(fits[0]) if fits.size > 0 else self.coarsest_level
+
+
+def _decimate_by(mesh: UnstructuredData, reduction: float) -> Optional[UnstructuredData]:
+    """Mesh with about `reduction` times fewer triangles, or None if clustering
+    does not reduce it."""
+    vertex, cells = mesh.vertex, mesh.cells
+    edges = vertex[cells[:, 1:]] - vertex[cells[:, :1]]
+    area = np.linalg.norm(np.cross(edges[:, 0], edges[:, 1]), axis=1).sum() / 2
+    extent = np.ptp(vertex, axis=0).max() if vertex.shape[0] > 0 else 0.
+    if extent == 0:
+        return None
+    cell_size = np.sqrt(2 * area * reduction / mesh.n_elements) if area > 0 else extent / 2
+
+    # Grids finer than the spacing of the vertex merge nothing, so they grow until the mesh shrinks
+    while cell_size <= extent:
+        level = mesh.decimate(cell_size)
+        if level.n_elements <= mesh.n_elements * 0.9:
+            return level
+        cell_size *= 2
+    return None
@@ -0,0 +1,74 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from subsurface import optional_requirements
+
+
+class SpatialIndex:
+    """KD-tree over a set of points for nearest neighbour, radius and box queries.
+
+    Built by `UnstructuredData.spatial_index` the first time it is needed and
+    kept until the vertex change.
+
+    Args:
+        points (np.ndarray): NDArray[(Any, 3), FloatX]. Not copied
+        leafsize (int): Number of points at which the tree stops splitting
+    """
+
+    def __init__(self, points: np.ndarray, leafsize: int = 16):
+        optional_requirements.require_scipy()
+        from scipy.spatial import cKDTree
+
+        self.points = np.asarray(points)
+        # Unbalanced trees are much faster to build and as fast to query for most point clouds
+        self.tree = cKDTree(self.points, leafsize=leafsize, balanced_tree=False)
+
+    @property
+    def n_points(self) -> int:
+        return self.points.shape[0]
+
+    def query_nearest(self, points: np.ndarray, k: int = 1, distance_upper_bound: float = np.inf,
+                      workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Closest indexed points to every query point.
+
+        Args:
+            points: NDArray[(Any, 3), FloatX] or a single point
+            k: Number of neighbours
+            distance_upper_bound: Ignore neighbours further than this. Missing
+             neighbours have distance inf and index `n_points`
+            workers: Number of threads. -1 uses all the CPUs
+
+        Returns:
+            Distances and indices with shape (n,) if k == 1 else (n, k)
+        """
+        return self.tree.query(points, k=k, distance_upper_bound=distance_upper_bound, workers=workers)
+
+    def query_radius(self, points: np.ndarray, radius: float,
+                     workers: int = 1) -> Union[np.ndarray, List[np.ndarray]]:
+        """Indices (sorted) of the indexed points within `radius` of every query point.
+
+        Returns:
+            An array for a single point, else a list of arrays
+        """
+        points = np.asarray(points)
+        result = self.tree.query_ball_point(points, radius, workers=workers, return_sorted=True)
+        if points.ndim == 1:
+            return np.asarray(result, dtype=np.intp)
+        return [np.asarray(indices, dtype=np.intp) for indices in result]
+
+    def query_box(self, box_min, box_max) -> np.ndarray:
+        """Indices (sorted) of the indexed points inside an axis aligned box,
+        boundaries included."""
+        box_min, box_max = np.asarray(box_min, dtype=float), np.asarray(box_max, dtype=float)
+        if (box_min > box_max).any():
+            raise ValueError(f"box_min {box_min} must be smaller than box_max {box_max}.")
+        # Cube around the box in the Chebyshev norm, then the exact test
+        half_size = (box_max - box_min) / 2
+        # Margin for the rounding of the center, the exact test below removes the extra points
+        radius = half_size.max() + 4 * np.finfo(float).eps * np.abs([box_min, box_max]).max()
+        candidates = np.asarray(self.tree.query_ball_point((box_min + box_max) / 2, radius, p=np.inf,
+                                                           return_sorted=True), dtype=np.intp)
+        candidate_points = self.points[candidates]
+        inside = ((candidate_points >= box_min) & (candidate_points <= box_max)).all(axis=1)
+        return candidates[inside]
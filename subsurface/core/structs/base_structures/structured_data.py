@@ -1,9 +1,11 @@
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
 import xarray as xr
 
+from subsurface import optional_requirements
+
 __all__ = ['StructuredData', ]
 
 
@@ -43,7 +45,11 @@ class StructuredData:
 
     @classmethod
     def from_numpy(cls, array: np.ndarray, coords: dict = None, data_array_name: str = "data_array",
-                   dim_names: List[str] = None):
+                   dim_names: List[str] = None, chunks: Union[None, int, str, dict] = None):
+        """Args:
+            chunks: If not None, the data is wrapped in a dask array with these
+             chunks (see `xarray.Dataset.chunk`) and all the operations are lazy.
+        """
         if dim_names is None:
             if array.ndim == 2:
                 dim_names = ['x', 'y']
@@ -53,11 +59,13 @@ class StructuredData:
                 dim_names = ['dim' + str(i) for i in range(array.ndim)]
         # if they are more than 3 we do not know the dimension name but it should
         # valid:
-        return cls(xr.Dataset({data_array_name: (dim_names, array)}, coords=coords), data_array_name)
+        ds = xr.Dataset({data_array_name: (dim_names, array)}, coords=coords)
+        return cls(_chunk(ds, chunks), data_array_name)
 
     @classmethod
-    def from_data_array(cls, data_array: xr.DataArray, data_array_name: str = "data_array"):
-        return cls(xr.Dataset({data_array_name: data_array}), data_array_name)
+    def from_data_array(cls, data_array: xr.DataArray, data_array_name: str = "data_array",
+                        chunks: Union[None, int, str, dict] = None):
+        return cls(_chunk(xr.Dataset({data_array_name: data_array}), chunks), data_array_name)
 
     @classmethod
     def from_dict(cls, data_dict: Dict[str, xr.DataArray], coords: Dict[str, str] = None):
@@ -71,6 +79,11 @@ class StructuredData:
     def default_data_array(self):
         return self.data[self.data_array_name]
 
+    @property
+    def is_lazy(self) -> bool:
+        """True if the default data array is backed by a chunked (dask) array."""
+        return self.default_data_array.chunks is not None
+
     def default_data_array_to_binary(self, order='F'):
         bytearray_le = self._to_bytearray(self.default_data_array, order)
         header = self._set_binary_header(self.default_data_array)
@@ -89,6 +102,20 @@ class StructuredData:
 
     @staticmethod
     def _to_bytearray(data_array: xr.DataArray, order: str) -> bytes:
-        data = data_array.values.astype('float32').tobytes(order)
+        # Cast before loading so lazy arrays are only materialized as float32
+        data = data_array.astype('float32').values.tobytes(order)
         bytearray_le = data
         return bytearray_le
+
+    @staticmethod
+    def _binary_blocks(data_array: xr.DataArray) -> Dict[str, Tuple[np.ndarray, str]]:
+        """Arrays written to the binary file, in order, with the dtype they are written as.
+        Lazy arrays are returned as dask arrays so they can be written chunk by chunk."""
+        return {"data": (data_array.data, 'float32')}
+
+
+def _chunk(ds: xr.Dataset, chunks) -> xr.Dataset:
+    if chunks is None:
+        return ds
+    optional_requirements.require_dask()
+    return ds.chunk(chunks)
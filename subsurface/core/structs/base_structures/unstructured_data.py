@@ -1,12 +1,18 @@
-from dataclasses import dataclass
-from typing import Union, Dict, Mapping, Hashable, Any, Literal
+from dataclasses import dataclass, field, InitVar
+from typing import Union, Dict, Mapping, Hashable, Any, Literal, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import xarray as xr
 
-from subsurface.core.structs.base_structures._unstructured_data_constructor import vertex_and_cells_arrays_to_data_array, raw_attributes_to_dict_data_arrays
+from subsurface.core.structs.base_structures._unstructured_data_constructor import vertex_and_cells_arrays_to_data_array, raw_attributes_to_dict_data_arrays, DatasetBuilder, \
+    concat_attributes
 from subsurface.core.structs.base_structures.base_structures_enum import SpecialCellCase
+from subsurface.core.structs.base_structures.spatial_index import SpatialIndex
+from subsurface.core.structs.base_structures.vertex_welding import weld_vertex, weld_cells, reduce_attributes, \
+    unique_cells
+from subsurface.core.structs.base_structures._unstructured_data_crop import parse_region, points_in_box, \
+    points_in_polygon, half_spaces, clip_triangles, cells_in_box
 
 
 @dataclass(frozen=False) 
@@ -14,6 +20,9 @@ class UnstructuredData:
     data: xr.Dataset
     cells_attr_name: str = "cell_attrs"
     vertex_attr_name: str = "vertex_attrs"
+    _attributes_cache: Dict[str, "_AttributesView"] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _spatial_index: Optional[Tuple[xr.Variable, SpatialIndex]] = field(default=None, init=False, repr=False, compare=False)
+    validate: InitVar[bool] = True
 
     """Primary structure definition for unstructured data
 
@@ -24,6 +33,8 @@ class UnstructuredData:
 
         ds (xarray.Dataset): Directly a dataset with the expected structured. This
          arg is specially thought for loading data from disk
+        validate (bool): Check the structure of the dataset. Only skipped for
+         datasets built by `DatasetBuilder`
 
     Notes:
         Depending on the shape of `edge` the following unstructured elements can
@@ -39,8 +50,9 @@ class UnstructuredData:
         - cells NDArray[(Any, 8), IntX] -> *Hexahedron: Unstructured grid/Prisms*
     """
 
-    def __post_init__(self):
-        self._validate()
+    def __post_init__(self, validate: bool):
+        if validate:
+            self._validate()
 
     def __repr__(self):
         return self.data.__repr__()
@@ -114,6 +126,374 @@ class UnstructuredData:
             default_points_attributes_name=default_points_attr_name
         )
 
+    @classmethod
+    def from_arrays_unchecked(
+            cls,
+            vertex: np.ndarray,
+            cells: Union[np.ndarray, Literal["lines", "points"], SpecialCellCase],
+            *,
+            cells_attr: Union[None, pd.DataFrame, Mapping[Hashable, np.ndarray]] = None,
+            vertex_attr: Union[None, pd.DataFrame, Mapping[Hashable, np.ndarray]] = None,
+            xarray_attributes: Mapping[Hashable, Any] = None,
+            default_cells_attr_name: str = "cell_attrs",
+            default_points_attr_name: str = "vertex_attrs",
+    ) -> "UnstructuredData":
+        """Fast constructor for many small objects (e.g. one per well).
+
+        Shapes are checked on the numpy arrays and the Dataset is assembled
+        directly, skipping the DataArray merge, `reset_index` and `_validate` of
+        `from_array`. The result is identical to `from_array` with the same
+        arguments, except that the index of attribute DataFrames is ignored.
+
+        Args:
+            vertex (np.ndarray): NDArray[(Any, 3), FloatX]: XYZ point data
+            cells (Union[np.ndarray, Literal["lines", "points"]]): NDArray[(Any, ...), IntX]
+            cells_attr: DataFrame or dict of 1D arrays by attribute name, one
+             value per cell
+            vertex_attr: DataFrame or dict of 1D arrays by attribute name, one
+             value per vertex
+            xarray_attributes:
+            default_cells_attr_name:
+            default_points_attr_name:
+
+        Returns:
+            UnstructuredData
+        """
+        builder = DatasetBuilder(default_cells_attr_name, default_points_attr_name)
+        ds = builder.build(vertex, cells, cells_attr, vertex_attr, xarray_attributes)
+        return cls._from_dataset_unchecked(ds, default_cells_attr_name, default_points_attr_name)
+
+    @classmethod
+    def from_many(
+            cls,
+            vertex: Sequence[np.ndarray],
+            cells: Sequence[Union[np.ndarray, Literal["lines", "points"], SpecialCellCase]],
+            *,
+            cells_attr: Optional[Sequence[Union[None, pd.DataFrame, Mapping[Hashable, np.ndarray]]]] = None,
+            vertex_attr: Optional[Sequence[Union[None, pd.DataFrame, Mapping[Hashable, np.ndarray]]]] = None,
+            xarray_attributes: Mapping[Hashable, Any] = None,
+            default_cells_attr_name: str = "cell_attrs",
+            default_points_attr_name: str = "vertex_attrs",
+    ) -> List["UnstructuredData"]:
+        """Batch version of `from_arrays_unchecked`: one object per item of
+        `vertex`. Coordinates shared by the objects (e.g. the attribute names)
+        are only built once.
+
+        Args:
+            vertex: Vertex array of every object
+            cells: Cells of every object. A single str applies to all of them
+            cells_attr: Cell attributes of every object or None
+            vertex_attr: Vertex attributes of every object or None
+            xarray_attributes: Attributes of every Dataset
+            default_cells_attr_name:
+            default_points_attr_name:
+
+        Returns:
+            List[UnstructuredData]
+        """
+        n = len(vertex)
+        if isinstance(cells, (str, SpecialCellCase)):
+            cells = [cells] * n
+        cells_attr = [None] * n if cells_attr is None else cells_attr
+        vertex_attr = [None] * n if vertex_attr is None else vertex_attr
+        if not len(cells) == len(cells_attr) == len(vertex_attr) == n:
+            raise ValueError("vertex, cells, cells_attr and vertex_attr must have the same length.")
+
+        builder = DatasetBuilder(default_cells_attr_name, default_points_attr_name)
+        return [
+                cls._from_dataset_unchecked(
+                    builder.build(v, c, ca, va, xarray_attributes), default_cells_attr_name, default_points_attr_name
+                )
+                for v, c, ca, va in zip(vertex, cells, cells_attr, vertex_attr)
+        ]
+
+    @classmethod
+    def concat(cls, unstructs: Sequence["UnstructuredData"], source_attr_name: Optional[str] = None) -> "UnstructuredData":
+        """Merge many objects into one, e.g. per-tile surfaces or well segments.
+
+        Sizes are computed first and every array is allocated once, so the cost
+        is linear in the total size. Cell indices are shifted by the vertex
+        offset of their object. Attribute columns are aligned by name, and
+        missing columns are NaN.
+
+        Args:
+            unstructs: Objects with the same number of vertex per cell. Names of
+             the attribute DataArrays and xarray attributes are taken from the first
+            source_attr_name: If given, add a cell and a vertex attribute with
+             this name holding the position of the source object in `unstructs`
+
+        Returns:
+            UnstructuredData
+        """
+        if len(unstructs) == 0:
+            raise ValueError("At least one UnstructuredData is needed.")
+        n_vertex_per_element = {u.n_vertex_per_element for u in unstructs}
+        if len(n_vertex_per_element) > 1:
+            raise ValueError(f"All objects must have the same number of vertex per cell, "
+                             f"not {sorted(n_vertex_per_element)}.")
+
+        n_points = [u.n_points for u in unstructs]
+        n_cells = [u.n_elements for u in unstructs]
+        vertex_offsets = np.cumsum([0] + n_points)
+        cells_offsets = np.cumsum([0] + n_cells)
+
+        vertex = np.empty((vertex_offsets[-1], 3), dtype=np.result_type(*[u.vertex.dtype for u in unstructs]))
+        cells = np.empty((cells_offsets[-1], n_vertex_per_element.pop()), dtype=np.result_type(*[u.cells.dtype for u in unstructs]))
+        for i, u in enumerate(unstructs):
+            vertex[vertex_offsets[i]:vertex_offsets[i + 1]] = u.vertex
+            np.add(u.cells, vertex_offsets[i], out=cells[cells_offsets[i]:cells_offsets[i + 1]], casting="unsafe")
+
+        source = None if source_attr_name is None else np.arange(len(unstructs))
+        cells_attr = _concat_attributes([u._attributes_view(u.cells_attr_name) for u in unstructs], n_cells,
+                                        source, source_attr_name)
+        vertex_attr = _concat_attributes([u._attributes_view(u.vertex_attr_name) for u in unstructs], n_points,
+                                         source, source_attr_name)
+
+        first = unstructs[0]
+        return cls.from_arrays_unchecked(
+            vertex=vertex,
+            cells=cells,
+            cells_attr=cells_attr,
+            vertex_attr=vertex_attr,
+            xarray_attributes=first.data.attrs,
+            default_cells_attr_name=first.cells_attr_name,
+            default_points_attr_name=first.vertex_attr_name
+        )
+
+    def crop(self, extent=None, polygon=None, clip: bool = False) -> "UnstructuredData":
+        """Keep the part of the object inside a region.
+
+        Cells with a vertex outside the region are dropped and the remaining
+        vertex are compacted. Point clouds whose cells have no vertex get one
+        empty cell per point kept, with its cell attributes if there was one
+        cell per point. Cell indices and attributes are remapped in one pass. If a
+        spatial index has been built (see `spatial_index`), only the vertex it
+        finds in the bounding box of the region are tested.
+
+        Args:
+            extent: [x_min, x_max, y_min, y_max] or [x_min, x_max, y_min, y_max,
+             z_min, z_max], boundaries included
+            polygon: NDArray[(Any, 2), FloatX]: XY vertex of a polygon. The region
+             is the prism below and above it
+            clip: Clip the triangles that cross the boundary instead of dropping
+             them. New vertex are added on the boundary with linearly
+             interpolated attributes. Only for triangles, and for polygons only
+             if they are convex
+
+        Returns:
+            UnstructuredData
+        """
+        box_min, box_max, polygon = parse_region(extent, polygon)
+        if clip and self.n_vertex_per_element != 3:
+            raise ValueError("Only triangles can be clipped.")
+
+        inside = self._vertex_in_box(box_min, box_max)
+        if polygon is not None:
+            candidates = np.flatnonzero(inside)
+            inside[candidates] = points_in_polygon(self.vertex[candidates], polygon)
+
+        vertex, cells = self.vertex, self.cells
+        vertex_view = self._attributes_view(self.vertex_attr_name)
+        cells_view = self._attributes_view(self.cells_attr_name)
+        vertex_values = _attribute_values(vertex_view, self.n_points)
+        cells_values, cells_names = _attribute_values(cells_view, self.n_elements), cells_view.names or None
+
+        if cells.shape[1] == 0:
+            cells, cells_values, cells_names = _point_cloud_cells(cells, cells_values, cells_names, self.n_points)
+            keep_cell = inside
+        elif clip:
+            # Triangles can cross the boundary without a vertex inside
+            keep_cell = cells_in_box(vertex, cells, box_min, box_max)
+        else:
+            keep_cell = inside[cells].all(axis=1)
+        cells, cells_values = cells[keep_cell], cells_values[keep_cell]
+        vertex, vertex_values, cells = _compact_vertex(vertex, vertex_values, cells, inside)
+
+        if clip:
+            vertex, vertex_values, cells, cells_values = clip_triangles(
+                vertex, vertex_values, cells, cells_values, half_spaces(box_min, box_max, polygon))
+            # Drop the vertex outside the region
+            vertex, vertex_values, cells = _compact_vertex(vertex, vertex_values, cells, None)
+        cells = cells.astype(self.cells.dtype, copy=False)
+
+        ds = DatasetBuilder(self.cells_attr_name, self.vertex_attr_name).build_from_values(
+            vertex, cells, cells_values, cells_names,
+            vertex_values, vertex_view.names or None, self.data.attrs)
+        return self._from_dataset_unchecked(ds, self.cells_attr_name, self.vertex_attr_name)
+
+    def _vertex_in_box(self, box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+        if self._spatial_index is None or self._spatial_index[0] is not self.data.variables['vertex']:
+            return points_in_box(self.vertex, box_min, box_max)
+        index = self.spatial_index
+        # Unbounded sides are clamped to the data so the tree can prune
+        box_min, box_max = np.maximum(box_min, index.tree.mins), np.minimum(box_max, index.tree.maxes)
+        inside = np.zeros(self.n_points, dtype=bool)
+        if (box_min <= box_max).all():
+            inside[index.query_box(box_min, box_max)] = True
+        return inside
+
+    def weld(self, tolerance: float = 0., vertex_attr_reduction: Literal["first", "mean"] = "first") -> "UnstructuredData":
+        """Merge the vertex closer than `tolerance` (see `vertex_welding`).
+
+        Cells are remapped to the merged vertex, and the ones that collapse
+        (two nodes on the same vertex) are dropped with their attributes.
+
+        Args:
+            tolerance: Size of the grid the vertex are rounded to. 0 merges only
+             identical vertex
+            vertex_attr_reduction: "first" keeps the position and attributes of
+             the first vertex of every group, "mean" averages the attributes
+
+        Returns:
+            UnstructuredData
+        """
+        first, inverse = weld_vertex(self.vertex, tolerance)
+        vertex_view = self._attributes_view(self.vertex_attr_name)
+        cells_view = self._attributes_view(self.cells_attr_name)
+        vertex_values = reduce_attributes(_attribute_values(vertex_view, self.n_points), first, inverse,
+                                          vertex_attr_reduction)
+        cells_values = _attribute_values(cells_view, self.n_elements)
+
+        if self.cells.shape[1] == 0:
+            keep = first if self.n_elements == self.n_points else slice(None)
+            cells = self.cells[keep]
+        else:
+            cells, keep = weld_cells(self.cells, inverse)
+
+        ds = DatasetBuilder(self.cells_attr_name, self.vertex_attr_name).build_from_values(
+            self.vertex[first], cells, cells_values[keep], cells_view.names or None,
+            vertex_values, vertex_view.names or None, self.data.attrs)
+        return self._from_dataset_unchecked(ds, self.cells_attr_name, self.vertex_attr_name)
+
+    def decimate(self, cell_size: float) -> "UnstructuredData":
+        """Simplify by vertex clustering: the vertex in the same cell of a grid
+        of size `cell_size` are merged into their mean.
+
+        Vertex attributes are averaged. Cells are remapped to the merged vertex,
+        and the ones that collapse or that repeat the nodes of a previous cell
+        are dropped; the rest keep their attributes. Vertex no longer used by any
+        cell are dropped.
+
+        Args:
+            cell_size: Size of the grid. Larger sizes give coarser results
+
+        Returns:
+            UnstructuredData
+        """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, not {cell_size}.")
+        if self.cells.shape[1] < 2:
+            raise AttributeError('Only cells with two or more nodes can be decimated.')
+        first, inverse = weld_vertex(self.vertex, cell_size)
+        vertex_view = self._attributes_view(self.vertex_attr_name)
+        cells_view = self._attributes_view(self.cells_attr_name)
+        vertex = reduce_attributes(self.vertex, first, inverse, "mean")
+        vertex_values = reduce_attributes(_attribute_values(vertex_view, self.n_points), first, inverse, "mean")
+
+        cells, keep = weld_cells(self.cells, inverse)
+        unique = unique_cells(cells)
+        cells, keep = cells[unique], np.flatnonzero(keep)[unique]
+        vertex, vertex_values, cells = _compact_vertex(vertex, vertex_values, cells, None)
+        cells_values = _attribute_values(cells_view, self.n_elements)[keep]
+
+        ds = DatasetBuilder(self.cells_attr_name, self.vertex_attr_name).build_from_values(
+            vertex, cells.astype(self.cells.dtype, copy=False), cells_values, cells_view.names or None,
+            vertex_values, vertex_view.names or None, self.data.attrs)
+        return self._from_dataset_unchecked(ds, self.cells_attr_name, self.vertex_attr_name)
+
+    def split_by(self, attr_name: Hashable, cells: bool = False) -> Dict[Hashable, "UnstructuredData"]:
+        """Split into one object per value of an attribute, e.g. per well or per
+        lithology.
+
+        The rows are sorted by group once. If they are already sorted, as the
+        vertex of the wells of a `BoreholeSet`, vertex and attributes of every
+        group are views of the arrays of this object. The cells of each group are
+        renumbered into a single new array and sliced from it. Items with a NaN
+        value are dropped. Point clouds whose cells have no vertex get one empty
+        cell per point of the group.
+
+        Args:
+            attr_name: Name of a vertex attribute, or of a cell attribute if `cells`
+            cells: If True, group the cells by a cell attribute. Each group has
+             the vertex used by its cells, which are copied because groups can
+             share vertex
+
+        Returns:
+            Dict[Hashable, UnstructuredData]: Objects by attribute value, sorted
+        """
+        view = self._attributes_view(self.cells_attr_name if cells else self.vertex_attr_name)
+        if attr_name not in view.columns:
+            raise KeyError(f"Attribute {attr_name} not found. Available attributes: {view.names}")
+        codes, uniques = pd.factorize(view.columns[attr_name], sort=True)
+        builder = DatasetBuilder(self.cells_attr_name, self.vertex_attr_name)
+        if cells:
+            parts = self._split_cells(codes, len(uniques), builder)
+        else:
+            parts = self._split_vertex(codes, len(uniques), builder)
+        return dict(zip(uniques.tolist(), parts))
+
+    def _split_vertex(self, codes: np.ndarray, n_groups: int, builder: DatasetBuilder) -> List["UnstructuredData"]:
+        vertex_view = self._attributes_view(self.vertex_attr_name)
+        cells_view = self._attributes_view(self.cells_attr_name)
+        vertex, vertex_values = self.vertex, _attribute_values(vertex_view, self.n_points)
+        cells, cells_values = self.cells, _attribute_values(cells_view, self.n_elements)
+        cells_names = cells_view.names or None
+        if cells.shape[1] == 0:
+            # The cell of a point belongs to the group of the point
+            cells, cells_values, cells_names = _point_cloud_cells(cells, cells_values, cells_names, self.n_points)
+            cell_code = codes
+        new_vertex_index = np.arange(self.n_points)
+        vertex_order = _group_order(codes)
+        if vertex_order is not None:
+            vertex, vertex_values, codes = vertex[vertex_order], vertex_values[vertex_order], codes[vertex_order]
+            new_vertex_index[vertex_order] = np.arange(self.n_points)
+        vertex_offsets = _group_offsets(codes, n_groups)
+
+        if cells.shape[1] > 0:
+            # A cell belongs to the group of its vertex. Cells across groups are dropped
+            cells = new_vertex_index[cells.astype(int, copy=False)]
+            cell_codes = codes[cells]
+            cell_code = np.where((cell_codes == cell_codes[:, :1]).all(axis=1), cell_codes[:, 0], -1)
+        cell_order = _group_order(cell_code)
+        if cell_order is not None:
+            cells, cells_values, cell_code = cells[cell_order], cells_values[cell_order], cell_code[cell_order]
+        cell_offsets = _group_offsets(cell_code, n_groups)
+        cells -= vertex_offsets[np.maximum(cell_code, 0)][:, None]
+        cells = cells.astype(self.cells.dtype, copy=False)
+
+        parts = []
+        for i in range(n_groups):
+            v, c = slice(vertex_offsets[i], vertex_offsets[i + 1]), slice(cell_offsets[i], cell_offsets[i + 1])
+            ds = builder.build_from_values(vertex[v], cells[c], cells_values[c], cells_names,
+                                           vertex_values[v], vertex_view.names or None, self.data.attrs)
+            parts.append(self._from_dataset_unchecked(ds, self.cells_attr_name, self.vertex_attr_name))
+        return parts
+
+    def _split_cells(self, codes: np.ndarray, n_groups: int, builder: DatasetBuilder) -> List["UnstructuredData"]:
+        vertex_view = self._attributes_view(self.vertex_attr_name)
+        cells_view = self._attributes_view(self.cells_attr_name)
+        vertex_values = _attribute_values(vertex_view, self.n_points)
+        cells, cells_values = self.cells, _attribute_values(cells_view, self.n_elements)
+        cell_order = _group_order(codes)
+        if cell_order is not None:
+            cells, cells_values, codes = cells[cell_order], cells_values[cell_order], codes[cell_order]
+        cell_offsets = _group_offsets(codes, n_groups)
+
+        parts = []
+        for i in range(n_groups):
+            c = slice(cell_offsets[i], cell_offsets[i + 1])
+            used, local_cells = np.unique(cells[c], return_inverse=True)
+            local_cells = local_cells.reshape(cells[c].shape).astype(cells.dtype, copy=False)
+            ds = builder.build_from_values(self.vertex[used], local_cells, cells_values[c], cells_view.names or None,
+                                           vertex_values[used], vertex_view.names or None, self.data.attrs)
+            parts.append(self._from_dataset_unchecked(ds, self.cells_attr_name, self.vertex_attr_name))
+        return parts
+
+    @classmethod
+    def _from_dataset_unchecked(cls, ds: xr.Dataset, cells_attr_name: str, vertex_attr_name: str) -> "UnstructuredData":
+        # The Dataset has been validated by DatasetBuilder
+        return cls(ds, cells_attr_name, vertex_attr_name, validate=False)
+
     @classmethod
     def from_data_arrays_dict(
             cls,
@@ -147,18 +527,23 @@ class UnstructuredData:
     def vertex(self) -> np.ndarray:
         return self.data['vertex'].values
 
+    @vertex.setter
+    def vertex(self, vertex: np.ndarray):
+        # Replace the variable (instead of writing into it) so the spatial index is rebuilt
+        self.data['vertex'] = self.data['vertex'].copy(data=vertex)
+
     @property
     def cells(self):
         return self.data['cells'].values
 
     @property
     def attributes(self) -> pd.DataFrame:
-        xarray = self.data[self.cells_attr_name]
-        return xarray.to_dataframe()[self.cells_attr_name].unstack(level=1)
+        return self._attributes_view(self.cells_attr_name).to_dataframe()
 
     @attributes.setter
     def attributes(self, dataframe):
         self.data[self.cells_attr_name] = xr.DataArray(dataframe, dims=['element', 'cell_attr'])
+        self._attributes_cache.pop(self.cells_attr_name, None)
 
     @property
     def cell_attributes(self):
@@ -170,16 +555,71 @@ class UnstructuredData:
         
     @property
     def points_attributes(self) -> pd.DataFrame:
-        data_array: xr.DataArray = self.data[self.vertex_attr_name]
-        dataframe: pd.DataFrame = data_array.to_dataframe()
-        not_suer = dataframe[self.vertex_attr_name]
-        unstack = not_suer.unstack(level=1)
-        return unstack
+        return self._attributes_view(self.vertex_attr_name).to_dataframe()
 
     @points_attributes.setter
     def points_attributes(self, dataframe: pd.DataFrame):
         vertex_attr: xr.DataArray = self.data[self.vertex_attr_name]
         vertex_attr.values = dataframe.values
+        self._attributes_cache.pop(self.vertex_attr_name, None)
+
+    @property
+    def cell_attributes_view(self) -> Dict[str, np.ndarray]:
+        """Cell attributes as 1-D arrays keyed by attribute name. The arrays are
+        views of the underlying DataArray, i.e. no data is copied."""
+        return dict(self._attributes_view(self.cells_attr_name).columns)
+
+    @property
+    def points_attributes_view(self) -> Dict[str, np.ndarray]:
+        """Vertex attributes as 1-D arrays keyed by attribute name. The arrays are
+        views of the underlying DataArray, i.e. no data is copied."""
+        return dict(self._attributes_view(self.vertex_attr_name).columns)
+
+    def _data_state(self) -> Tuple[Tuple[Hashable, xr.Variable, Any], ...]:
+        """Variables of the Dataset with their arrays, to tell if a result cached
+        for this object is still valid (see `_same_state`). Replacing a variable,
+        or the array of a data variable as ``ds[name].values = ...`` does, gives
+        a different state; writing into the arrays in place does not."""
+        # Only the arrays of the data variables: coordinates can build a new array on every `.data`
+        data_vars = self.data.data_vars
+        return tuple((name, variable, variable.data if name in data_vars else None)
+                     for name, variable in self.data.variables.items())
+
+    def _attributes_view(self, data_array_name: str) -> "_AttributesView":
+        cached = self._attributes_cache.get(data_array_name)
+        if cached is None or not cached.is_valid(self.data):
+            cached = _AttributesView.from_dataset(self.data, data_array_name)
+            self._attributes_cache[data_array_name] = cached
+        return cached
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """KD-tree of the vertex (requires scipy). It is built on first access
+        and rebuilt when the vertex variable is replaced, e.g. through the
+        `vertex` setter. Call `reset_spatial_index` after writing into
+        ``vertex`` in place."""
+        variable = self.data.variables['vertex']
+        if self._spatial_index is None or self._spatial_index[0] is not variable:
+            self._spatial_index = (variable, SpatialIndex(variable.values))
+        return self._spatial_index[1]
+
+    def reset_spatial_index(self):
+        self._spatial_index = None
+
+    def query_nearest(self, points: np.ndarray, k: int = 1,
+                      distance_upper_bound: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances and indices of the `k` closest vertex to every point. See
+        `SpatialIndex.query_nearest`."""
+        return self.spatial_index.query_nearest(points, k=k, distance_upper_bound=distance_upper_bound)
+
+    def query_radius(self, points: np.ndarray, radius: float) -> Union[np.ndarray, List[np.ndarray]]:
+        """Indices of the vertex within `radius` of every point. See
+        `SpatialIndex.query_radius`."""
+        return self.spatial_index.query_radius(points, radius)
+
+    def query_box(self, box_min, box_max) -> np.ndarray:
+        """Indices of the vertex inside an axis aligned box."""
+        return self.spatial_index.query_box(box_min, box_max)
 
     @property
     def n_elements(self):
@@ -227,27 +667,36 @@ class UnstructuredData:
         return bytearray_le, header
 
     def _set_binary_header(self):
+        cell_attributes = self._attributes_view(self.cells_attr_name)
+        points_attributes = self._attributes_view(self.vertex_attr_name)
         header = {
                 "vertex_shape"     : self.vertex.shape,
                 "cell_shape"       : self.cells.shape,
-                "cell_attr_shape"  : self.attributes.shape,
-                "vertex_attr_shape": self.points_attributes.shape,
-                "cell_attr_names"  : self.attributes.columns.to_list(),
-                "cell_attr_types"  : self.attributes.dtypes.astype(str).to_list(),
-                "vertex_attr_names": self.points_attributes.columns.to_list(),
-                "vertex_attr_types": self.attributes.dtypes.astype(str).to_list(),
+                "cell_attr_shape"  : cell_attributes.values.shape,
+                "vertex_attr_shape": points_attributes.values.shape,
+                "cell_attr_names"  : cell_attributes.names,
+                "cell_attr_types"  : cell_attributes.types,
+                "vertex_attr_names": points_attributes.names,
+                "vertex_attr_types": points_attributes.types,
                 "xarray_attrs"     : self.data.attrs
         }
         return header
 
     def _to_bytearray(self, order):
-        vertex = self.vertex.astype('float32').tobytes(order)
-        cells = self.cells.astype('int32').tobytes(order)
-        cell_attribute = self.attributes.values.astype('float32').tobytes(order)
-        vertex_attribute = self.points_attributes.values.astype('float32').tobytes(order)
-        bytearray_le = vertex + cells + cell_attribute + vertex_attribute
+        bytearray_le = b"".join(
+            array.astype(dtype).tobytes(order) for array, dtype in self._binary_blocks().values()
+        )
         return bytearray_le
 
+    def _binary_blocks(self) -> Dict[str, tuple[np.ndarray, str]]:
+        """Arrays written to the binary file, in order, with the dtype they are written as."""
+        return {
+                "vertex"     : (self.vertex, 'float32'),
+                "cell"       : (self.cells, 'int32'),
+                "cell_attr"  : (self._attributes_view(self.cells_attr_name).values, 'float32'),
+                "vertex_attr": (self._attributes_view(self.vertex_attr_name).values, 'float32'),
+        }
+
     def _validate(self):
         try:
             _ = self.data[self.cells_attr_name]['cell']
@@ -266,3 +715,121 @@ class UnstructuredData:
 
         if self.n_points != self.data[self.vertex_attr_name]['points'].size:
             raise AttributeError('points_attributes and vertex must have the same length.')
+
+
+def _compact_vertex(vertex: np.ndarray, vertex_values: np.ndarray, cells: np.ndarray,
+                    inside: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep the vertex used by `cells` (or `inside` if cells have no vertex) and
+    renumber the cells."""
+    if cells.shape[1] == 0:
+        keep_vertex = inside
+    else:
+        keep_vertex = np.zeros(vertex.shape[0], dtype=bool)
+        keep_vertex[cells.ravel()] = True
+    new_index = np.cumsum(keep_vertex) - 1
+    return vertex[keep_vertex], vertex_values[keep_vertex], new_index[cells.astype(int, copy=False)]
+
+
+def _point_cloud_cells(cells: np.ndarray, cells_values: np.ndarray, cells_names: Optional[List[Hashable]],
+                       n_points: int) -> Tuple[np.ndarray, np.ndarray, Optional[List[Hashable]]]:
+    """One empty cell per point for cells without vertex. The cell attributes
+    are kept if there is already one cell per point, and dropped otherwise."""
+    if cells.shape[0] == n_points:
+        return cells, cells_values, cells_names
+    return np.zeros((n_points, 0), dtype=cells.dtype), np.zeros((n_points, 0)), None
+
+
+def _attribute_values(view: "_AttributesView", n_rows: int) -> np.ndarray:
+    # Attribute-less views have shape (0, 0)
+    return view.values if view.names else np.zeros((n_rows, 0))
+
+
+def _group_order(codes: np.ndarray) -> Optional[np.ndarray]:
+    """Stable order that sorts `codes`, or None if they are already sorted."""
+    if codes.size == 0 or (codes[:-1] <= codes[1:]).all():
+        return None
+    return np.argsort(codes, kind="stable")
+
+
+def _group_offsets(sorted_codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """Group i spans ``offsets[i]:offsets[i + 1]`` of `sorted_codes`. Code -1
+    (missing) goes before the first group."""
+    return np.cumsum(np.bincount(sorted_codes + 1, minlength=n_groups + 1))
+
+
+def _concat_attributes(views: List["_AttributesView"], n_rows: List[int], source: Optional[np.ndarray],
+                       source_attr_name: Optional[str]) -> pd.DataFrame:
+    values, names = concat_attributes(
+        values=[view.values for view in views],
+        names=[view.names for view in views],
+        n_rows=n_rows,
+        source_values=source
+    )
+    if source is not None:
+        names.append(source_attr_name)
+    return pd.DataFrame(values, columns=names, copy=False)
+
+
+@dataclass
+class _AttributesView:
+    """Columnar view of one attributes DataArray of an `UnstructuredData`.
+
+    It is only valid as long as the Dataset keeps the same variables for the
+    attributes and their names, and the variable keeps the same array (e.g.
+    ``ds[name].values = ...`` replaces it). Otherwise, it is rebuilt on the next
+    access.
+    """
+    name: str
+    variable: xr.Variable
+    variable_data: Any
+    names_variable: Optional[xr.Variable]
+    values: np.ndarray
+    names: List[Hashable]
+    index: pd.Index
+    names_index: pd.Index
+    columns: Dict[Hashable, np.ndarray]
+
+    @classmethod
+    def from_dataset(cls, ds: xr.Dataset, data_array_name: str) -> "_AttributesView":
+        data_array: xr.DataArray = ds[data_array_name]
+        item_dim, attr_dim = data_array.dims
+        values = data_array.values
+        names_index = data_array.get_index(attr_dim)
+        names = names_index.to_list()
+        index = data_array.get_index(item_dim)
+        if len(names) == 0:
+            # Keep the (0, 0) shape of the unstacked DataFrame (and of the binary headers)
+            values, index = values[:0], index[:0]
+        return cls(
+            name=data_array_name,
+            variable=ds.variables[data_array_name],
+            variable_data=ds.variables[data_array_name].data,
+            names_variable=ds.variables.get(attr_dim),
+            values=values,
+            names=names,
+            index=index,
+            names_index=names_index,
+            columns={name: values[:, i] for i, name in enumerate(names)}
+        )
+
+    @property
+    def types(self) -> List[str]:
+        return [str(self.values.dtype)] * len(self.names)
+
+    def is_valid(self, ds: xr.Dataset) -> bool:
+        attr_dim = self.variable.dims[1]
+        return (ds.variables.get(self.name) is self.variable and
+                self.variable.data is self.variable_data and
+                ds.variables.get(attr_dim) is self.names_variable)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        # Copy so the DataFrame can be modified without touching the Dataset
+        return pd.DataFrame(self.values, index=self.index, columns=self.names_index, copy=True)
+
+
+def _same_state(a: Tuple[Tuple[Hashable, xr.Variable, Any], ...],
+                b: Tuple[Tuple[Hashable, xr.Variable, Any], ...]) -> bool:
+    return len(a) == len(b) and all(
+        name_a == name_b and variable_a is variable_b and data_a is data_b
+        for (name_a, variable_a, data_a), (name_b, variable_b, data_b) in zip(a, b)
+    )
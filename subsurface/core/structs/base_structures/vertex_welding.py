@@ -0,0 +1,114 @@
+"""Merge of coincident vertex (welding) by quantizing and hashing their coordinates.
+
+Coordinates are rounded to a grid of size `tolerance` and every grid cell is
+turned into an integer key with hash tables (`pd.factorize`), which is O(n)
+and keeps the vertex in order of first appearance, unlike `np.unique`, which
+sorts them. Vertex closer than `tolerance` can still fall on both sides of a
+grid line and not be merged; vertex further than `tolerance` are never merged
+unless they round to the same grid cell.
+"""
+from typing import Literal, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def weld_vertex(vertex: np.ndarray, tolerance: float = 0.) -> Tuple[np.ndarray, np.ndarray]:
+    """Group the vertex that fall in the same cell of a grid of size `tolerance`.
+
+    Args:
+        vertex: NDArray[(Any, 3), FloatX]
+        tolerance: Size of the grid. 0 merges only identical vertex
+
+    Returns:
+        Index of the first vertex of every group, and group of every vertex
+    """
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be positive, not {tolerance}.")
+    vertex = np.asarray(vertex, dtype=float)
+    if tolerance == 0:
+        # + 0. turns -0. into 0. so both have the same bits
+        keys = np.ascontiguousarray(vertex + 0.).view(np.int64)
+    else:
+        origin = vertex.min(axis=0) if vertex.shape[0] > 0 else 0.
+        keys = np.floor((vertex - origin) / tolerance + 0.5).astype(np.int64)
+
+    # One hash per vertex. Collisions between different keys are checked, and
+    # almost never happen, so the exact but slower path is rarely needed
+    hashes = keys[:, 0].copy()
+    for axis in range(1, keys.shape[1]):
+        hashes *= _HASH_MULTIPLIER
+        hashes ^= keys[:, axis]
+    first, inverse = _groups(hashes)
+    if not (keys[first][inverse] == keys).all():
+        # Combine the codes of every axis in a compact key, so the product never overflows
+        inverse = np.zeros(keys.shape[0], dtype=np.int64)
+        for axis in range(keys.shape[1]):
+            codes, uniques = pd.factorize(keys[:, axis])
+            inverse = inverse * len(uniques) + codes
+            if axis < keys.shape[1] - 1:
+                inverse, _ = pd.factorize(inverse)
+        first, inverse = _groups(inverse)
+    return first, inverse
+
+
+_HASH_MULTIPLIER = np.int64(0x5851F42D4C957F2D)
+
+
+def _groups(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First index of every distinct key and group of every key, in order of appearance."""
+    inverse, uniques = pd.factorize(keys)
+    first = np.empty(len(uniques), dtype=np.int64)
+    first[inverse[::-1]] = np.arange(inverse.size - 1, -1, -1)
+    return first, inverse
+
+
+def weld_cells(cells: np.ndarray, inverse: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cells on the welded vertex without the ones that collapsed.
+
+    Args:
+        cells: NDArray[(Any, n_nodes), IntX]
+        inverse: Group of every vertex from `weld_vertex`
+
+    Returns:
+        Remapped cells and mask of the input cells that are kept. Cells with a
+        repeated vertex are dropped, and so are repeated cells of one vertex
+    """
+    cells = inverse[cells].astype(cells.dtype, copy=False)
+    if cells.shape[1] == 1:
+        keep = np.zeros(cells.shape[0], dtype=bool)
+        keep[np.unique(cells[:, 0], return_index=True)[1]] = True
+    else:
+        sorted_cells = np.sort(cells, axis=1)
+        keep = (sorted_cells[:, 1:] != sorted_cells[:, :-1]).all(axis=1)
+    return cells[keep], keep
+
+
+def unique_cells(cells: np.ndarray) -> np.ndarray:
+    """Index of the first of every set of cells with the same nodes, in any
+    order, in order of appearance."""
+    # Node indices are exact as floats, so the rows are hashed like vertex
+    first, _ = weld_vertex(np.sort(cells, axis=1))
+    return first
+
+
+def reduce_attributes(values: np.ndarray, first: np.ndarray, inverse: np.ndarray,
+                      reduction: Literal["first", "mean"] = "first") -> np.ndarray:
+    """Attributes of the welded vertex.
+
+    Args:
+        values: NDArray[(n_vertex, n_attributes)]
+        first: Index of the first vertex of every group, from `weld_vertex`
+        inverse: Group of every vertex, from `weld_vertex`
+        reduction: Keep the values of the first vertex of every group or
+         average the group (the result is float)
+    """
+    if reduction == "first":
+        return values[first]
+    if reduction == "mean":
+        counts = np.bincount(inverse, minlength=first.size)
+        mean = np.empty((first.size, values.shape[1]), dtype=np.result_type(values.dtype, np.float64))
+        for column in range(values.shape[1]):
+            mean[:, column] = np.bincount(inverse, weights=values[:, column], minlength=first.size) / counts
+        return mean
+    raise ValueError(f"reduction must be 'first' or 'mean', not {reduction}.")
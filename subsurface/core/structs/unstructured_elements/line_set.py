@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 
 from ..base_structures import UnstructuredData
 
@@ -42,11 +41,7 @@ class LineSet:
             np.ndarray[(Any,), IntX]
 
         """
-        import xarray as xr
-        dataset: xr.Dataset = self.data.data
-        dataframe: pd.DataFrame = self.data.attributes
-        array = dataframe[attr_hole_id].values
-        
+        array = self.data.cell_attributes_view[attr_hole_id]
         first_index = np.where(array[:-1] != array[1:])[0]
         return first_index
         
@@ -41,3 +41,16 @@ class PointSet:
     def point_data_dict(self):
         """Fetch the point data as a dictionary of numpy arrays."""
         return self.data.attributes_to_dict
+
+    def query_nearest(self, points: "np.ndarray", k: int = 1):
+        """Distances and indices of the `k` closest points. See
+        `UnstructuredData.query_nearest`."""
+        return self.data.query_nearest(points, k=k)
+
+    def query_radius(self, points: "np.ndarray", radius: float):
+        """Indices of the points within `radius`. See `UnstructuredData.query_radius`."""
+        return self.data.query_radius(points, radius)
+
+    def query_box(self, box_min, box_max):
+        """Indices of the points inside an axis aligned box."""
+        return self.data.query_box(box_min, box_max)
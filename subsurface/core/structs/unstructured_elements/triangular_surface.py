@@ -1,4 +1,8 @@
+from typing import Optional, Tuple
+
 from ..base_structures import UnstructuredData, StructuredData
+from ..base_structures.mesh_decimation import LodPyramid
+from ..base_structures.unstructured_data import _same_state
 
 
 class TriSurf:
@@ -44,6 +48,7 @@ class TriSurf:
         self.texture_origin = kwargs.get('texture_origin', None)
         self.texture_point_u = kwargs.get('texture_point_u', None)
         self.texture_point_v = kwargs.get('texture_point_v', None)
+        self._lod_pyramid: Optional[Tuple[tuple, tuple, LodPyramid]] = None
 
     @property
     def has_texture_data(self):
@@ -56,3 +61,37 @@ class TriSurf:
     @property
     def n_triangles(self):
         return self.mesh.cells.shape[0]
+
+    def lod_pyramid(self, min_triangles: int = 1000, reduction: float = 4.) -> LodPyramid:
+        """Level of detail pyramid of the mesh (see `mesh_decimation`).
+
+        It is built the first time and cached until the mesh or any of its
+        variables (vertex, cells or attributes) are replaced, including their
+        arrays as ``mesh.data[name].values = ...`` does. Call
+        `reset_lod_pyramid` after writing into the arrays in place.
+
+        Args:
+            min_triangles: Levels are added while the last one has more triangles
+            reduction: Target ratio between the triangles of consecutive levels
+
+        Returns:
+            LodPyramid
+        """
+        state = self.mesh._data_state()
+        options = (min_triangles, reduction)
+        cached = self._lod_pyramid
+        if cached is None or not _same_state(cached[0], state) or cached[1] != options:
+            cached = (state, options, LodPyramid.from_mesh(self.mesh, min_triangles, reduction))
+            self._lod_pyramid = cached
+        return cached[2]
+
+    def reset_lod_pyramid(self):
+        self._lod_pyramid = None
+
+    def mesh_for_budget(self, max_triangles: Optional[int] = None) -> UnstructuredData:
+        """The mesh if it has at most `max_triangles` (or if None), otherwise the
+        most detailed level of the pyramid that does."""
+        if max_triangles is None or self.n_triangles <= max_triangles:
+            return self.mesh
+        pyramid = self.lod_pyramid()
+        return pyramid[pyramid.select(max_triangles)]
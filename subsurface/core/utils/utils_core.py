@@ -1,7 +1,10 @@
+import sys
 from typing import Union
 
 from pathlib import Path
 
+import numpy as np
+
 from ..structs import StructuredData, UnstructuredData
 
 
@@ -13,13 +16,25 @@ def get_extension(path):
         return False
 
 
+def is_dask_array(array) -> bool:
+    # dask is optional. If it has not been imported, array cannot be a dask array
+    dask = sys.modules.get("dask")
+    return dask is not None and dask.is_dask_collection(array)
+
+
 def replace_outliers(base_data: Union[StructuredData, UnstructuredData], dim=0, perc=0.99, replace_for=None):
     """@Edoardo Guerreiro https://stackoverflow.com/questions/60816533/
-     is-there-a-built-in-function-in-xarray-to-remove-outliers-from-a-dataset"""
+     is-there-a-built-in-function-in-xarray-to-remove-outliers-from-a-dataset
+
+    Lazy (dask) data stays lazy, and the percentile is computed chunk by chunk.
+    """
 
     data = base_data.data
     # calculate percentile
-    threshold = data[dim].quantile(perc)
+    if is_dask_array(data[dim].data):
+        threshold = lazy_quantile(data[dim].data, perc)
+    else:
+        threshold = data[dim].quantile(perc)
 
     # find outliers and replace them with max among remaining values
     mask = data[dim].where(abs(data[dim]) <= threshold)
@@ -36,3 +51,41 @@ def replace_outliers(base_data: Union[StructuredData, UnstructuredData], dim=0,
     data[dim] = mask
 
     return data
+
+
+def lazy_quantile(array, q: float, n_bins: int = 2 ** 16) -> float:
+    """Exact quantile (numpy ``linear`` method, NaNs ignored) of a dask array
+    without loading it into memory.
+
+    A histogram computed chunk by chunk finds the bins that contain the two
+    order statistics around the quantile. Only the values in those bins are
+    then loaded and sorted.
+    """
+    dask = sys.modules["dask"]
+    values = array.ravel()
+    min_value, max_value, n_values = dask.compute(
+        dask.array.nanmin(values), dask.array.nanmax(values), (~dask.array.isnan(values)).sum()
+    )
+    if n_values == 0:
+        return np.nan
+    if min_value == max_value:
+        return float(min_value)
+
+    counts, edges = dask.array.histogram(values, bins=n_bins, range=(min_value, max_value))
+    cumulative = np.cumsum(counts.compute())
+
+    position = (n_values - 1) * q
+    lower_rank = int(np.floor(position))
+    ranks = [lower_rank, min(lower_rank + 1, n_values - 1)]
+    order_statistics = []
+    for rank in ranks:
+        bin_index = int(np.searchsorted(cumulative, rank, side='right'))
+        low, high = edges[bin_index], edges[bin_index + 1]
+        # The last bin of a histogram is closed
+        in_bin = (values >= low) & ((values <= high) if bin_index == n_bins - 1 else (values < high))
+        bin_values = np.sort(values[in_bin].compute())
+        previous = cumulative[bin_index - 1] if bin_index > 0 else 0
+        order_statistics.append(bin_values[rank - previous])
+
+    lower, upper = order_statistics
+    return float(lower + (position - lower_rank) * (upper - lower))
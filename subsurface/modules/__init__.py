@@ -0,0 +1,18 @@
+import importlib
+
+import dotenv
+
+# Readers usually take their paths from the environment (.env)
+dotenv.load_dotenv()
+
+_SUBMODULES = ("reader", "writer", "visualization")
+
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
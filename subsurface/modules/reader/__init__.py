@@ -4,5 +4,8 @@ from .profiles import *
 
 from .topography.topo_core import read_structured_topography, read_unstructured_topography
 
-from .mesh.omf_mesh_reader import omf_stream_to_unstructs
+from .mesh.omf_mesh_reader import omf_stream_to_unstructs, omf_stream_to_structs
 from .mesh.dxf_reader import dxf_stream_to_unstruct_input, dxf_file_to_unstruct_input
+from .mesh.obj_reader import obj_stream_to_trisurf, obj_file_to_trisurf
+
+from .from_container import read_container, read_container_toc, read_container_block, read_container_attribute
@@ -3,44 +3,113 @@ import json
 import numpy as np
 import xarray as xr
 
+from subsurface.core.structs.base_structures import UnstructuredData
+from subsurface.core.structs.base_structures._unstructured_data_constructor import vertex_and_cells_arrays_to_data_array
 
-def read_data(json_file_path, binary_file_path):
+# Blocks of the .le file in the order and dtype written by UnstructuredData.to_binary
+BINARY_BLOCKS = {
+        'vertex'     : np.dtype('<f4'),
+        'cell'       : np.dtype('<i4'),
+        'cell_attr'  : np.dtype('<f4'),
+        'vertex_attr': np.dtype('<f4'),
+}
+
+
+def read_data(json_file_path, binary_file_path, mmap: bool = False):
     header = _read_json_header(json_file_path)
-    data_dict = _read_binary_data(binary_file_path, header)
+    data_dict = _read_binary_data(binary_file_path, header, mmap=mmap)
     return data_dict, header
 
 
+def read_binary_unstruct(json_file_path, binary_file_path, order='F') -> UnstructuredData:
+    """Open a .json/.le pair written by `base_structs_to_binary_file` as an
+    `UnstructuredData` without reading it.
+
+    The .le file is memory-mapped and vertex, cells and attributes are read-only
+    views of it, so the data is only paged in when it is accessed.
+
+    Args:
+        json_file_path: Path to the header
+        binary_file_path: Path to the .le file
+        order: Memory layout used to write the file
+
+    Returns:
+        UnstructuredData
+    """
+    header = _read_json_header(json_file_path)
+    data_dict = _read_binary_data(binary_file_path, header, order=order, mmap=True)
+
+    cells_data_array, n_cells, n_vertex, vertex_data_array = vertex_and_cells_arrays_to_data_array(
+        cells=data_dict['cell'],
+        vertex=data_dict['vertex']
+    )
+    cell_attrs = _attributes_data_array(data_dict['cell_attr'], header.get('cell_attr_names', []),
+                                        n_cells, dims=['cell', 'cell_attr'])
+    vertex_attrs = _attributes_data_array(data_dict['vertex_attr'], header.get('vertex_attr_names', []),
+                                          n_vertex, dims=['points', 'vertex_attr'])
+
+    ds = xr.Dataset(
+        data_vars={
+                "vertex"      : vertex_data_array,
+                "cells"       : cells_data_array,
+                "cell_attrs"  : cell_attrs,
+                "vertex_attrs": vertex_attrs
+        },
+        attrs=header.get('xarray_attrs')
+    )
+    return UnstructuredData(ds)
+
+
 def _read_json_header(json_file_path):
     with open(json_file_path, 'r') as f:
         header = json.load(f)
     return header
 
 
-def _read_binary_data(binary_file_path, header, order='F'):
+def _read_binary_data(binary_file_path, header, order='F', mmap=False):
+    if mmap:
+        buffer = _memory_map(binary_file_path)
+
     # Initialize offset to 0
     offset = 0
     # Create a dictionary to hold the arrays
     data_dict = {}
 
     # Loop over the arrays
-    for array_name in ['vertex', 'cell', 'cell_attr', 'vertex_attr']:
-        # Get the shape and type of the array from the header
-        array_shape = header.get(f'{array_name}_shape')
-        array_type = header.get(f'{array_name}_types', 'float32')  # default to float32 if not found
+    for array_name, dtype in BINARY_BLOCKS.items():
+        # Get the shape of the array from the header
+        array_shape = tuple(header.get(f'{array_name}_shape'))
 
         # Calculate the number of elements in the array
-        num_elements = np.prod(array_shape)
+        num_elements = int(np.prod(array_shape))
+        # Files written by base_structs_to_binary_file store the offset of every block
+        offset = header.get(f'{array_name}_offset', offset)
 
         # Read the data
-        data = np.fromfile(binary_file_path, dtype="int32", count=num_elements, offset=offset)
-        data = data.reshape(array_shape, order=order)
+        if mmap:
+            data = np.ndarray(array_shape, dtype=dtype, buffer=buffer, offset=offset, order=order)
+        else:
+            data = np.fromfile(binary_file_path, dtype=dtype, count=num_elements, offset=offset)
+            data = data.reshape(array_shape, order=order)
 
         # Store the data in the dictionary
         data_dict[array_name] = data
 
         # Update the offset
-        offset += data.nbytes
+        offset += num_elements * dtype.itemsize
 
     return data_dict
 
 
+def _memory_map(binary_file_path) -> np.ndarray:
+    try:
+        return np.memmap(binary_file_path, dtype=np.uint8, mode='r')
+    except ValueError:  # mmap cannot map empty files
+        return np.empty(0, dtype=np.uint8)
+
+
+def _attributes_data_array(data: np.ndarray, names: list, n_items: int, dims: list) -> xr.DataArray:
+    if len(names) == 0:
+        # Attribute-less blocks are written with shape (0, 0)
+        data = np.empty((n_items, 0), dtype=data.dtype)
+    return xr.DataArray(data, dims=dims, coords={dims[1]: names})
@@ -0,0 +1,129 @@
+import json
+import zlib
+from typing import Dict, Union
+
+import numpy as np
+import xarray as xr
+
+from subsurface.core.structs.base_structures import StructuredData, UnstructuredData
+from subsurface.core.structs.base_structures._unstructured_data_constructor import vertex_and_cells_arrays_to_data_array
+from subsurface.modules.writer.block_codecs import decode_block
+from subsurface.modules.writer.to_container import HEADER, MAGIC, VERSION
+
+
+def read_container(path, mmap: bool = True, verify: bool = False) -> Union[UnstructuredData, StructuredData]:
+    """Read a file written by `base_struct_to_container`.
+
+    Args:
+        path: Path of the file
+        mmap: If True, blocks are read-only views of the memory-mapped file and
+         are only read when accessed. Attributes of `UnstructuredData` and
+         compressed blocks are always read
+        verify: Check the CRC of every block
+
+    Returns:
+        UnstructuredData or StructuredData
+    """
+    toc = read_container_toc(path)
+    blocks = {entry["name"]: _read_block(path, entry, mmap, verify) for entry in toc["blocks"]}
+
+    if toc["kind"] == "UnstructuredData":
+        return _to_unstructured_data(toc, blocks)
+    if toc["kind"] == "StructuredData":
+        return _to_structured_data(toc, blocks)
+    raise ValueError(f"Unknown container kind {toc['kind']}.")
+
+
+def read_container_toc(path) -> Dict:
+    """Read the table of contents of a container without reading any block."""
+    with open(path, "rb") as file:
+        magic, version, _, _, toc_offset, toc_nbytes = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a subsurface container.")
+        if version > VERSION:
+            raise ValueError(f"Container version {version} is newer than the supported version {VERSION}.")
+        file.seek(toc_offset)
+        return json.loads(file.read(toc_nbytes).decode("utf-8"))
+
+
+def read_container_block(path, name: str, mmap: bool = True, verify: bool = False) -> np.ndarray:
+    """Read a single block of a container, e.g. ``vertex`` or ``vertex_attrs/0``.
+    Only the table of contents and the bytes of that block are read."""
+    toc = read_container_toc(path)
+    for entry in toc["blocks"]:
+        if entry["name"] == name:
+            return _read_block(path, entry, mmap, verify)
+    raise KeyError(f"Block {name} not found. Available blocks: {[entry['name'] for entry in toc['blocks']]}")
+
+
+def read_container_attribute(path, attribute_name, cells: bool = False, mmap: bool = True,
+                             verify: bool = False) -> np.ndarray:
+    """Read a single vertex (or cell) attribute of an `UnstructuredData` container."""
+    toc = read_container_toc(path)
+    names_key, prefix = ("cell_attr_names", "cell_attrs") if cells else ("vertex_attr_names", "vertex_attrs")
+    names = toc["meta"][names_key]
+    if attribute_name not in names:
+        raise KeyError(f"Attribute {attribute_name} not found. Available attributes: {names}")
+    return read_container_block(path, f"{prefix}/{names.index(attribute_name)}", mmap, verify)
+
+
+def _read_block(path, entry: Dict, mmap: bool, verify: bool) -> np.ndarray:
+    dtype = np.dtype(("<" if entry["byte_order"] == "little" else ">") + entry["dtype"])
+    shape = tuple(entry["shape"])
+
+    if "codec" in entry:
+        with open(path, "rb") as file:
+            file.seek(entry["offset"])
+            encoded = file.read(entry["nbytes"])
+        _verify_crc(entry, encoded, verify)
+        return decode_block(encoded, dtype, shape, entry["codec"], entry["filters"])
+
+    if mmap and entry["nbytes"] > 0:
+        array = np.memmap(path, dtype=dtype, mode="r", offset=entry["offset"], shape=shape).view(np.ndarray)
+    else:
+        array = np.fromfile(path, dtype=dtype, count=int(np.prod(shape)), offset=entry["offset"]).reshape(shape)
+    _verify_crc(entry, array, verify)
+    return array
+
+
+def _verify_crc(entry: Dict, data, verify: bool):
+    if verify and zlib.crc32(data) != entry["crc32"]:
+        raise ValueError(f"Block {entry['name']} is corrupted: CRC mismatch.")
+
+
+def _to_unstructured_data(toc: Dict, blocks: Dict[str, np.ndarray]) -> UnstructuredData:
+    meta = toc["meta"]
+    cells_data_array, n_cells, n_vertex, vertex_data_array = vertex_and_cells_arrays_to_data_array(
+        cells=blocks["cells"],
+        vertex=blocks["vertex"]
+    )
+    ds = xr.Dataset(
+        data_vars={
+                "vertex"                 : vertex_data_array,
+                "cells"                  : cells_data_array,
+                meta["cells_attr_name"]  : _attributes_data_array(
+                    blocks, "cell_attrs", meta["cell_attr_names"], n_cells, dims=["cell", "cell_attr"]),
+                meta["vertex_attr_name"] : _attributes_data_array(
+                    blocks, "vertex_attrs", meta["vertex_attr_names"], n_vertex, dims=["points", "vertex_attr"]),
+        },
+        attrs=toc["attrs"]
+    )
+    return UnstructuredData(ds, meta["cells_attr_name"], meta["vertex_attr_name"])
+
+
+def _attributes_data_array(blocks, prefix, names, n_items, dims) -> xr.DataArray:
+    if len(names) == 0:
+        values = np.zeros((n_items, 0))
+    else:
+        values = np.column_stack([blocks[f"{prefix}/{i}"] for i in range(len(names))])
+    return xr.DataArray(values, dims=dims, coords={dims[1]: names})
+
+
+def _to_structured_data(toc: Dict, blocks: Dict[str, np.ndarray]) -> StructuredData:
+    meta = toc["meta"]
+    ds = xr.Dataset(
+        data_vars={name: (dims, blocks[f"data_vars/{name}"]) for name, dims in meta["data_vars"].items()},
+        coords={name: (dims, blocks[f"coords/{name}"]) for name, dims in meta["coords"].items()},
+        attrs=toc["attrs"]
+    )
+    return StructuredData(ds, meta["data_array_name"])
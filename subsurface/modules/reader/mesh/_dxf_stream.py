@@ -0,0 +1,244 @@
+"""Streaming reader of the faces and lines of ASCII DXF files.
+
+The file is read in blocks of lines. Every block is turned into arrays of
+group codes and values, and the entities of every type are decoded at once
+with NumPy (one row per entity, one column per group code) instead of one
+Python object per entity. Only the current block, the decoded geometry and
+the names of the layers are kept in memory.
+
+Supported entities of the ENTITIES section (model space):
+    - 3DFACE: one triangle, or two if the fourth corner is not the third
+    - POLYLINE polyface meshes (flag 64) with their VERTEX records: triangles,
+      quads are split in two
+    - LINE: one segment
+"""
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, TextIO, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class DxfGeometry(NamedTuple):
+    vertex: np.ndarray  #: NDArray[(Any, 3), float]
+    cells: np.ndarray  #: NDArray[(Any, n_nodes), int]
+    layers: np.ndarray  #: Index in `DxfEntities.layer_names` of the layer of every cell
+
+
+class DxfEntities(NamedTuple):
+    triangles: DxfGeometry
+    lines: DxfGeometry
+    layer_names: List[str]
+
+
+def read_dxf_entities(stream: Union[BinaryIO, TextIO], block_size: int = 2 ** 24) -> DxfEntities:
+    """Read the 3DFACE, polyface POLYLINE and LINE entities of a DXF stream.
+
+    Triangles keep the order of their entities. Vertex are not shared between
+    3DFACE entities (see `vertex_welding` to merge them).
+
+    Args:
+        stream: Binary or text stream of an ASCII DXF file
+        block_size: Bytes (or characters) read at a time
+
+    Returns:
+        DxfEntities
+    """
+    reader = _DxfEntitiesReader()
+    for codes, values in _tag_batches(stream, block_size):
+        reader.read_batch(codes, values)
+    return reader.result()
+
+
+# Columns of the table of numeric group codes of every entity
+_NUMERIC_CODES = [10, 20, 30, 11, 21, 31, 12, 22, 32, 13, 23, 33, 67, 70, 71, 72, 73, 74]
+_COLUMN = np.full(1072, -1, dtype=np.int64)
+_COLUMN[_NUMERIC_CODES] = np.arange(len(_NUMERIC_CODES))
+_CORNERS = slice(0, 12)  # x, y, z of the four corners (or the two ends of a line)
+_PAPER_SPACE, _FLAGS, _FACE_INDICES = 12, 13, slice(14, 18)
+
+_OTHER, _SECTION, _ENDSEC, _3DFACE, _LINE, _POLYLINE, _VERTEX, _SEQEND = range(8)
+_KINDS = {"SECTION": _SECTION, "ENDSEC": _ENDSEC, "3DFACE": _3DFACE, "LINE": _LINE, "POLYLINE": _POLYLINE,
+          "VERTEX": _VERTEX, "SEQEND": _SEQEND}
+
+
+def _tag_batches(stream, block_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Group codes and values of whole entities, a block at a time.
+
+    The last entity of a block may be incomplete, so it is carried to the next
+    block, together with the VERTEX and SEQEND that follow a POLYLINE.
+    """
+    carry: list = []  # Complete lines not processed yet
+    pending = None  # Incomplete last line of the previous block
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            lines = carry + ([pending] if pending else [])
+            codes, values = _lines_to_tags(lines)
+            if codes.size > 0:
+                yield codes, values
+            return
+
+        if pending is not None:
+            block = pending + block
+        lines = block.split(b"\n" if isinstance(block, bytes) else "\n")
+        pending = lines.pop()
+        lines = carry + lines
+
+        codes, values = _lines_to_tags(lines)
+        cut = _last_entity_start(codes, values)
+        carry = lines[2 * cut:]
+        if cut > 0:
+            yield codes[:cut], values[:cut]
+
+
+def _lines_to_tags(lines: list) -> Tuple[np.ndarray, np.ndarray]:
+    n_tags = len(lines) // 2
+    # There are few distinct group codes, so only those are parsed
+    code_index, code_lines = pd.factorize(np.array(lines[0:2 * n_tags:2], dtype=object))
+    try:
+        codes = np.array([int(code) for code in code_lines], dtype=np.int64)[code_index]
+    except ValueError:
+        raise ValueError("Only ASCII DXF files can be streamed.") from None
+    return codes, np.array(lines[1:2 * n_tags:2], dtype=object)
+
+
+def _last_entity_start(codes: np.ndarray, values: np.ndarray) -> int:
+    """Index of the last group code 0 that does not belong to a polyline."""
+    for start in np.flatnonzero(codes == 0)[::-1]:
+        if _decode(values[start]) not in ("VERTEX", "SEQEND"):
+            return int(start)
+    return 0
+
+
+def _decode(value) -> str:
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="surrogateescape")
+    return value.strip()
+
+
+class _Buffer:
+    """Array that grows by doubling its capacity."""
+
+    def __init__(self, row_shape: tuple, dtype, capacity: int = 1024):
+        self._data = np.empty((capacity, *row_shape), dtype=dtype)
+        self.size = 0
+
+    def extend(self, rows: np.ndarray):
+        end = self.size + rows.shape[0]
+        if end > self._data.shape[0]:
+            data = np.empty((max(end, 2 * self._data.shape[0]), *self._data.shape[1:]), dtype=self._data.dtype)
+            data[:self.size] = self._data[:self.size]
+            self._data = data
+        self._data[self.size:end] = rows
+        self.size = end
+
+    def to_array(self) -> np.ndarray:
+        return self._data[:self.size].copy()
+
+
+class _DxfEntitiesReader:
+    def __init__(self):
+        self.in_entities = False
+        self.layer_ids: Dict[str, int] = {}
+        self.triangles = (_Buffer((3,), float), _Buffer((3,), np.int64), _Buffer((), np.int64))
+        self.lines = (_Buffer((3,), float), _Buffer((2,), np.int64), _Buffer((), np.int64))
+
+    def result(self) -> DxfEntities:
+        return DxfEntities(
+            triangles=DxfGeometry(*(buffer.to_array() for buffer in self.triangles)),
+            lines=DxfGeometry(*(buffer.to_array() for buffer in self.lines)),
+            layer_names=list(self.layer_ids)
+        )
+
+    def read_batch(self, codes: np.ndarray, values: np.ndarray):
+        starts = np.flatnonzero(codes == 0)
+        if starts.size == 0:
+            return
+        entity = np.cumsum(codes == 0) - 1  # Tags before the first entity get -1
+        kind_codes, names = pd.factorize(values[starts])
+        kinds = np.array([_KINDS.get(_decode(name), _OTHER) for name in names], dtype=np.int8)[kind_codes]
+        in_entities = self._in_entities_section(kinds, starts, values)
+
+        # Numeric group codes of the entities we decode, one row per entity
+        useful = in_entities & ((kinds == _3DFACE) | (kinds == _LINE) | (kinds == _POLYLINE) | (kinds == _VERTEX))
+        column = _COLUMN[np.clip(codes, 0, _COLUMN.size - 1)]
+        tags = np.flatnonzero((column >= 0) & (entity >= 0) & (codes < _COLUMN.size))
+        tags = tags[useful[entity[tags]]]
+        table = np.zeros((starts.size, len(_NUMERIC_CODES)))
+        table[entity[tags], column[tags]] = values[tags].astype(float)
+        in_model_space = in_entities & (table[:, _PAPER_SPACE] != 1)
+
+        layer_tag = np.full(starts.size, -1)
+        is_layer = np.flatnonzero((codes == 8) & (entity >= 0))
+        layer_tag[entity[is_layer]] = is_layer
+
+        self._read_triangles(kinds, in_model_space, table, layer_tag, values)
+        self._read_lines(kinds, in_model_space, table, layer_tag, values)
+
+    def _in_entities_section(self, kinds: np.ndarray, starts: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Whether every entity is in the ENTITIES section."""
+        is_marker = (kinds == _SECTION) | (kinds == _ENDSEC)
+        opens_entities = np.zeros(kinds.size, dtype=bool)
+        for i in np.flatnonzero(kinds == _SECTION):
+            # The name of the section is the next tag (group code 2)
+            opens_entities[i] = starts[i] + 1 < values.size and _decode(values[starts[i] + 1]) == "ENTITIES"
+        last_marker = np.maximum.accumulate(np.where(is_marker, np.arange(kinds.size), -1))
+        in_entities = np.where(last_marker >= 0, opens_entities[last_marker], self.in_entities)
+        self.in_entities = bool(in_entities[-1])
+        return in_entities
+
+    def _read_triangles(self, kinds, in_model_space, table, layer_tag, values):
+        vertex_buffer, cells_buffer, layers_buffer = self.triangles
+        faces = np.flatnonzero((kinds == _3DFACE) & in_model_space)
+        corners = table[faces, _CORNERS].reshape(-1, 4, 3)
+        quads = (corners[:, 3] != corners[:, 2]).any(axis=1)
+        soup = np.concatenate([corners[:, :3], corners[quads][:, [0, 2, 3]]]).reshape(-1, 3)
+        face_cells = vertex_buffer.size + np.arange(soup.shape[0]).reshape(-1, 3)
+
+        # Polyface meshes: a POLYLINE followed by its VERTEX, first positions and then face records
+        polyline = np.maximum.accumulate(np.where(kinds == _POLYLINE, np.arange(kinds.size), -1))
+        is_polyface = (kinds == _POLYLINE) & in_model_space & (table[:, _FLAGS].astype(np.int64) & 64 != 0)
+        owned = (kinds == _VERTEX) & (polyline >= 0) & is_polyface[np.maximum(polyline, 0)]
+        vertex_flags = table[:, _FLAGS].astype(np.int64) & 192
+        is_position = owned & (vertex_flags == 192)
+        records = np.flatnonzero(owned & (vertex_flags == 128))
+        positions = table[is_position, 0:3]
+
+        # 1-based indices in the positions of the polyline, negative for invisible edges
+        indices = np.abs(table[records, _FACE_INDICES]).astype(np.int64)
+        valid = (indices[:, :3] > 0).all(axis=1)
+        records, indices = records[valid], indices[valid]
+        quad_records = indices[:, 3] > 0
+        record_cells = np.concatenate([indices[:, :3], indices[quad_records][:, [0, 2, 3]]])
+        positions_before = np.cumsum(is_position) - is_position
+        first_position = np.concatenate([positions_before[polyline[records]],
+                                         positions_before[polyline[records[quad_records]]]])
+        record_cells += (vertex_buffer.size + soup.shape[0] - 1 + first_position)[:, None]
+
+        cells = np.concatenate([face_cells, record_cells])
+        sources = np.concatenate([faces, faces[quads], records, records[quad_records]])
+        layer_sources = np.concatenate([faces, faces[quads], polyline[records], polyline[records[quad_records]]])
+        order = np.argsort(sources, kind="stable")
+
+        vertex_buffer.extend(soup)
+        vertex_buffer.extend(positions)
+        cells_buffer.extend(cells[order])
+        layers_buffer.extend(self._layer_ids(layer_sources[order], layer_tag, values))
+
+    def _read_lines(self, kinds, in_model_space, table, layer_tag, values):
+        vertex_buffer, cells_buffer, layers_buffer = self.lines
+        lines = np.flatnonzero((kinds == _LINE) & in_model_space)
+        ends = table[lines, 0:6].reshape(-1, 3)
+        cells_buffer.extend(vertex_buffer.size + np.arange(ends.shape[0]).reshape(-1, 2))
+        vertex_buffer.extend(ends)
+        layers_buffer.extend(self._layer_ids(lines, layer_tag, values))
+
+    def _layer_ids(self, entities: np.ndarray, layer_tag: np.ndarray, values: np.ndarray) -> np.ndarray:
+        tags = layer_tag[entities]
+        # Entities without group code 8 are in layer "0"
+        names = values[np.maximum(tags, 0)]
+        names[tags < 0] = "0"
+        codes, uniques = pd.factorize(names)
+        ids = np.array([self.layer_ids.setdefault(_decode(name), len(self.layer_ids)) for name in uniques],
+                       dtype=np.int64)
+        return ids[codes]
@@ -0,0 +1,87 @@
+"""Direct access to the objects and arrays of OMF v1 files.
+
+An OMF v1 file is a 60 bytes header, the zlib compressed arrays, one after
+the other, and a JSON registry of every object by uid. Objects refer to each
+other and to their arrays by uid, and arrays are described by their offset,
+compressed length and dtype. Arrays are decompressed on demand, so they can be
+read by several threads at once (zlib releases the GIL).
+"""
+import io
+import json
+import mmap
+import struct
+import uuid
+import zlib
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+import numpy as np
+
+_MAGIC = b"\x84\x83\x82\x81"
+_HEADER = struct.Struct("<4s32s16sQ")  # magic, version, uid of the project, start of the JSON
+
+# Columns of the arrays of these classes. The rest are 1D
+_ARRAY_COLUMNS = {"Vector2Array": 2, "Vector3Array": 3, "Int2Array": 2, "Int3Array": 3, "ColorArray": 3}
+
+
+class OmfFile:
+    """Registry and raw bytes of an OMF v1 file.
+
+    Args:
+        stream: Path or binary stream of the file. Files on disk are memory
+         mapped instead of read.
+    """
+
+    def __init__(self, stream: Union[str, BinaryIO]):
+        self._mmap: Optional[mmap.mmap] = None
+        self.buffer = self._open(stream)
+        if len(self.buffer) < _HEADER.size:
+            raise ValueError("The stream is too short to be an OMF file.")
+        magic, version, uid, json_start = _HEADER.unpack(self.buffer[:_HEADER.size])
+        if magic != _MAGIC:
+            raise ValueError("The stream is not an OMF v1 file.")
+        self.version = version.rstrip(b"\x00").decode()
+        self.registry: Dict[str, Dict[str, Any]] = json.loads(bytes(self.buffer[json_start:]).decode("utf-8"))
+        self.project = self.registry[str(uuid.UUID(bytes=uid))]
+
+    def _open(self, stream) -> memoryview:
+        if isinstance(stream, str):
+            with open(stream, "rb") as file:
+                return self._map(file)
+        if isinstance(stream, io.BytesIO):
+            return stream.getbuffer()
+        try:
+            stream.seek(0)
+            return self._map(stream)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return memoryview(stream.read())
+
+    def _map(self, file) -> memoryview:
+        self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def close(self):
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getitem__(self, uid: str) -> Dict[str, Any]:
+        return self.registry[uid]
+
+    def array(self, uid: str) -> Union[np.ndarray, list]:
+        """Values of an array object. String and date arrays are lists."""
+        obj = self.registry[uid]
+        layout = obj["array"]
+        if not isinstance(layout, dict):
+            return layout
+        start, length = layout["start"], layout["length"]
+        values = np.frombuffer(zlib.decompress(self.buffer[start:start + length]), dtype=layout["dtype"])
+        values = values.astype(values.dtype.newbyteorder("="), copy=False)
+        columns = _ARRAY_COLUMNS.get(obj["__class__"])
+        return values if columns is None else values.reshape(-1, columns)
+
@@ -1,8 +1,14 @@
-from typing import Union, Callable
+import io
+import pathlib
+from typing import Union, Callable, Optional, Tuple, List, Dict
 
 import numpy as np
 import pandas as pd
 
+from subsurface import optional_requirements
+from subsurface.core.reader_helpers.readers_data import GenericReaderFilesHelper, SupportedFormats
+from subsurface.core.reader_helpers.reader_unstruct import ReaderUnstructuredHelper
+
 
 def mesh_csv_to_vertex(path_to_file: str, columns_map: Union[None, Callable, dict, pd.Series] = None,
                        **reader_kwargs) -> np.ndarray:
@@ -51,3 +57,194 @@ def map_columns_names(columns_map: Union[Callable, dict, pd.Series], data: pd.Da
         raise AttributeError('At least x, y, z must be passed to `columns_map`')
 
     return data.columns
+
+
+def is_single_csv(reader_args: ReaderUnstructuredHelper) -> bool:
+    """Whether all the helpers read the same CSV file with the same options,
+    except for the columns, so `mesh_csv_to_arrays` can read them in one pass."""
+    helpers = _helpers(reader_args)
+    first = helpers[0]
+    if any(helper.format is not SupportedFormats.CSV for helper in helpers):
+        return False
+    if not first.is_file_in_disk and not (hasattr(first.file_or_buffer, "seek") and first.file_or_buffer.seekable()):
+        return False
+    return all(_same_source(first, helper) and _kwargs_without_usecols(helper) == _kwargs_without_usecols(first)
+               for helper in helpers[1:])
+
+
+def mesh_csv_to_arrays(reader_args: ReaderUnstructuredHelper, chunksize: int = 2 ** 20, engine: Optional[str] = None) \
+        -> Tuple[np.ndarray, Optional[np.ndarray], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """Vertex, cells and attributes of a mesh stored in one CSV file, in one scan.
+
+    Same result as `mesh_csv_to_vertex`, `mesh_csv_to_cells` and
+    `mesh_csv_to_attributes` on every helper (see `is_single_csv`), but the
+    file is parsed once, a chunk at a time, into arrays preallocated for the
+    number of lines of the file. Vertex and cells columns are parsed as float64.
+
+    Args:
+        reader_args: Helpers of the vertex, cells and attributes
+        chunksize: Number of rows parsed at a time by the "c" engine
+        engine: Pandas engine. "pyarrow" parses the whole file at once with
+         several threads. Defaults to the `engine` of the reader kwargs, or "c"
+
+    Returns:
+        vertex, cells, cells attributes and vertex attributes. Missing helpers give None
+    """
+    vertex_args = reader_args.reader_vertex_args
+    kwargs = _kwargs_without_usecols(vertex_args)
+    engine = engine or kwargs.pop("engine", "c")
+    kwargs.pop("engine", None)
+    source = vertex_args.file_or_buffer
+
+    header = _with_rewind(source, lambda: pd.read_csv(source, nrows=0, **kwargs).columns)
+    selections = {name: _helper_columns(helper, header) for name, helper in _named_helpers(reader_args).items()}
+    vertex_columns = _required_columns(selections["vertex"], ['x', 'y', 'z'])
+    cells_columns = _required_columns(selections["cells"], ['e1', 'e2', 'e3']) if "cells" in selections else None
+
+    used = set(column for file_columns, _ in selections.values() for column in file_columns)
+    usecols = [column for column in header if column in used]
+    dtype = {column: np.float64 for column in vertex_columns + (cells_columns or [])}
+    # Counted before parsing starts, from where pandas will read
+    n_rows = _with_rewind(source, lambda: _count_lines(source))
+    if engine == "pyarrow":
+        optional_requirements.require_pyarrow()
+        if kwargs.get("index_col") is False:
+            kwargs.pop("index_col")
+        chunks = [pd.read_csv(source, usecols=usecols, dtype=dtype, engine="pyarrow", **kwargs)]
+    else:
+        chunks = pd.read_csv(source, usecols=usecols, dtype=dtype, engine=engine, chunksize=chunksize, **kwargs)
+
+    vertex = np.empty((n_rows, 3))
+    cells = np.empty((n_rows, 3), dtype=int) if cells_columns is not None else None
+    attributes: Dict[str, Dict[int, np.ndarray]] = {"cells_attr": {}, "vertex_attr": {}}
+    start = n_cells = 0
+    for chunk in chunks:
+        stop = start + len(chunk)
+        if stop > n_rows:
+            # More rows than lines counted, e.g. if the buffer was appended to
+            n_rows = max(stop, 2 * n_rows)
+            vertex = _resized(vertex, n_rows)
+            cells = _resized(cells, n_rows) if cells is not None else None
+            for columns in attributes.values():
+                columns.update({i: _resized(column, n_rows) for i, column in columns.items()})
+        vertex[start:stop] = chunk[vertex_columns].to_numpy(np.float64)
+        if cells is not None:
+            chunk_cells = chunk[cells_columns].to_numpy(np.float64)
+            chunk_cells = chunk_cells[~np.isnan(chunk_cells).any(axis=1)]
+            cells[n_cells:n_cells + chunk_cells.shape[0]] = chunk_cells
+            n_cells += chunk_cells.shape[0]
+        for name, columns in attributes.items():
+            if name in selections:
+                _fill_columns(columns, chunk, selections[name][0], start, stop, n_rows)
+        start = stop
+
+    result_attributes = {
+            name: pd.DataFrame({column_name: columns[i][:start] for i, column_name in enumerate(selections[name][1])})
+            for name, columns in attributes.items() if name in selections
+    }
+    return (
+        vertex[:start],
+        cells[:n_cells] if cells is not None else None,
+        result_attributes.get("cells_attr"),
+        result_attributes.get("vertex_attr")
+    )
+
+
+def _named_helpers(reader_args: ReaderUnstructuredHelper) -> Dict[str, GenericReaderFilesHelper]:
+    helpers = {
+            "vertex"     : reader_args.reader_vertex_args,
+            "cells"      : reader_args.reader_cells_args,
+            "cells_attr" : reader_args.reader_cells_attr_args,
+            "vertex_attr": reader_args.reader_vertex_attr_args,
+    }
+    return {name: helper for name, helper in helpers.items() if helper is not None}
+
+
+def _helpers(reader_args: ReaderUnstructuredHelper) -> List[GenericReaderFilesHelper]:
+    return list(_named_helpers(reader_args).values())
+
+
+def _same_source(a: GenericReaderFilesHelper, b: GenericReaderFilesHelper) -> bool:
+    if a.is_file_in_disk and b.is_file_in_disk:
+        return pathlib.Path(a.file_or_buffer) == pathlib.Path(b.file_or_buffer)
+    return a.file_or_buffer is b.file_or_buffer
+
+
+def _kwargs_without_usecols(helper: GenericReaderFilesHelper) -> dict:
+    kwargs = dict(helper.pandas_reader_kwargs)
+    kwargs.pop("usecols")
+    return kwargs
+
+
+def _helper_columns(helper: GenericReaderFilesHelper, header: pd.Index) -> Tuple[List, pd.Index]:
+    """Columns of the file read by the helper (in file order, like `usecols`)
+    and their names after `columns_map`."""
+    usecols = helper.usecols
+    if usecols is None:
+        file_columns = list(header)
+    elif all(isinstance(column, int) for column in usecols):
+        file_columns = [column for i, column in enumerate(header) if i in usecols]
+    else:
+        missing = [column for column in usecols if column not in header]
+        if missing:
+            raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+        file_columns = [column for column in header if column in usecols]
+
+    names = pd.Index(file_columns)
+    if helper.columns_map is not None:
+        names = names.map(helper.columns_map)
+    return file_columns, names
+
+
+def _required_columns(selection: Tuple[List, pd.Index], names: List[str]) -> List:
+    file_columns, mapped = selection
+    if not set(names).issubset(mapped):
+        raise KeyError(f'Columns {", ".join(names)} must be present in the data set. Use '
+                       'columns_map to map other names')
+    return [file_columns[mapped.get_loc(name)] for name in names]
+
+
+def _fill_columns(columns: Dict[int, np.ndarray], chunk: pd.DataFrame, file_columns: List,
+                  start: int, stop: int, n_rows: int):
+    for i, file_column in enumerate(file_columns):
+        values = chunk[file_column].to_numpy()
+        column = columns.get(i)
+        if column is None:
+            column = columns[i] = np.empty(n_rows, dtype=values.dtype)
+        elif not np.can_cast(values.dtype, column.dtype, casting="safe"):
+            # Chunks are parsed separately, so a later one can need a wider type
+            column = columns[i] = column.astype(np.result_type(column.dtype, values.dtype))
+        column[start:stop] = values
+
+
+def _resized(array: np.ndarray, n_rows: int) -> np.ndarray:
+    resized = np.empty((n_rows, *array.shape[1:]), dtype=array.dtype)
+    resized[:min(n_rows, array.shape[0])] = array[:n_rows]
+    return resized
+
+
+def _with_rewind(source, function):
+    """Call `function` and move a buffer back to where it was."""
+    if isinstance(source, (str, pathlib.PurePath)):
+        return function()
+    position = source.tell()
+    try:
+        return function()
+    finally:
+        source.seek(position)
+
+
+def _count_lines(source) -> int:
+    """Number of lines of a file or buffer, an upper bound of its rows."""
+    if isinstance(source, io.StringIO):
+        return source.getvalue().count("\n") + 1
+    stream = open(source, "rb") if isinstance(source, (str, pathlib.PurePath)) else source
+    try:
+        newline = "\n" if isinstance(stream, io.TextIOBase) else b"\n"
+        n_lines = 1
+        while block := stream.read(2 ** 24):
+            n_lines += block.count(newline)
+        return n_lines
+    finally:
+        if stream is not source:
+            stream.close()
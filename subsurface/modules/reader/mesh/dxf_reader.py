@@ -1,9 +1,12 @@
 import pathlib
-from typing import TextIO, Union
+from typing import TextIO, Union, Optional, BinaryIO, List
 
 import numpy as np
+import pandas as pd
 
 from subsurface import optional_requirements
+from subsurface.core.structs.base_structures.vertex_welding import weld_vertex, weld_cells
+from ._dxf_stream import read_dxf_entities, DxfGeometry
 
 
 def dxf_from_file_to_vertex(file_path: str):
@@ -34,23 +37,66 @@ def dxf_from_stream_to_vertex(stream: TextIO):
     return vertex
 
 
-def dxf_file_to_unstruct_input(file: Union[str, pathlib.Path]):
+def dxf_file_to_unstruct_input(file: Union[str, pathlib.Path], weld_tolerance: Optional[float] = None,
+                               streaming: bool = False):
+    """Vertex, cells and layer of every cell of the faces of a DXF file.
+
+    Args:
+        file: Path to the DXF file
+        weld_tolerance: Faces are stored with their own copy of every vertex.
+         If not None, vertex closer than this are merged (see
+         `vertex_welding`), e.g. 0. merges the identical ones. By default every
+         face keeps its three vertex
+        streaming: Read the file a block at a time without ezdxf (see
+         `read_dxf_entities`). Memory stays bounded by the block size and the
+         geometry, and polyface meshes and quads are read too. Only for ASCII DXF
+
+    Returns:
+        vertex, cells, integer layer of every cell and map of layer names to integers
+    """
+    if streaming:
+        with open(file, "rb") as stream:
+            entities = read_dxf_entities(stream)
+        return _dxf_geometry_to_unstruct_input(entities.triangles, entities.layer_names, weld_tolerance)
+
     ezdxf = optional_requirements.require_ezdxf()
     dataset = ezdxf.readfile(file)
-    cell_attr_int, cell_attr_map, cells, vertex = _dxf_dataset_to_unstruct_input(dataset)
+    cell_attr_int, cell_attr_map, cells, vertex = _dxf_dataset_to_unstruct_input(dataset, weld_tolerance)
 
     return vertex, cells, cell_attr_int, cell_attr_map
 
 
-def dxf_stream_to_unstruct_input(stream: TextIO):
+def dxf_stream_to_unstruct_input(stream: Union[TextIO, BinaryIO], weld_tolerance: Optional[float] = None,
+                                 streaming: bool = False):
+    if streaming:
+        entities = read_dxf_entities(stream)
+        return _dxf_geometry_to_unstruct_input(entities.triangles, entities.layer_names, weld_tolerance)
+
     ezdxf = optional_requirements.require_ezdxf()
     dataset = ezdxf.read(stream)
-    cell_attr_int, cell_attr_map, cells, vertex = _dxf_dataset_to_unstruct_input(dataset)
+    cell_attr_int, cell_attr_map, cells, vertex = _dxf_dataset_to_unstruct_input(dataset, weld_tolerance)
 
     return vertex, cells, cell_attr_int, cell_attr_map
 
 
-def _dxf_dataset_to_unstruct_input(dataset):
+def dxf_file_to_lines_unstruct_input(file: Union[str, pathlib.Path], weld_tolerance: Optional[float] = None):
+    """Vertex, cells and layer of every cell of the LINE entities of a DXF
+    file, read in streaming mode.
+
+    Args:
+        file: Path to the DXF file
+        weld_tolerance: If not None, vertex closer than this are merged
+
+    Returns:
+        vertex, cells (two vertex each), integer layer of every cell and map of
+        layer names to integers
+    """
+    with open(file, "rb") as stream:
+        entities = read_dxf_entities(stream)
+    return _dxf_geometry_to_unstruct_input(entities.lines, entities.layer_names, weld_tolerance)
+
+
+def _dxf_dataset_to_unstruct_input(dataset, weld_tolerance: Optional[float] = None):
     vertex = []
     cell_attr = []
     entity = dataset.modelspace()
@@ -62,10 +108,29 @@ def _dxf_dataset_to_unstruct_input(dataset):
     vertex = np.array(vertex)
     cells = np.arange(0, vertex.shape[0]).reshape(-1, 3)
     cell_attr_int, cell_attr_map = _map_cell_attr_strings_to_integers(cell_attr)
+    vertex, cells, cell_attr_int = _weld(vertex, cells, cell_attr_int, weld_tolerance)
     return cell_attr_int, cell_attr_map, cells, vertex
 
 
+def _dxf_geometry_to_unstruct_input(geometry: DxfGeometry, layer_names: List[str],
+                                    weld_tolerance: Optional[float]):
+    layer_ids, used_layers = pd.factorize(geometry.layers, sort=True)
+    cell_attr_int, cell_attr_map = _map_cell_attr_strings_to_integers(np.array(layer_names)[used_layers][layer_ids])
+    vertex, cells, cell_attr_int = _weld(geometry.vertex, geometry.cells, cell_attr_int, weld_tolerance)
+    return vertex, cells, cell_attr_int, cell_attr_map
+
+
+def _weld(vertex: np.ndarray, cells: np.ndarray, cell_attr_int: np.ndarray, weld_tolerance: Optional[float]):
+    if weld_tolerance is not None:
+        first, inverse = weld_vertex(vertex, weld_tolerance)
+        cells, keep = weld_cells(cells, inverse)
+        vertex, cell_attr_int = vertex[first], cell_attr_int[keep]
+    return vertex, cells, cell_attr_int
+
+
 def _map_cell_attr_strings_to_integers(cell_attr):
-    d = dict([(y, x + 1) for x, y in enumerate(sorted(set(np.unique(cell_attr))))])
-    cell_attr_int = np.array([d[x] for x in cell_attr])
+    # Layers sorted by name, numbered from 1
+    codes, names = pd.factorize(np.asarray(cell_attr), sort=True)
+    cell_attr_int = codes + 1
+    d = {name: i + 1 for i, name in enumerate(names.tolist())}
     return cell_attr_int, d
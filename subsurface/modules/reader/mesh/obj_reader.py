@@ -1,3 +1,277 @@
-﻿import pyvista as pv
+"""Reader of the triangles and texture coordinates of Wavefront OBJ files.
+
+The file is read in blocks of whole lines. Comments (from # to the end of
+the line) are blanked out, the lines of every block are classified by their
+keyword (v, vt, f), which can be indented, and the numbers of all the lines of
+one kind are parsed at once by NumPy, so large scans and photogrammetry models
+do not go through one Python object per line.
+
+Only vertex (v), texture coordinates (vt) and faces (f) are read. Normals,
+groups, materials, points and lines are ignored.
+"""
+import pathlib
+import warnings
+from typing import BinaryIO, List, Optional, Tuple, Union
+
 import numpy as np
-import os
+import pandas as pd
+
+from ....core.structs.base_structures import UnstructuredData
+from ....core.structs.unstructured_elements import TriSurf
+
+
+def obj_file_to_trisurf(path: Union[str, pathlib.Path], block_size: int = 2 ** 24) -> TriSurf:
+    """Read the faces of an OBJ file. See `obj_stream_to_trisurf`."""
+    with open(path, "rb") as stream:
+        return obj_stream_to_trisurf(stream, block_size)
+
+
+def obj_stream_to_trisurf(stream: BinaryIO, block_size: int = 2 ** 24) -> TriSurf:
+    """Read the faces of an OBJ stream as triangles.
+
+    Polygons are split in a fan of triangles around their first vertex. If the
+    faces have texture coordinates, they are the 'u' and 'v' vertex attributes.
+    Vertex with more than one pair of texture coordinates (on the seams of the
+    texture) are duplicated, and then the vertex not used by any face are
+    dropped.
+
+    Args:
+        stream: Binary stream of the OBJ file
+        block_size: Bytes read at a time
+
+    Returns:
+        TriSurf
+    """
+    reader = _ObjReader()
+    for block in _line_blocks(stream, block_size):
+        reader.read_block(block)
+    vertex, cells, uv = reader.result()
+    unstruct = UnstructuredData.from_arrays_unchecked(
+        vertex=vertex,
+        cells=cells,
+        vertex_attr=None if uv is None else {"u": uv[:, 0], "v": uv[:, 1]}
+    )
+    return TriSurf(unstruct)
+
+
+def _line_blocks(stream: BinaryIO, block_size: int):
+    """Blocks of whole lines, every one ending with a new line."""
+    pending = b""
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            if pending.strip():
+                yield pending + b"\n"
+            return
+        block = pending + block
+        end = block.rfind(b"\n") + 1
+        pending = block[end:]
+        if end > 0:
+            yield block[:end]
+
+
+_SPACE, _NEW_LINE, _SLASH, _HASH = ord(" "), ord("\n"), ord("/"), ord("#")
+_OTHER, _VERTEX, _UV, _FACE = range(4)
+
+
+class _ObjReader:
+    def __init__(self):
+        self.vertex: List[np.ndarray] = []
+        self.uv: List[np.ndarray] = []
+        # 0-based vertex and uv of the corners of the triangles
+        self.vertex_index: List[np.ndarray] = []
+        self.uv_index: List[np.ndarray] = []
+        self.n_vertex = 0
+        self.n_uv = 0
+        self.vertex_columns: Optional[int] = None
+        self.uv_columns: Optional[int] = None
+        self.face_format: Optional[Tuple[int, bool]] = None  # Numbers per face vertex, and if the second is vt
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        vertex = np.concatenate(self.vertex) if self.vertex else np.empty((0, 3))
+        vertex_index = np.concatenate(self.vertex_index) if self.vertex_index else np.empty(0, dtype=np.int64)
+        if not self.uv_index:
+            return vertex, vertex_index.reshape(-1, 3), None
+        if self.n_uv == 0:
+            raise ValueError("The faces of the OBJ file have texture coordinates but there are no 'vt' lines.")
+        uv, uv_index = np.concatenate(self.uv), np.concatenate(self.uv_index)
+
+        vertex_uv_index = np.full(vertex.shape[0], -1)
+        vertex_uv_index[vertex_index] = uv_index
+        if (vertex_uv_index[vertex_index] == uv_index).all():
+            # Every vertex has one pair of texture coordinates
+            vertex_uv = np.full((vertex.shape[0], 2), np.nan)
+            used = vertex_uv_index >= 0
+            vertex_uv[used] = uv[vertex_uv_index[used]]
+            return vertex, vertex_index.reshape(-1, 3), vertex_uv
+
+        pairs, unique_pairs = pd.factorize(vertex_index * self.n_uv + uv_index)
+        return vertex[unique_pairs // self.n_uv], pairs.reshape(-1, 3), uv[unique_pairs % self.n_uv]
+
+    def read_block(self, block: bytes):
+        data = np.frombuffer(block, dtype=np.uint8)
+        line_end = np.flatnonzero(data == _NEW_LINE)
+        line_start = np.concatenate([[0], line_end[:-1] + 1])
+        data = _blank_comments(data, line_end)
+        keyword = _keyword_start(data, line_start, line_end)
+        # Blank lines have the new line as keyword
+        first, second = data[keyword], data[np.minimum(keyword + 1, data.size - 1)]
+        is_blank = (second <= _SPACE)
+        kinds = np.full(line_start.size, _OTHER, dtype=np.uint8)
+        kinds[(first == ord("v")) & is_blank] = _VERTEX
+        kinds[(first == ord("v")) & (second == ord("t"))] = _UV
+        kinds[(first == ord("f")) & is_blank] = _FACE
+
+        vertex_before = self.n_vertex + np.cumsum(kinds == _VERTEX)
+        uv_before = self.n_uv + np.cumsum(kinds == _UV)
+        vertex_lines, uv_lines, face_lines = (np.flatnonzero(kinds == kind) for kind in (_VERTEX, _UV, _FACE))
+        self._read_vertex(_select_lines(data, line_start, line_end, keyword, vertex_lines, 1), vertex_lines.size)
+        self._read_uv(_select_lines(data, line_start, line_end, keyword, uv_lines, 2), uv_lines.size)
+        self._read_faces(_select_lines(data, line_start, line_end, keyword, face_lines, 1),
+                         vertex_before[face_lines], uv_before[face_lines])
+
+    def _read_vertex(self, data: np.ndarray, n_lines: int):
+        if n_lines == 0:
+            return
+        if self.vertex_columns is None:
+            self.vertex_columns = _count_numbers(data)
+        # x, y, z, optionally followed by w or by the color
+        self.vertex.append(_parse_columns(data, n_lines, self.vertex_columns, 3))
+        self.n_vertex += n_lines
+
+    def _read_uv(self, data: np.ndarray, n_lines: int):
+        if n_lines == 0:
+            return
+        if self.uv_columns is None:
+            self.uv_columns = _count_numbers(data)
+        self.uv.append(_parse_columns(data, n_lines, self.uv_columns, 2))
+        self.n_uv += n_lines
+
+    def _read_faces(self, data: np.ndarray, vertex_before: np.ndarray, uv_before: np.ndarray):
+        if vertex_before.size == 0:
+            return
+        # Face vertex per line: starts of the tokens between the new lines
+        is_space = data <= _SPACE
+        token_start = np.flatnonzero(~is_space & np.concatenate([[True], is_space[:-1]]))
+        tokens_before = np.searchsorted(token_start, np.flatnonzero(data == _NEW_LINE))
+        n_corners = np.diff(tokens_before, prepend=0)
+        if (n_corners < 3).any():
+            raise ValueError("OBJ faces must have at least 3 vertex.")
+
+        if self.face_format is None:
+            token = data[token_start[0]:]
+            token = token[:np.argmax(token <= _SPACE)].tobytes()
+            self.face_format = (len([number for number in token.split(b"/") if number]), b"//" not in token)
+        numbers_per_corner, has_uv = self.face_format
+        has_uv = has_uv and numbers_per_corner > 1
+        data[data == _SLASH] = _SPACE
+        numbers = _parse_numbers(data, np.int64, int(n_corners.sum()), numbers_per_corner)
+        if numbers is None:
+            raise ValueError("All the faces of the OBJ file must have the same v/vt/vn format.")
+
+        # Fan of triangles of every face, as indices of the corners
+        if (n_corners == 3).all():
+            corners = slice(None)
+            face_of_corner = None
+        else:
+            first_corner = np.cumsum(n_corners) - n_corners
+            n_triangles = n_corners - 2
+            face = np.repeat(np.arange(n_corners.size), n_triangles)
+            fan = np.arange(face.size) - np.repeat(np.cumsum(n_triangles) - n_triangles, n_triangles) + 1
+            corners = (first_corner[face][:, None] + np.column_stack([np.zeros_like(fan), fan, fan + 1])).ravel()
+            face_of_corner = np.repeat(face, 3)
+
+        self.vertex_index.append(_absolute_index(numbers[corners, 0], vertex_before, face_of_corner))
+        if has_uv:
+            self.uv_index.append(_absolute_index(numbers[corners, 1], uv_before, face_of_corner))
+
+
+def _blank_comments(data: np.ndarray, line_end: np.ndarray) -> np.ndarray:
+    """Copy of the block with the comments replaced by spaces, or the block
+    itself if it has no comments."""
+    hashes = np.flatnonzero(data == _HASH)
+    if hashes.size == 0:
+        return data
+    # First # of every line with comments
+    comment_line, first = np.unique(np.searchsorted(line_end, hashes), return_index=True)
+    comment_start = hashes[first]
+    lengths = line_end[comment_line] - comment_start
+    data = data.copy()
+    data[np.repeat(comment_start - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())] = _SPACE
+    return data
+
+
+def _keyword_start(data: np.ndarray, line_start: np.ndarray, line_end: np.ndarray) -> np.ndarray:
+    """Position of the first byte of every line that is not a space, or of its
+    new line if it is blank."""
+    keyword = line_start.copy()
+    indented = (data[keyword] <= _SPACE) & (keyword < line_end)
+    # Indented lines are rare and their indentation is short, so they advance one byte at a time
+    while indented.any():
+        keyword[indented] += 1
+        indented &= (data[keyword] <= _SPACE) & (keyword < line_end)
+    return keyword
+
+
+def _select_lines(data: np.ndarray, line_start: np.ndarray, line_end: np.ndarray, keyword: np.ndarray,
+                  lines: np.ndarray, keyword_size: int) -> np.ndarray:
+    """Copy of some lines, with their keyword replaced by spaces."""
+    # Lines of one kind usually come in a few runs of consecutive lines, which are copied as slices
+    run_start = np.flatnonzero(np.diff(lines, prepend=-2) != 1)
+    if run_start.size <= _MAX_RUNS:
+        run_end = np.append(run_start[1:], lines.size) - 1
+        selected = np.concatenate([data[line_start[lines[start]]:line_end[lines[end]] + 1]
+                                   for start, end in zip(run_start, run_end)] or [data[:0]])
+    else:
+        line_kept = np.zeros(line_start.size, dtype=bool)
+        line_kept[lines] = True
+        selected = data[np.repeat(line_kept, line_end - line_start + 1)]
+
+    lengths = line_end[lines] - line_start[lines] + 1
+    keyword_start = np.cumsum(lengths) - lengths + (keyword[lines] - line_start[lines])
+    for i in range(keyword_size):
+        selected[keyword_start + i] = _SPACE
+    return selected
+
+
+_MAX_RUNS = 64
+
+
+def _absolute_index(index: np.ndarray, n_before: np.ndarray, face_of_corner: Optional[np.ndarray]) -> np.ndarray:
+    """0-based indices from 1-based ones, or negative ones from the last vertex before the face."""
+    negative = index < 0
+    if not negative.any():
+        return index - 1
+    if face_of_corner is None:
+        face_of_corner = np.arange(index.size) // 3
+    return np.where(negative, n_before[face_of_corner] + index, index - 1)
+
+
+def _count_numbers(data: np.ndarray) -> int:
+    """Numbers in the first line."""
+    line = data[:np.argmax(data == _NEW_LINE)].tobytes()
+    return len(line.split())
+
+
+def _parse_numbers(data: np.ndarray, dtype, n_rows: int, n_columns: int) -> Optional[np.ndarray]:
+    """Numbers of `n_rows` lines of `n_columns` numbers, None if the lines do not match."""
+    with warnings.catch_warnings():
+        # Invalid numbers stop the parsing with a DeprecationWarning, the size check below catches them
+        warnings.simplefilter("ignore", DeprecationWarning)
+        numbers = np.fromstring(data.tobytes(), dtype=dtype, sep=" ")
+    if numbers.size != n_rows * n_columns:
+        return None
+    return numbers.reshape(n_rows, n_columns)
+
+
+def _parse_columns(data: np.ndarray, n_rows: int, n_columns: int, n_used: int) -> np.ndarray:
+    """First `n_used` numbers of every line. Lines with a different number of
+    numbers than the first one are parsed one at a time."""
+    numbers = _parse_numbers(data, float, n_rows, n_columns)
+    if numbers is None:
+        lines = data.tobytes().split(b"\n")[:-1]
+        try:
+            numbers = np.array([line.split()[:n_used] for line in lines], dtype=float)
+        except ValueError:
+            raise ValueError(f"Every vertex of the OBJ file must have at least {n_used} coordinates.") from None
+    return numbers[:, :n_used]
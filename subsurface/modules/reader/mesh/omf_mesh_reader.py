@@ -1,26 +1,184 @@
 import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
-from ....optional_requirements import require_omf, require_pyvista
-from ....core.structs.base_structures import UnstructuredData
-
-
-def omf_stream_to_unstructs(stream: io.BytesIO) -> list[UnstructuredData]:
-    pyvista = require_pyvista()
-    omfvista = require_omf()
-    omf = omfvista.load_project(stream)
-    list_unstructs: list[UnstructuredData] = []
-    for i in range(omf.n_blocks):
-        block: pyvista.PolyData = omf[i]
-        cell_type = block.get_cell(0).type
-        if cell_type == pyvista.CellType.TRIANGLE:
-            pyvista_unstructured_grid: pyvista.UnstructuredGrid = block.cast_to_unstructured_grid()
-
-            # * Create the unstructured data
-            unstructured_data = UnstructuredData.from_array(
-                vertex=pyvista_unstructured_grid.points,
-                cells=pyvista_unstructured_grid.cells.reshape(-1, 4)[:, 1:],
-            )
-            unstructured_data.data.attrs['name'] = omf.get_block_name(i)
-            list_unstructs.append(unstructured_data)
-    
-    return list_unstructs
\ No newline at end of file
+import numpy as np
+import xarray as xr
+
+from ._omf_stream import OmfFile
+from ....core.structs.base_structures import StructuredData, UnstructuredData
+from ....core.structs.structured_elements import StructuredGrid
+from ....core.structs.unstructured_elements import LineSet, PointSet, TriSurf
+
+OmfStruct = Union[PointSet, LineSet, TriSurf, StructuredGrid]
+
+
+def omf_stream_to_unstructs(stream: Union[str, BinaryIO, io.BytesIO],
+                            n_workers: Optional[int] = None) -> list[UnstructuredData]:
+    """UnstructuredData of the triangulated surfaces of an OMF v1 file.
+
+    Args:
+        stream: Path or binary stream of the file
+        n_workers (int): Number of threads. Default of ThreadPoolExecutor if None
+
+    Returns:
+        One UnstructuredData per triangulated surface, with the name of the
+        element in `attrs['name']`
+    """
+    with OmfFile(stream) as omf_file:
+        surfaces = [uid for uid in omf_file.project["elements"]
+                    if omf_file[omf_file[uid]["geometry"]]["__class__"] == "SurfaceGeometry"]
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            structs = list(executor.map(lambda uid: _element_to_struct(omf_file, uid), surfaces))
+    return [struct.mesh for struct in structs]
+
+
+def omf_stream_to_structs(stream: Union[str, BinaryIO, io.BytesIO],
+                          n_workers: Optional[int] = None) -> List[OmfStruct]:
+    """Read every element of an OMF v1 file, without omf or VTK.
+
+    The arrays are read straight from the file and the elements are converted
+    by a pool of threads. Vertex are in project coordinates: the origins of
+    the project and of the geometry are added.
+
+    - PointSetElement: PointSet
+    - LineSetElement: LineSet
+    - SurfaceElement: TriSurf. Grid surfaces are split in two triangles per
+      face, which both get the data of the face
+    - VolumeElement: StructuredGrid with the data of the cells on dims
+      ('x', 'y', 'z'), whose coords are the cell centers. If the axes of the
+      grid are not X, Y and Z, the coords are distances along the axes from
+      the origin, and the origin and axes are in the attrs
+
+    Scalar and mapped data (the indices; legends are in `attrs['legends']`)
+    keep their name, and the components of vector and color data are
+    suffixed with _x, _y, _z or _r, _g, _b. Other data is skipped.
+
+    Args:
+        stream: Path or binary stream of the file
+        n_workers (int): Number of threads. Default of ThreadPoolExecutor if None
+
+    Returns:
+        One object per element, in the order of the project, with the name of
+        the element in `attrs['name']`
+    """
+    with OmfFile(stream) as omf_file:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            return list(executor.map(lambda uid: _element_to_struct(omf_file, uid), omf_file.project["elements"]))
+
+
+_VECTOR_SUFFIXES = {"Vector2Data": ("_x", "_y"), "Vector3Data": ("_x", "_y", "_z"), "ColorData": ("_r", "_g", "_b")}
+
+
+def _element_to_struct(omf_file: OmfFile, uid: str) -> OmfStruct:
+    element = omf_file[uid]
+    geometry = omf_file[element["geometry"]]
+    origin = np.asarray(omf_file.project.get("origin", [0., 0., 0.]), dtype=float)
+    origin = origin + np.asarray(geometry.get("origin", [0., 0., 0.]), dtype=float)
+    data, legends = _element_data(omf_file, element)
+    attrs = {"name": element["name"]}
+    if legends:
+        attrs["legends"] = legends
+
+    geometry_class = geometry["__class__"]
+    if geometry_class == "VolumeGridGeometry":
+        return _volume_grid(geometry, origin, data, attrs)
+
+    if geometry_class == "SurfaceGridGeometry":
+        vertex, cells, face = _surface_grid(omf_file, geometry, origin)
+    else:
+        vertex = omf_file.array(geometry["vertices"]) + origin
+        if geometry_class == "PointSetGeometry":
+            cells, face = "points", None
+        elif geometry_class == "LineSetGeometry":
+            cells, face = omf_file.array(geometry["segments"]), None
+        elif geometry_class == "SurfaceGeometry":
+            cells, face = omf_file.array(geometry["triangles"]), None
+        else:
+            raise ValueError(f"OMF geometry {geometry_class} is not supported.")
+
+    vertex_attr = data.get("vertices", {})
+    cells_attr = {**data.get("segments", {}), **data.get("faces", {})}
+    if face is not None:
+        cells_attr = {name: values[face] for name, values in cells_attr.items()}
+    unstruct = UnstructuredData.from_arrays_unchecked(
+        vertex=vertex,
+        cells=cells,
+        cells_attr=cells_attr or None,
+        vertex_attr=vertex_attr or None,
+        xarray_attributes=attrs
+    )
+    if geometry_class == "PointSetGeometry":
+        return PointSet(unstruct)
+    if geometry_class == "LineSetGeometry":
+        return LineSet(unstruct)
+    return TriSurf(unstruct)
+
+
+def _element_data(omf_file: OmfFile, element: dict) -> Tuple[Dict[str, Dict[str, np.ndarray]], dict]:
+    """1D arrays of the data of an element by location and name, and legends of the mapped data."""
+    data: Dict[str, Dict[str, np.ndarray]] = {}
+    legends = {}
+    for uid in element.get("data", []):
+        datum = omf_file[uid]
+        name, data_class = datum["name"], datum["__class__"]
+        location = data.setdefault(datum["location"], {})
+        if data_class == "ScalarData":
+            location[name] = omf_file.array(datum["array"])
+        elif data_class == "MappedData":
+            location[name] = omf_file.array(datum["array"])
+            legends[name] = {omf_file[legend]["name"]: _to_list(omf_file.array(omf_file[legend]["values"]))
+                             for legend in datum.get("legends", [])}
+        elif data_class in _VECTOR_SUFFIXES:
+            values = omf_file.array(datum["array"])
+            for column, suffix in enumerate(_VECTOR_SUFFIXES[data_class]):
+                location[name + suffix] = values[:, column]
+    return data, legends
+
+
+def _to_list(values) -> list:
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+
+def _grid_axes(geometry: dict, n_axes: int) -> np.ndarray:
+    """Rows are the unit vectors of the u, v (and w) axes of the grid."""
+    axes = [geometry.get(axis, default) for axis, default in
+            zip(("axis_u", "axis_v", "axis_w"), np.eye(3))][:n_axes]
+    return np.asarray(axes, dtype=float)
+
+
+def _surface_grid(omf_file: OmfFile, geometry: dict, origin: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vertex and triangles of a grid surface, and face of every triangle.
+
+    Vertex are ordered with u first, like the faces and the data of OMF."""
+    u = np.concatenate([[0.], np.cumsum(geometry["tensor_u"])])
+    v = np.concatenate([[0.], np.cumsum(geometry["tensor_v"])])
+    axis_u, axis_v = _grid_axes(geometry, 2)
+    w = np.zeros(u.size * v.size)
+    if geometry.get("offset_w") is not None:
+        w = omf_file.array(geometry["offset_w"])
+    local = np.column_stack([np.tile(u, v.size), np.repeat(v, u.size), w])
+    vertex = local @ np.array([axis_u, axis_v, np.cross(axis_u, axis_v)]) + origin
+
+    # Corners of every face, counter-clockwise from (u, v)
+    corner = (np.arange(v.size - 1)[:, None] * u.size + np.arange(u.size - 1)).ravel()
+    a, b, c, d = corner, corner + 1, corner + u.size + 1, corner + u.size
+    cells = np.stack([np.column_stack([a, b, c]), np.column_stack([a, c, d])], axis=1).reshape(-1, 3)
+    return vertex, cells, np.repeat(np.arange(corner.size), 2)
+
+
+def _volume_grid(geometry: dict, origin: np.ndarray, data: Dict[str, Dict[str, np.ndarray]],
+                 attrs: dict) -> StructuredGrid:
+    tensors = [np.asarray(geometry[tensor], dtype=float) for tensor in ("tensor_u", "tensor_v", "tensor_w")]
+    centers = [np.cumsum(tensor) - tensor / 2 for tensor in tensors]
+    axes = _grid_axes(geometry, 3)
+    if np.array_equal(axes, np.eye(3)):
+        centers = [center + offset for center, offset in zip(centers, origin)]
+    else:
+        attrs = {**attrs, "origin": origin, "axis_u": axes[0], "axis_v": axes[1], "axis_w": axes[2]}
+
+    # Cell data varies fastest along w
+    shape = tuple(center.size for center in centers)
+    data_vars = {name: (("x", "y", "z"), values.reshape(shape)) for name, values in data.get("cells", {}).items()}
+    ds = xr.Dataset(data_vars, coords={"x": centers[0], "y": centers[1], "z": centers[2]}, attrs=attrs)
+    return StructuredGrid(StructuredData(ds, next(iter(data_vars), "data_array")))
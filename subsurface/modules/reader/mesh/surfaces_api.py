@@ -1,10 +1,11 @@
 import pandas as pd
-from typing import Union
+from typing import Union, Optional
 
 import numpy as np
 import warnings
 
 from .surface_reader import read_mesh_file_to_vertex, read_mesh_file_to_cells, cells_from_delaunay, read_mesh_file_to_attr
+from .csv_mesh_reader import is_single_csv, mesh_csv_to_arrays
 from ....core.reader_helpers.reader_unstruct import ReaderUnstructuredHelper
 from ....core.structs import UnstructuredData
 
@@ -13,24 +14,38 @@ from ....core.structs.base_structures.base_structures_enum import SpecialCellCas
 
 def read_2d_mesh_to_unstruct(
         reader_args: ReaderUnstructuredHelper,
-        delaunay: bool = True
+        delaunay: bool = True,
+        weld_tolerance: Optional[float] = None
 ) -> UnstructuredData:
-    
-    vertex: np.ndarray = read_mesh_file_to_vertex(reader_args.reader_vertex_args)
-    cells: Union[np.ndarray, SpecialCellCase]
+    """Read a surface from vertex, cells and attributes files.
+
+    Args:
+        reader_args: Files of the vertex, cells and attributes
+        delaunay: Triangulate the vertex if there is no cells file
+        weld_tolerance: If not None, merge the vertex closer than this (see
+         `UnstructuredData.weld`)
+    """
+
+    cells: Union[np.ndarray, SpecialCellCase, None] = None
     cells_attr: Union[pd.DataFrame, None] = None
     vertex_attr: Union[pd.DataFrame, None] = None
-    if reader_args.reader_cells_args is not None:
-        cells = read_mesh_file_to_cells(reader_args.reader_cells_args)
-    elif delaunay:
-        cells = cells_from_delaunay(vertex)
+    if is_single_csv(reader_args):
+        # Every helper reads the same file, so it is parsed once
+        vertex, cells, cells_attr, vertex_attr = mesh_csv_to_arrays(reader_args)
     else:
+        vertex = read_mesh_file_to_vertex(reader_args.reader_vertex_args)
+        if reader_args.reader_cells_args is not None:
+            cells = read_mesh_file_to_cells(reader_args.reader_cells_args)
+        if reader_args.reader_cells_attr_args is not None:
+            cells_attr = read_mesh_file_to_attr(reader_args.reader_cells_attr_args)
+        if reader_args.reader_vertex_attr_args is not None:
+            vertex_attr = read_mesh_file_to_attr(reader_args.reader_vertex_attr_args)
+
+    if cells is None and delaunay:
+        cells = cells_from_delaunay(vertex)
+    elif cells is None:
         warnings.warn("No arguments to compute cell")
         cells = SpecialCellCase.POINTS
-    if reader_args.reader_cells_attr_args is not None:
-        cells_attr = read_mesh_file_to_attr(reader_args.reader_cells_attr_args)
-    if reader_args.reader_vertex_attr_args is not None:
-        vertex_attr = read_mesh_file_to_attr(reader_args.reader_vertex_attr_args)
 
     ud = UnstructuredData.from_array(
         vertex=vertex,
@@ -38,4 +53,6 @@ def read_2d_mesh_to_unstruct(
         cells_attr=cells_attr,
         vertex_attr=vertex_attr,
     )
+    if weld_tolerance is not None:
+        ud = ud.weld(weld_tolerance)
     return ud
@@ -9,7 +9,7 @@ import pandas as pd
 import subsurface
 from subsurface import optional_requirements
 from subsurface.core.structs.unstructured_elements import TriSurf
-from ...visualization import to_pyvista_line, to_pyvista_mesh
+from ...visualization import to_pyvista_mesh, to_pyvista_tubes, PyvistaScalarType
 
 
 @dataclass
@@ -66,22 +66,45 @@ def create_tri_surf_from_traces_texture(
     return tri_surf, pyvista_mesh
 
 
-def lineset_from_trace(path_to_trace, idx=None):
-    import geopandas as gpd
+def lineset_from_trace(path_to_trace, idx=None, radius: float = 10, n_sides: int = 6,
+                       merge: bool = False) -> list["pv.PolyData"]:
+    """Tubes along the traces of a shapefile. The geometry of the tubes of all
+    the traces is built at once.
+
+    Args:
+        path_to_trace: Shapefile of the traces
+        idx: Index of the traces to read. All if None
+        radius (float): Radius of the tubes
+        n_sides (int): Sides of the tubes
+        merge (bool): Return all the tubes in a single mesh instead of one
+         mesh per trace
+
+    Returns:
+        One pv.PolyData per trace with segments, or a list with one
+        pv.PolyData if `merge`. The 'trace' cell attribute is the position of
+        the trace of every triangle
+    """
+    gpd = optional_requirements.require_geopandas()
 
     traces = gpd.read_file(path_to_trace)
     traces = _select_traces_by_index(idx, traces)
 
-    mesh_list = []
-    for index, row in traces.iterrows():
-        s = len(row['geometry'].coords.xy[0])
-        vertex = np.array((*row['geometry'].coords.xy,
-                           np.zeros(s))).T
-        unstruct = subsurface.UnstructuredData.from_array(vertex, 'lines')
-        ls = subsurface.LineSet(unstruct)
-        mesh_list.append(to_pyvista_line(ls, radius=10))
-
-    return mesh_list
+    coords = traces.geometry.get_coordinates()
+    trace = pd.factorize(coords.index)[0]
+    vertex = np.column_stack([coords['x'], coords['y'], np.zeros(len(coords))])
+    start = np.flatnonzero(trace[1:] == trace[:-1])
+
+    unstruct = subsurface.UnstructuredData.from_arrays_unchecked(
+        vertex=vertex,
+        cells=np.column_stack([start, start + 1]),
+        cells_attr={'trace': trace[start]}
+    )
+    if merge:
+        return [to_pyvista_tubes(subsurface.LineSet(unstruct), radius=radius, n_sides=n_sides,
+                                 scalar_type=PyvistaScalarType.CELL)]
+    return [to_pyvista_tubes(subsurface.LineSet(part), radius=radius, n_sides=n_sides,
+                             scalar_type=PyvistaScalarType.CELL)
+            for part in unstruct.split_by('trace', cells=True).values()]
 
 
 def _traces_texture_to_sub_structs(path_to_trace, path_to_texture, idx, uv=None) -> list[TriSurf]:
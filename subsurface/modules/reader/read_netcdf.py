@@ -33,6 +33,14 @@ def _legacy_read_unstruct(ds):
     return ud
 
 
-def read_struct(path, **kwargs):
-    ds = xr.open_dataset(path, **kwargs)
+def read_struct(path, chunks=None, **kwargs):
+    """Read a StructuredData from a netCDF file.
+
+    Args:
+        path: Path of the file
+        chunks: If not None, the variables are opened lazily as dask arrays with
+         these chunks (see `xarray.open_dataset`) and only read chunk by chunk
+         when needed. ``chunks={}`` uses the chunks of the file.
+    """
+    ds = xr.open_dataset(path, chunks=chunks, **kwargs)
     return StructuredData(ds)
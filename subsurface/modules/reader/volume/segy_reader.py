@@ -1,33 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 from subsurface import optional_requirements
 from ....core.structs.base_structures import StructuredData
 import numpy as np
 
+TEXTUAL_HEADER_NBYTES = 3200
+BINARY_HEADER_NBYTES = 400
+TRACE_HEADER_NBYTES = 240
+CHUNK_NBYTES = 2 ** 24  # Size of the trace ranges decoded at once by each worker
 
-def read_in_segy(filepath: str, coords=None) -> StructuredData:
+# Sample format code of the binary header -> dtype in the file. IBM floats are decoded by hand
+SAMPLE_FORMATS = {1: '>u4', 2: '>i4', 3: '>i2', 5: '>f4', 8: 'i1'}
+
+# Trace header fields: byte position (0-based) and dtype
+TRACE_HEADER_FIELDS = {
+        'coordinate_scalar': (70, '>i2'),
+        'cdp_x'            : (180, '>i4'),
+        'cdp_y'            : (184, '>i4'),
+        'inline'           : (188, '>i4'),
+        'crossline'        : (192, '>i4'),
+}
+
+
+def read_in_segy(filepath: str, coords=None, geometry: bool = False, out: Union[None, str] = None,
+                 chunk_traces: int = None, n_workers: int = None, keep_dtype: bool = False) -> StructuredData:
     """Reader for seismic data stored in sgy/segy files
 
+    The file is memory-mapped and decoded in ranges of traces by a pool of
+    threads, straight into a preallocated array. The dimensions are 'x' (trace)
+    and 'y' (sample), or 'x' (inline), 'y' (crossline) and 'z' (sample) with
+    `geometry`. Their inline, crossline, CDP X/Y and sample values are read from
+    the headers and attached as non-index coordinates 'inline', 'crossline',
+    'cdp_x', 'cdp_y' and 'sample'.
+
     Args:
         filepath (str): the path of the sgy/segy file
-        coords (dict): If data is a numpy array coords provides the values for
-         the xarray dimension. These dimensions are 'x', 'y' and 'z'
+        coords (dict): Extra coordinates of the StructuredData, as in
+         `xarray.Dataset`. They replace the ones read from the headers with the
+         same name
+        geometry (bool): If True, arrange the traces in a (inline, crossline, sample)
+         cube. Otherwise, the data is (trace, sample)
+        out (str): If not None, path of a .npy file where the data is written
+         instead of memory. The returned StructuredData is backed by a memory map of it
+        chunk_traces (int): Number of traces decoded at once by each worker. It
+         bounds the memory used on top of the output
+        n_workers (int): Number of threads. Default of ThreadPoolExecutor if None
+        keep_dtype (bool): Keep the integer samples of formats 2, 3 and 8 as
+         integers instead of casting them to float32, e.g. to save memory
 
     Returns: a StructuredData object with data, the traces with samples written into an xr.Dataset, optionally with
      labels defined by coords
 
     """
+    data_offset, n_traces, samples, sample_format = _read_segy_layout(filepath)
+    if sample_format not in SAMPLE_FORMATS:
+        raise ValueError(f'SEG-Y sample format {sample_format} is not supported. '
+                         f'Supported formats: {list(SAMPLE_FORMATS)}')
+    n_samples = samples.size
 
-    segyio = optional_requirements.require_segyio()
-    segyfile = segyio.open(filepath, ignore_geometry=True)
+    traces = np.memmap(
+        filepath,
+        dtype=_trace_dtype(SAMPLE_FORMATS[sample_format], n_samples),
+        mode='r',
+        offset=data_offset,
+        shape=(n_traces,)
+    )
+    # All header fields in a single pass
+    headers = {name: traces[name].astype(np.dtype(dtype).newbyteorder('='))
+               for name, (_, dtype) in TRACE_HEADER_FIELDS.items()}
+
+    if geometry:
+        inlines, inline_index = np.unique(headers['inline'], return_inverse=True)
+        crosslines, crossline_index = np.unique(headers['crossline'], return_inverse=True)
+        position = inline_index * crosslines.size + crossline_index
+        if inlines.size * crosslines.size != n_traces or np.unique(position).size != n_traces:
+            raise ValueError('The traces do not form a regular inline/crossline grid. Use geometry=False.')
+        shape = (inlines.size, crosslines.size, n_samples)
+    else:
+        position = np.arange(n_traces)
+        shape = (n_traces, n_samples)
 
-    data = np.asarray([np.copy(tr) for tr in segyfile.trace[:]])
+    if keep_dtype and sample_format not in (1, 5):
+        dtype = np.dtype(SAMPLE_FORMATS[sample_format]).newbyteorder('=')
+    else:
+        dtype = np.float32
+    data = np.empty(shape, dtype=dtype) if out is None else np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=shape)
 
-    sd = StructuredData.from_numpy(data)  # data holds traces * (samples per trace) values
-    segyfile.close()
+    if chunk_traces is None:
+        chunk_traces = max(1, CHUNK_NBYTES // (n_samples * 4))
+    data_traces = data.reshape(-1, n_samples)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        ranges = [(start, min(start + chunk_traces, n_traces)) for start in range(0, n_traces, chunk_traces)]
+        for _ in executor.map(lambda r: _decode_traces(traces, data_traces, position, sample_format, *r), ranges):
+            pass
+
+    if out is not None:
+        data.flush()
+
+    sd = StructuredData.from_numpy(data, coords={**_segy_coords(headers, samples, geometry, shape), **(coords or {})})
     return sd
 
 
+def _read_segy_layout(filepath: str):
+    segyio = optional_requirements.require_segyio()
+    with segyio.open(filepath, ignore_geometry=True) as segyfile:
+        data_offset = TEXTUAL_HEADER_NBYTES + BINARY_HEADER_NBYTES + segyfile.ext_headers * TEXTUAL_HEADER_NBYTES
+        sample_format = int(segyfile.bin[segyio.BinField.Format])
+        return data_offset, segyfile.tracecount, np.asarray(segyfile.samples), sample_format
+
+
+def _trace_dtype(sample_dtype: str, n_samples: int) -> np.dtype:
+    names = list(TRACE_HEADER_FIELDS) + ['data']
+    return np.dtype({
+            'names'   : names,
+            'formats' : [dtype for _, dtype in TRACE_HEADER_FIELDS.values()] + [(sample_dtype, (n_samples,))],
+            'offsets' : [offset for offset, _ in TRACE_HEADER_FIELDS.values()] + [TRACE_HEADER_NBYTES],
+            'itemsize': TRACE_HEADER_NBYTES + n_samples * np.dtype(sample_dtype).itemsize
+    })
+
+
+def _decode_traces(traces: np.memmap, data_traces: np.ndarray, position: np.ndarray, sample_format: int,
+                   start: int, stop: int):
+    raw = traces['data'][start:stop]
+    decoded = _ibm_to_ieee(raw) if sample_format == 1 else raw
+
+    target = position[start:stop]
+    if np.array_equal(target, np.arange(target[0], target[0] + target.size)):
+        data_traces[target[0]:target[0] + target.size] = decoded
+    else:
+        data_traces[target] = decoded
+
+
+def _ibm_to_ieee(ibm: np.ndarray) -> np.ndarray:
+    """IBM System/360 single precision floats (as uint32) to float32."""
+    ibm = ibm.astype(np.uint32, copy=False)
+    # value = mantissa / 2**24 * 16**(exponent - 64), i.e. mantissa * 2**(4 * exponent - 280)
+    exponent = ((ibm >> 22) & 0x1fc).astype(np.int32)
+    exponent -= 280
+    out = (ibm & 0x00ffffff).astype(np.float32)  # 24 bits, exact in float32
+    with np.errstate(over='ignore', under='ignore'):
+        np.ldexp(out, exponent, out=out)
+    out.view(np.uint32)[...] |= ibm & np.uint32(0x80000000)
+    return out
+
+
+def _segy_coords(headers: dict, samples: np.ndarray, geometry: bool, shape: tuple) -> dict:
+    scalar = headers['coordinate_scalar'].astype(float)
+    factor = np.where(scalar < 0, 1 / np.abs(np.where(scalar == 0, 1, scalar)), np.where(scalar == 0, 1, scalar))
+    cdp_x = headers['cdp_x'] * factor
+    cdp_y = headers['cdp_y'] * factor
+
+    if not geometry:
+        return {
+                'inline'   : ('x', headers['inline']),
+                'crossline': ('x', headers['crossline']),
+                'cdp_x'    : ('x', cdp_x),
+                'cdp_y'    : ('x', cdp_y),
+                'sample'   : ('y', samples),
+        }
+
+    inlines, inline_index = np.unique(headers['inline'], return_inverse=True)
+    crosslines, crossline_index = np.unique(headers['crossline'], return_inverse=True)
+    grid_x = np.empty(shape[:2])
+    grid_y = np.empty(shape[:2])
+    grid_x[inline_index, crossline_index] = cdp_x
+    grid_y[inline_index, crossline_index] = cdp_y
+    return {
+            'inline'   : ('x', inlines),
+            'crossline': ('y', crosslines),
+            'cdp_x'    : (('x', 'y'), grid_x),
+            'cdp_y'    : (('x', 'y'), grid_y),
+            'sample'   : ('z', samples),
+    }
+
+
 def create_mesh_from_coords(coords: dict, zmin: Union[float, int], zmax: Union[float, int] = 0.0):
     """Creates a mesh for plotting StructuredData
 
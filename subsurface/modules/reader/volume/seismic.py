@@ -7,6 +7,7 @@ import xarray as xr
 import numpy as np
 
 from subsurface import optional_requirements
+from .segy_reader import read_in_segy
 
 
 class Seismic:
@@ -153,21 +154,19 @@ def from_segy(filepath:str, coords=None) -> Seismic:
         Seismic: Seismic data object based on xarray.DataArray.
     """
     segyio = optional_requirements.require_segyio()
-    with segyio.open(filepath) as sf:
-        sf.mmap()  # memory mapping
-        xlines = sf.xlines
-        ilines = sf.ilines
-        samples = sf.samples
+    with segyio.open(filepath, ignore_geometry=True) as sf:
         header = sf.bin
 
+    # Single memory-mapped pass over the file. Geometry comes from the trace headers
+    cube = read_in_segy(filepath, geometry=True).default_data_array
+
     if not coords:
         coords = [
-            ("ilines", ilines), 
-            ("xlines", xlines),
-            ("samples", samples)
+            ("ilines", cube['inline'].values),
+            ("xlines", cube['crossline'].values),
+            ("samples", cube['sample'].values)
         ]
 
-    cube = segyio.tools.cube(filepath)
-    seismic = Seismic(cube, coords=coords)
+    seismic = Seismic(cube.values, coords=coords)
     seismic.header = header
     return seismic
@@ -28,11 +28,15 @@ def interpolate_unstructured_data_to_structured_data(
     for e, i in enumerate(dims):
         coords[i] = np.linspace(boundaries_min[e], boundaries_max[e], resolution[e], endpoint=False)
 
-    grid = np.meshgrid(*coords.values())
-
-    interpolated_attributes = griddata(ud.vertex,
-                                       ud.attributes.loc[:, attr_name],
-                                       tuple(grid), method=interpolation_method.value)
+    grid = np.meshgrid(*coords.values(), indexing="ij")
+
+    values = ud.cell_attributes_view[attr_name]
+    if interpolation_method == InterpolationMethod.nearest:
+        # Reuse the cached KD-tree of the vertex instead of building one per call
+        _, nearest = ud.query_nearest(np.column_stack([axis.ravel() for axis in grid]))
+        interpolated_attributes = values[nearest].reshape(grid[0].shape)
+    else:
+        interpolated_attributes = griddata(ud.vertex, values, tuple(grid), method=interpolation_method.value)
 
     sd = StructuredData.from_numpy(
         array=interpolated_attributes,
@@ -0,0 +1,80 @@
+"""Vectorized low-polygon tubes around line segments.
+
+Every segment becomes an open prism of `n_sides` quads (two triangles each),
+built for all the segments at once. The rings at the ends of a segment are
+perpendicular to the mean direction of the segments that meet at that vertex,
+so consecutive segments of the same radius join without gaps.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class TubeGeometry(NamedTuple):
+    vertex: np.ndarray  #: NDArray[(n_segments * 2 * n_sides, 3), float]
+    triangles: np.ndarray  #: NDArray[(n_segments * 2 * n_sides, 3), int]
+    normals: np.ndarray  #: Unit radial direction of every vertex
+    source_vertex: np.ndarray  #: Vertex of the line of every tube vertex
+    source_cell: np.ndarray  #: Segment of every triangle
+
+
+def tube_geometry(vertex: np.ndarray, cells: np.ndarray, radius: np.ndarray, n_sides: int = 6) -> TubeGeometry:
+    """Tubes around the segments of a line set.
+
+    Args:
+        vertex: NDArray[(Any, 3), float]
+        cells: NDArray[(n_segments, 2), int]
+        radius: Radius of every segment, or one for all
+        n_sides: Sides of the tubes, at least 3
+
+    Returns:
+        TubeGeometry
+    """
+    if n_sides < 3:
+        raise ValueError(f"n_sides must be at least 3, not {n_sides}.")
+    vertex = np.asarray(vertex, dtype=float)
+    cells = np.asarray(cells)
+    n_segments = cells.shape[0]
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), (n_segments,))
+
+    direction = _normalize(vertex[cells[:, 1]] - vertex[cells[:, 0]])
+    ends = cells.T.ravel()
+    vertex_tangent = _normalize(np.column_stack([
+        np.bincount(ends, weights=np.tile(direction[:, axis], 2), minlength=vertex.shape[0]) for axis in range(3)
+    ]))
+
+    # Tangent of both ends of every segment: the one of the vertex, unless the
+    # segments meet at a sharp angle or against each other
+    tangent = vertex_tangent[cells]  # (n_segments, 2, 3)
+    aligned = np.einsum("sei,si->se", tangent, direction) > 0.5
+    tangent = np.where(aligned[..., None], tangent, direction[:, None, :])
+
+    # Frame of every end from a fixed reference axis, so the rings of consecutive ends do not twist
+    reference = np.where((np.abs(tangent[..., 2]) < 0.9)[..., None], [0., 0., 1.], [1., 0., 0.])
+    u = _normalize(np.cross(tangent, reference))
+    w = np.cross(tangent, u)
+
+    angle = 2 * np.pi * np.arange(n_sides) / n_sides
+    normals = np.cos(angle)[:, None] * u[..., None, :] + np.sin(angle)[:, None] * w[..., None, :]
+    tube_vertex = vertex[cells][..., None, :] + radius[:, None, None, None] * normals
+
+    # Quad k of a segment joins sides k and k + 1 of both rings
+    side = np.arange(n_sides)
+    first = (np.arange(n_segments) * 2 * n_sides)[:, None]
+    a, b = first + side, first + (side + 1) % n_sides
+    c, d = b + n_sides, a + n_sides
+    triangles = np.stack([np.stack([a, b, c], axis=-1), np.stack([a, c, d], axis=-1)], axis=2).reshape(-1, 3)
+
+    return TubeGeometry(
+        vertex=tube_vertex.reshape(-1, 3),
+        triangles=triangles,
+        normals=normals.reshape(-1, 3),
+        source_vertex=np.repeat(cells.ravel(), n_sides),
+        source_cell=np.repeat(np.arange(n_segments), 2 * n_sides)
+    )
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=float)
+    norm = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norm, out=np.zeros_like(vectors), where=norm > 0)
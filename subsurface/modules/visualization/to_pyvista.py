@@ -2,11 +2,12 @@ import enum
 
 import warnings
 
-from typing import Union, Tuple, Optional
+from typing import Dict, Union, Tuple, Optional
 
 from ... import optional_requirements
 from ...core.structs.unstructured_elements import PointSet, TriSurf, LineSet, TetraMesh
 from ...core.structs.structured_elements.structured_grid import StructuredGrid
+from ...core.utils.utils_core import is_dask_array
 import numpy as np
 
 try:
@@ -84,30 +85,28 @@ def to_pyvista_points(point_set: PointSet):
     """
     pv = optional_requirements.require_pyvista()
     poly: pv.PolyData = pv.PolyData(point_set.data.vertex)
-    poly.point_data.update(point_set.data.attributes_to_dict)
+    _add_arrays(poly.point_data, point_set.data.cell_attributes_view)
 
     return poly
 
 
-def to_pyvista_mesh(triangular_surface: TriSurf) -> "pv.PolyData":
+def to_pyvista_mesh(triangular_surface: TriSurf, max_triangles: Optional[int] = None) -> "pv.PolyData":
     """Create planar surface PolyData from unstructured element such as TriSurf
 
+    Args:
+        triangular_surface: TriSurf
+        max_triangles: Triangle budget. Larger surfaces are replaced by the most
+         detailed level of their level of detail pyramid within the budget
+
     Returns:
-        mesh texture
+        mesh texture. Its arrays share the memory of the attributes of the
+        surface, except strided columns of attributes stored row-major
     """
-    nve = triangular_surface.mesh.n_vertex_per_element
-    vertices = triangular_surface.mesh.vertex
-
-    # ? We need better name for these variables
-    num_vertex_elements = np.full(triangular_surface.mesh.n_elements, nve)
-    x = triangular_surface.mesh.cells
-
-    cells = np.c_[num_vertex_elements, x]
-
     pv = optional_requirements.require_pyvista()
-    mesh = pv.PolyData(vertices, cells)
-    mesh.cell_data.update(triangular_surface.mesh.attributes_to_dict)
-    mesh.point_data.update(triangular_surface.mesh.points_attributes)
+    unstruct = triangular_surface.mesh_for_budget(max_triangles)
+    mesh = pv.PolyData(unstruct.vertex, faces=_cell_array(unstruct.cells))
+    _add_arrays(mesh.cell_data, unstruct.cell_attributes_view)
+    _add_arrays(mesh.point_data, unstruct.points_attributes_view)
 
     if triangular_surface.has_texture_data:
         mesh.texture_map_to_plane(
@@ -162,25 +161,18 @@ def to_pyvista_line(
         scalar_type: PyvistaScalarType = PyvistaScalarType.POINT,
         active_scalar: Optional[str] = None
 ):
-    
-    nve = line_set.data.n_vertex_per_element
-    vertices = line_set.data.vertex
-    cells = np.c_[np.full(line_set.data.n_elements, nve),
-    line_set.data.cells]
     if spline is False:
-        mesh = pv.PolyData()
-        mesh.points = vertices
-        mesh.lines = cells
+        mesh = pv.PolyData(line_set.data.vertex, lines=_cell_array(line_set.data.cells))
     else:
         raise NotImplementedError
     
     match scalar_type:
         case PyvistaScalarType.POINT:
-            mesh.point_data.update(line_set.data.points_attributes_to_dict)
+            _add_arrays(mesh.point_data, line_set.data.points_attributes_view)
             if active_scalar is not None:
                 mesh.set_active_scalars(active_scalar, preference='point')
         case PyvistaScalarType.CELL:
-            mesh.cell_data.update(line_set.data.attributes_to_dict)
+            _add_arrays(mesh.cell_data, line_set.data.cell_attributes_view)
             if active_scalar is not None:
                 mesh.set_active_scalars(active_scalar, preference='cell')
     if as_tube is True:
@@ -189,18 +181,116 @@ def to_pyvista_line(
         return mesh
 
 
+def to_pyvista_tubes(
+        line_set: LineSet,
+        radius: Optional[float] = None,
+        radius_attr: Optional[str] = None,
+        n_sides: int = 6,
+        scalar_type: PyvistaScalarType = PyvistaScalarType.POINT,
+        active_scalar: Optional[str] = None
+) -> "pv.PolyData":
+    """Low-polygon tubes around every segment of a LineSet, built at once
+    for all the lines (e.g. thousands of boreholes) instead of by the VTK tube
+    filter.
+
+    Args:
+        line_set (LineSet): Segments of the tubes
+        radius (float): Radius of all the tubes. `line_set.radius` if None
+        radius_attr (str): Cell attribute with the radius of every segment.
+         It takes precedence over `radius`
+        n_sides (int): Sides of the tubes, at least 3
+        scalar_type (PyvistaScalarType): Copy the vertex or the cell attributes
+        active_scalar (str): Name of the active attribute
+
+    Returns:
+        pv.PolyData with the triangles of the tubes and their point normals
+    """
+    from ._tubes import tube_geometry
+
+    pv = optional_requirements.require_pyvista()
+    tubes = tube_geometry(line_set.data.vertex, line_set.data.cells, _segment_radius(line_set, radius, radius_attr),
+                          n_sides)
+    mesh = pv.PolyData(tubes.vertex, faces=_cell_array(tubes.triangles))
+    if mesh.n_points > 0:
+        mesh.point_data.set_array(tubes.normals, "Normals")
+        mesh.point_data.active_normals_name = "Normals"
+
+    match scalar_type:
+        case PyvistaScalarType.POINT:
+            _add_arrays(mesh.point_data, {name: values[tubes.source_vertex]
+                                          for name, values in line_set.data.points_attributes_view.items()})
+        case PyvistaScalarType.CELL:
+            _add_arrays(mesh.cell_data, {name: values[tubes.source_cell]
+                                         for name, values in line_set.data.cell_attributes_view.items()})
+    if active_scalar is not None:
+        mesh.set_active_scalars(active_scalar, preference=scalar_type.value)
+    return mesh
+
+
+def to_pyvista_line_impostors(
+        line_set: LineSet,
+        radius: Optional[float] = None,
+        radius_attr: Optional[str] = None,
+        scalar_type: PyvistaScalarType = PyvistaScalarType.POINT,
+        active_scalar: Optional[str] = None
+) -> "pv.PolyData":
+    """Line geometry with the radius of every segment in the 'radius' cell
+    array, to be drawn as tubes by the renderer (e.g. ``render_lines_as_tubes``
+    in `pv_plot` add_mesh_kwargs, or an instanced/impostor shader). No
+    triangles are generated.
+
+    Args:
+        line_set (LineSet): Segments of the lines
+        radius (float): Radius of all the segments. `line_set.radius` if None
+        radius_attr (str): Cell attribute with the radius of every segment.
+         It takes precedence over `radius`
+        scalar_type (PyvistaScalarType): Copy the vertex or the cell attributes
+        active_scalar (str): Name of the active attribute
+
+    Returns:
+        pv.PolyData with lines
+    """
+    mesh = to_pyvista_line(line_set, as_tube=False, scalar_type=scalar_type)
+    radius = np.broadcast_to(_segment_radius(line_set, radius, radius_attr), (line_set.data.n_elements,))
+    mesh.cell_data["radius"] = np.ascontiguousarray(radius)
+    if active_scalar is not None:
+        mesh.set_active_scalars(active_scalar, preference=scalar_type.value)
+    return mesh
+
+
+def _segment_radius(line_set: LineSet, radius: Optional[float], radius_attr: Optional[str]) -> np.ndarray:
+    if radius_attr is not None:
+        return line_set.data.cell_attributes_view[radius_attr]
+    return np.asarray(line_set.radius if radius is None else radius, dtype=float)
+
+
 def to_pyvista_tetra(tetra_mesh: TetraMesh):
     """Create pyvista.UnstructuredGrid"""
-    vertices = tetra_mesh.data.vertex
-    tets = tetra_mesh.data.cells
-    cells = np.c_[np.full(len(tets), 4), tets]
-    import vtk
-    ctypes = np.array([vtk.VTK_TETRA, ], np.int32)
-    mesh = pv.UnstructuredGrid(cells, ctypes, vertices)
-    mesh.cell_data.update(tetra_mesh.data.attributes_to_dict)
+    mesh = pv.UnstructuredGrid()
+    mesh.points = tetra_mesh.data.vertex
+    mesh.SetCells(pv.CellType.TETRA, _cell_array(tetra_mesh.data.cells))
+    _add_arrays(mesh.cell_data, tetra_mesh.data.cell_attributes_view)
     return mesh
 
 
+def _cell_array(cells: np.ndarray) -> "pv.CellArray":
+    """VTK cells of the same size, built from the connectivity and offsets
+    arrays. The connectivity shares the memory of `cells` when it is C
+    contiguous and of the VTK id type, so large meshes are not copied."""
+    if hasattr(pv.CellArray, "from_regular_cells"):
+        return pv.CellArray.from_regular_cells(cells)
+    offsets = np.arange(0, cells.size + 1, max(cells.shape[1], 1))
+    return pv.CellArray.from_arrays(offsets, np.ascontiguousarray(cells).ravel())
+
+
+def _add_arrays(data, arrays: Dict[str, np.ndarray]):
+    """Hand arrays to VTK without copying them, unlike `update`. VTK arrays
+    share the memory of the attributes of the subsurface object. Only strided
+    columns, of attributes stored row-major, are copied to make them contiguous."""
+    for name, values in arrays.items():
+        data[name] = values
+
+
 def to_pyvista_grid(structured_grid: StructuredGrid,
                     data_set_name: str = None,
                     attribute_slice: dict = None,
@@ -262,12 +352,22 @@ def update_grid_attribute(
     import xarray as xr
     dataset: xr.DataArray = structured_grid.ds.data[data_set_name]
 
-    attributeData = {data_set_name: dataset.sel(**attribute_slice).values.ravel(data_order)}
+    attributeData = {data_set_name: _ravel(dataset.sel(**attribute_slice).data, data_order)}
     mesh.point_data.update(attributeData)
 
     return mesh
 
 
+def _ravel(array, order: str) -> np.ndarray:
+    """Flatten `array` in `order`. Lazy (dask) arrays are computed chunk by chunk
+    straight into the output, without intermediate copies."""
+    if not is_dask_array(array):
+        return np.asarray(array).ravel(order)
+    flat = np.empty(array.shape, dtype=array.dtype, order=order)
+    array.store(flat, lock=False)
+    return flat.ravel(order)
+
+
 def _n_cartesian_coord(attribute, structured_grid):
     coord_names = np.array(['X', 'Y', 'Z', 'x', 'y', 'z'])
     ndim = np.isin(coord_names, structured_grid.ds.data[attribute].dims).sum()
@@ -1 +1,3 @@
-from .to_binary import base_structs_to_binary_file
\ No newline at end of file
+from .to_binary import base_structs_to_binary_file
+from .to_container import base_struct_to_container
+from .block_codecs import BlockCompression
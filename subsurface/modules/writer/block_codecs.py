@@ -0,0 +1,104 @@
+"""Optional compression of the blocks of a binary container.
+
+A block is encoded by applying its filters in order and then compressing the
+result with its codec:
+
+- ``delta``: replace each item by its difference with the previous one (in C
+  order). Integer blocks only. Cell indices of meshes are usually close to each
+  other, so their differences are small numbers.
+- ``shuffle``: group the n-th byte of every item together. Exponents and high
+  bytes of floats change slowly, so this creates long runs for the codec.
+
+Codecs are only from the standard library so compressed files can be read
+without extra dependencies.
+"""
+import lzma
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+CODECS = ("zlib", "lzma")
+FILTERS = ("delta", "shuffle")
+
+
+@dataclass(frozen=True)
+class BlockCompression:
+    """How to compress one block.
+
+    Args:
+        codec: ``zlib`` or ``lzma``
+        level: Compression level of the codec. Default of the codec if None
+        shuffle: Byte-shuffle the block. If None, only multi-byte float blocks are shuffled
+        delta: Delta encode the block. If None, only the cells are delta encoded
+    """
+    codec: str = "zlib"
+    level: Optional[int] = None
+    shuffle: Optional[bool] = None
+    delta: Optional[bool] = None
+
+    def __post_init__(self):
+        if self.codec not in CODECS:
+            raise ValueError(f"codec must be one of {CODECS}, not {self.codec}.")
+
+    def filters(self, name: str, dtype: np.dtype) -> List[str]:
+        delta = self.delta if self.delta is not None else name == "cells"
+        shuffle = self.shuffle if self.shuffle is not None else dtype.kind == "f" and dtype.itemsize > 1
+        if delta and dtype.kind not in "iu":
+            raise ValueError(f"Delta encoding is only supported for integer blocks. Block {name} is {dtype}.")
+        return [f for f, enabled in zip(FILTERS, (delta, shuffle)) if enabled]
+
+
+CompressionArg = Union[None, str, BlockCompression, Dict[str, Union[None, str, BlockCompression]]]
+
+
+def block_compression(compression: CompressionArg, name: str) -> Optional[BlockCompression]:
+    """Compression of the block `name` given the `compression` argument of the
+    writer: None, a codec name, a `BlockCompression` or a dict of those by block
+    name (blocks not in the dict are not compressed)."""
+    if isinstance(compression, dict):
+        compression = compression.get(name)
+    if compression is None:
+        return None
+    if isinstance(compression, str):
+        return BlockCompression(codec=compression)
+    return compression
+
+
+def encode_block(array: np.ndarray, codec: str, filters: List[str], level: Optional[int] = None) -> bytes:
+    """Encode a C-contiguous little-endian array."""
+    array = np.ascontiguousarray(array)
+    if "delta" in filters:
+        flat = array.reshape(-1)
+        array = np.empty_like(flat)
+        array[:1] = flat[:1]
+        np.subtract(flat[1:], flat[:-1], out=array[1:])
+    data = array.view(np.uint8).reshape(-1, array.dtype.itemsize)
+    if "shuffle" in filters:
+        data = data.T
+    data = np.ascontiguousarray(data)
+
+    if codec == "zlib":
+        return zlib.compress(data, level if level is not None else -1)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    raise ValueError(f"codec must be one of {CODECS}, not {codec}.")
+
+
+def decode_block(data: bytes, dtype: np.dtype, shape, codec: str, filters: List[str]) -> np.ndarray:
+    """Inverse of `encode_block`."""
+    if codec == "zlib":
+        raw = zlib.decompress(data)
+    elif codec == "lzma":
+        raw = lzma.decompress(data)
+    else:
+        raise ValueError(f"codec must be one of {CODECS}, not {codec}.")
+
+    raw = np.frombuffer(raw, dtype=np.uint8)
+    if "shuffle" in filters:
+        raw = np.ascontiguousarray(raw.reshape(dtype.itemsize, -1).T)
+    array = raw.view(dtype).copy()
+    if "delta" in filters:
+        np.cumsum(array, out=array)
+    return array.reshape(shape)
@@ -1,13 +1,119 @@
+import contextlib
 import json
+import os
+from typing import BinaryIO, Dict, Tuple
 
+import numpy as np
 
-def base_structs_to_binary_file(path, base_struct, order='F'):
+from subsurface.core.structs.base_structures import StructuredData
+from subsurface.core.utils.utils_core import is_dask_array
+
+CHUNK_SIZE = 2 ** 20  # Number of items cast and written at once
+
+
+def base_structs_to_binary_file(path, base_struct, order='F', chunk_size: int = CHUNK_SIZE):
+    """Write `base_struct` to ``path.le`` and its header to ``path.json``.
+
+    The arrays are streamed to disk chunk by chunk so the peak memory is one
+    chunk instead of a copy of the whole dataset. Lazy (dask) arrays are computed
+    one chunk at a time straight into the file. The header is written once the
+    data is on disk and includes the byte offset of every block (e.g.
+    ``vertex_offset``) so readers can seek.
+
+    Args:
+        path: Path of the files without extension
+        base_struct: `UnstructuredData` or `StructuredData`. For `StructuredData`
+         the default data array is written
+        order: Memory layout of the written arrays
+        chunk_size: Number of items cast and written at once
+    """
+    if isinstance(base_struct, StructuredData):
+        data_array = base_struct.default_data_array
+        blocks = base_struct._binary_blocks(data_array)
+        header = base_struct._set_binary_header(data_array)
+    else:
+        blocks = base_struct._binary_blocks()
+        header = base_struct._set_binary_header()
+
+    with open(path + ".le", "w+b") as new_file:
+        offsets = write_binary_blocks(new_file, blocks, order=order, chunk_size=chunk_size)
+
+    header.update({f"{name}_offset": offset for name, offset in offsets.items()})
+    _dump_json_atomically(header, path + '.json')
+
+
+def write_binary_blocks(file: BinaryIO, blocks: Dict[str, Tuple[np.ndarray, str]],
+                        order='F', chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """Write arrays one after the other, casting them chunk by chunk.
+
+    Args:
+        file: File object opened in binary mode. Lazy (dask) arrays are stored
+         through a memory map of the file, so it must be a real file opened for
+         reading and writing (e.g. ``w+b``)
+        blocks: Array and dtype to write, by block name
+        order: Memory layout of the written arrays
+        chunk_size: Number of items cast and written at once
+
+    Returns:
+        Byte offset of every block relative to the initial position of `file`
+    """
+    offsets = {}
+    offset = 0
+    for name, (array, dtype) in blocks.items():
+        offsets[name] = offset
+        if is_dask_array(array):
+            offset += _store_lazy_block(file, array, dtype, order)
+            continue
+        for chunk in _cast_chunks(np.asarray(array), dtype, order, chunk_size):
+            file.write(chunk)
+            offset += chunk.nbytes
+    return offsets
+
+
+def _store_lazy_block(file: BinaryIO, array, dtype, order) -> int:
+    """Compute a dask array chunk by chunk into a memory map of `file` at its
+    current position. Returns the number of bytes written."""
+    dtype = np.dtype(dtype)
+    offset = file.tell()
+    nbytes = int(np.prod(array.shape)) * dtype.itemsize
+
+    file.flush()
+    file.truncate(offset + nbytes)
+    if nbytes > 0:
+        target = np.memmap(file, dtype=dtype, mode="r+", offset=offset, shape=array.shape, order=order)
+        # Chunks are written to disjoint regions, so no lock is needed
+        array.astype(dtype).store(target, lock=False)
+        target.flush()
+        del target
+    file.seek(offset + nbytes)
+    return nbytes
+
+
+def _cast_chunks(array: np.ndarray, dtype, order, chunk_size):
+    """Contiguous chunks of `array` cast to `dtype` in `order` traversal."""
+    iterator = np.nditer(
+        array,
+        flags=['external_loop', 'buffered', 'zerosize_ok'],
+        op_flags=[['readonly', 'contig', 'aligned']],
+        op_dtypes=[np.dtype(dtype)],
+        order=order,
+        casting='unsafe',
+        buffersize=chunk_size
+    )
+    for chunk in iterator:
+        yield chunk
+
+
+def _dump_json_atomically(obj, path):
+    """Write to a temporary file next to `path` and move it into place, so
+    `path` is either the previous file or the complete new one."""
+    tmp_path = path + '.tmp'
     try:
-        bytearray_le, header = base_struct.default_data_array_to_binary(order=order)
-    except AttributeError:
-        bytearray_le, header = base_struct.to_binary(order=order)
-    with open(path+'.json', 'w') as outfile:
-        json.dump(header, outfile)
-
-    new_file = open(path+".le", "wb")
-    new_file.write(bytearray_le)
\ No newline at end of file
+        with open(tmp_path, 'w') as outfile:
+            json.dump(obj, outfile)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # The temporary file may not exist yet, and that must not hide the error
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,170 @@
+"""Single-file binary container for `UnstructuredData` and `StructuredData`.
+
+Layout (all integers little-endian)::
+
+    +-----------------------------+ 0
+    | fixed header (32 bytes)     |  magic, version, alignment, TOC offset and size
+    +-----------------------------+
+    | block 0                     |  every block starts at a multiple of `alignment`
+    | ...                         |
+    | block n                     |
+    +-----------------------------+ toc_offset
+    | table of contents (JSON)    |
+    +-----------------------------+
+
+Every entry of the table of contents describes one block: ``name``, ``dtype``,
+``shape``, ``offset``, ``nbytes``, ``byte_order`` and ``crc32`` (of the stored
+bytes). Blocks are C-contiguous arrays, so each one can be memory-mapped or read
+on its own. The table of contents also stores what is needed to rebuild the
+struct (``kind``, ``meta`` and the xarray ``attrs``).
+
+Version 2 adds optional compression per block (see `block_codecs`). Compressed
+blocks also have ``codec`` and ``filters`` entries and cannot be memory-mapped.
+Files without compressed blocks are still written as version 1.
+"""
+import json
+import struct
+import zlib
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from subsurface.core.structs.base_structures import StructuredData, UnstructuredData
+from .block_codecs import BlockCompression, CompressionArg, block_compression, encode_block
+from subsurface.core.utils.utils_core import is_dask_array
+from .to_binary import CHUNK_SIZE, _cast_chunks, _store_lazy_block
+
+MAGIC = b"SUBSURF\x00"
+VERSION = 2
+ALIGNMENT = 64
+
+# magic, version, reserved, alignment, toc offset, toc size
+HEADER = struct.Struct("<8sHHIQQ")
+
+
+def base_struct_to_container(path, base_struct: Union[UnstructuredData, StructuredData],
+                             alignment: int = ALIGNMENT, chunk_size: int = CHUNK_SIZE,
+                             compression: CompressionArg = None):
+    """Write `base_struct` to a single container file.
+
+    Args:
+        path: Path of the file
+        base_struct: `UnstructuredData` or `StructuredData`
+        alignment: Blocks start at a multiple of this number of bytes
+        chunk_size: Number of items written at once
+        compression: None (default) to write raw blocks, a codec name (``zlib``
+         or ``lzma``) or a `BlockCompression` for every block, or a dict of those
+         by block name. Compressed blocks are encoded in memory.
+
+    Lazy (dask) variables of a `StructuredData` are computed chunk by chunk
+    straight into the file unless they are compressed.
+    """
+    kind, meta, blocks = _describe(base_struct)
+
+    with open(path, "w+b") as file:
+        file.write(bytes(HEADER.size))
+        entries = [
+                _write_block(file, name, array, alignment, chunk_size, block_compression(compression, name))
+                for name, array in blocks.items()
+        ]
+        version = VERSION if any("codec" in entry for entry in entries) else 1
+
+        toc = json.dumps({
+                "kind"  : kind,
+                "meta"  : meta,
+                "attrs" : base_struct.data.attrs,
+                "blocks": entries
+        }).encode("utf-8")
+        toc_offset = file.tell()
+        file.write(toc)
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, version, 0, alignment, toc_offset, len(toc)))
+
+
+def _describe(base_struct) -> Tuple[str, Dict, Dict[str, np.ndarray]]:
+    if isinstance(base_struct, UnstructuredData):
+        cell_attributes = base_struct._attributes_view(base_struct.cells_attr_name)
+        points_attributes = base_struct._attributes_view(base_struct.vertex_attr_name)
+        meta = {
+                "cells_attr_name"  : base_struct.cells_attr_name,
+                "vertex_attr_name" : base_struct.vertex_attr_name,
+                "cell_attr_names"  : cell_attributes.names,
+                "vertex_attr_names": points_attributes.names,
+        }
+        blocks = {
+                "vertex": base_struct.vertex,
+                "cells" : base_struct.cells,
+                # One block per attribute so they can be read independently
+                **{f"cell_attrs/{i}": column for i, column in enumerate(cell_attributes.columns.values())},
+                **{f"vertex_attrs/{i}": column for i, column in enumerate(points_attributes.columns.values())},
+        }
+        return "UnstructuredData", meta, blocks
+
+    if isinstance(base_struct, StructuredData):
+        meta = {
+                "data_array_name": base_struct.data_array_name,
+                "data_vars"      : {str(name): list(var.dims) for name, var in base_struct.data.data_vars.items()},
+                "coords"         : {str(name): list(var.dims) for name, var in base_struct.data.coords.items()},
+        }
+        blocks = {
+                # .data keeps lazy (dask) variables lazy
+                **{f"data_vars/{name}": var.data for name, var in base_struct.data.data_vars.items()},
+                **{f"coords/{name}": var.values for name, var in base_struct.data.coords.items()},
+        }
+        return "StructuredData", meta, blocks
+
+    raise ValueError(f"base_struct must be UnstructuredData or StructuredData, not {type(base_struct).__name__}.")
+
+
+def _write_block(file: BinaryIO, name: str, array: np.ndarray, alignment: int, chunk_size: int,
+                 compression: Optional[BlockCompression] = None) -> Dict:
+    lazy = is_dask_array(array) and compression is None
+    if not lazy:
+        array = np.asarray(array)
+    if array.dtype.hasobject:
+        raise ValueError(f"Block {name} has dtype object, which cannot be stored in a binary container.")
+    dtype = array.dtype.newbyteorder("<")
+
+    padding = -file.tell() % alignment
+    file.write(bytes(padding))
+    offset = file.tell()
+
+    entry = {
+            "name"      : name,
+            "dtype"     : dtype.newbyteorder("=").str.lstrip("<>=|"),
+            "shape"     : list(array.shape),
+            "offset"    : offset,
+            "byte_order": "little",
+    }
+
+    if lazy:
+        nbytes = _store_lazy_block(file, array, dtype, "C")
+        crc = _file_crc(file, offset, nbytes, chunk_size * dtype.itemsize)
+    elif compression is None:
+        crc = 0
+        for chunk in _cast_chunks(array, dtype, "C", chunk_size):
+            file.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+    else:
+        filters = compression.filters(name, dtype)
+        encoded = encode_block(array.astype(dtype, copy=False), compression.codec, filters, compression.level)
+        file.write(encoded)
+        crc = zlib.crc32(encoded)
+        entry.update({"codec": compression.codec, "filters": filters})
+
+    entry.update({"nbytes": file.tell() - offset, "crc32": crc})
+    return entry
+
+
+def _file_crc(file: BinaryIO, offset: int, nbytes: int, chunk_nbytes: int) -> int:
+    """CRC of a region of `file` read back in chunks. The position is restored."""
+    position = file.tell()
+    file.seek(offset)
+    crc = 0
+    while nbytes > 0:
+        chunk = file.read(min(chunk_nbytes, nbytes))
+        crc = zlib.crc32(chunk, crc)
+        nbytes -= len(chunk)
+    file.seek(position)
+    return crc
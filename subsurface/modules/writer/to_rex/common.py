@@ -24,9 +24,6 @@ typeMesh = 3
 # typeSceneNode = 8
 
 
-n_bytes = 0
-
-
 def write_data_block_header(size_data, data_id=1, data_type=3, version_data=1):
     """Function to write a DATA BLOCK header.
 
@@ -67,12 +64,9 @@ def encode(input_: list):
     Returns:
         byte: Array of bytes
     """
-    global n_bytes
     block = bytearray()
 
     for tup in input_:
-        arr = np.array(tup[0], dtype=tup[1]).tobytes()
-        n_bytes += len(arr)
-        block += arr
+        block += np.array(tup[0], dtype=tup[1]).tobytes()
 
     return block
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List
 import numpy as np
 
@@ -13,10 +13,41 @@ class RexMesh:
     name: str
     vertex: np.ndarray
     edges: np.ndarray
-    normals: Optional[np.ndarray] = np.array([])
-    texture: Optional[np.ndarray] = np.array([])
-    color: Optional[np.ndarray] = np.array([])
-    material_id: Optional[int] = np.array([])
+    normals: Optional[np.ndarray] = field(default_factory=lambda: np.array([]))
+    texture: Optional[np.ndarray] = field(default_factory=lambda: np.array([]))
+    color: Optional[np.ndarray] = field(default_factory=lambda: np.array([]))
+    material_id: Optional[int] = field(default_factory=lambda: np.array([]))
+    lod: int = 1
+    max_lod: int = 1
+
+    @classmethod
+    def from_tri_surf(cls, tri_surf, name: str, max_triangles: Optional[int] = None,
+                      material_id: int = 9223372036854775807) -> "RexMesh":
+        """Mesh of a TriSurf within a triangle budget.
+
+        Surfaces with more than `max_triangles` are replaced by the most detailed
+        level of their level of detail pyramid within the budget, and `lod` and
+        `max_lod` are the level and the coarsest level of the pyramid, counted
+        from 1 for the full surface like the defaults of a single mesh.
+
+        Args:
+            tri_surf (TriSurf): Surface to convert
+            name (str): Name of the mesh
+            max_triangles (int): Triangle budget. None for the full surface
+            material_id (int): Material block of the mesh. The default means no
+             material
+
+        Returns:
+            RexMesh
+        """
+        if max_triangles is None or tri_surf.n_triangles <= max_triangles:
+            mesh, lod, max_lod = tri_surf.mesh, 1, 1
+        else:
+            pyramid = tri_surf.lod_pyramid()
+            level = pyramid.select(max_triangles)
+            mesh, lod, max_lod = pyramid[level], level + 1, len(pyramid)
+        return cls(name=name, vertex=mesh.vertex, edges=mesh.cells, material_id=material_id,
+                   lod=lod, max_lod=max_lod)
 
     @property
     def ver_ravel(self):
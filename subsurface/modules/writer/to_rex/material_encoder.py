@@ -1,5 +1,5 @@
-from subsurface.writer.to_rex.common import write_data_block_header, encode
-from subsurface.writer.to_rex.data_struct import RexMaterial
+from .common import write_data_block_header, encode
+from .data_struct import RexMaterial
 
 
 __all__ = ['material_encode', 'write_material_data']
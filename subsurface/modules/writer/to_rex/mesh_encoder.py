@@ -1,6 +1,6 @@
-from subsurface.writer.to_rex.common import mesh_header_size, \
+from .common import mesh_header_size, \
     write_data_block_header, encode
-from subsurface.writer.to_rex.data_struct import RexMesh
+from .data_struct import RexMesh
 
 
 __all__ = ['mesh_encode', 'write_mesh_coordinates', 'write_mesh_header']
@@ -18,8 +18,8 @@ def mesh_encode(rex_mesh: RexMesh, data_id: int):
 
     # Write Mesh block - header
     mesh_header_bytes = write_mesh_header(
-        n_vtx_coord / 3, n_triangles / 3,
-        n_vtx_colors=n_vtx_colors / 3,
+        n_vtx_coord // 3, n_triangles // 3,
+        n_vtx_colors=n_vtx_colors // 3,
         start_vtx_coord=mesh_header_size,
         start_nor_coord=mesh_header_size + n_vtx_coord * 4,
         start_tex_coord=mesh_header_size + n_vtx_coord * 4,
@@ -27,7 +27,9 @@ def mesh_encode(rex_mesh: RexMesh, data_id: int):
         start_triangles=mesh_header_size +
                         ((n_vtx_coord + n_vtx_colors) * 4),
         name=surface_name,
-        material_id=material_id  # self.data_id + surface_df.shape[0]
+        material_id=material_id,  # self.data_id + surface_df.shape[0]
+        lod=rex_mesh.lod,
+        max_lod=rex_mesh.max_lod
     )
 
     # Write Mesh block - Vertex, triangles
@@ -0,0 +1,186 @@
+"""Vectorized REX writer.
+
+The size of every block is known from the shapes of the meshes, so the whole
+file is laid out first and then written in place into one preallocated buffer,
+either in memory (`rex_bytes`) or a memory mapped file (`write_rex`). Headers
+are single records of structured dtypes and the coordinates are cast straight
+into their slice of the buffer, without intermediate bytes objects.
+
+The output is byte for byte the one of the encoders in `mesh_encoder` and
+`material_encoder`: vertex colors follow the vertex coordinates, and normals
+and texture coordinates are not written.
+"""
+import mmap
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .common import file_header_size, mesh_header_size, rexDataBlockHeaderSize
+from .data_struct import RexMaterial, RexMesh
+
+NO_MATERIAL = 0x7fffffffffffffff
+
+_FILE_HEADER = np.dtype([
+    ("magic", "S4"), ("version", "<u2"), ("crc32", "<u4"), ("n_data_blocks", "<u2"), ("start_data", "<u2"),
+    ("size_data_blocks", "<u8"), ("reserved", "S42"),
+    # Coordinate system block
+    ("srid", "<u4"), ("name_size", "<u2"), ("name", "S4"), ("offsets", "<f4", (3,))
+])
+_DATA_BLOCK_HEADER = np.dtype([("data_type", "<u2"), ("version", "<u2"), ("size", "<u4"), ("data_id", "<u8")])
+_MESH_HEADER = np.dtype([
+    ("lod", "<u2"), ("max_lod", "<u2"),
+    ("n_vtx_coord", "<u4"), ("n_nor_coord", "<u4"), ("n_tex_coord", "<u4"), ("n_vtx_colors", "<u4"),
+    ("n_triangles", "<u4"), ("start_vtx_coord", "<u4"), ("start_nor_coord", "<u4"), ("start_tex_coord", "<u4"),
+    ("start_vtx_colors", "<u4"), ("start_triangles", "<u4"),
+    ("material_id", "<u8"), ("name_size", "<u2"), ("name", "S74")
+])
+_MATERIAL = np.dtype([
+    ("ka_red", "<f4"), ("ka_green", "<f4"), ("ka_blue", "<f4"), ("ka_texture_ID", "<u8"),
+    ("ks_red", "<f4"), ("ks_green", "<f4"), ("ks_blue", "<f4"), ("ks_texture_ID", "<u8"),
+    ("kd_red", "<f4"), ("kd_green", "<f4"), ("kd_blue", "<f4"), ("kd_texture_ID", "<u8"),
+    ("ns", "<f4"), ("alpha", "<f4")
+])
+assert _FILE_HEADER.itemsize == file_header_size and _DATA_BLOCK_HEADER.itemsize == rexDataBlockHeaderSize
+assert _MESH_HEADER.itemsize == mesh_header_size and _MATERIAL.itemsize == 68
+
+_MESH, _MATERIAL_STANDARD = 3, 5
+
+
+def rex_size(rex_meshes: Sequence[RexMesh] = (), rex_material: Sequence[RexMaterial] = ()) -> int:
+    """Bytes of the REX file of some meshes and materials."""
+    return file_header_size + sum(_mesh_block_size(rex_mesh) for rex_mesh in rex_meshes) + \
+        len(rex_material) * (rexDataBlockHeaderSize + _MATERIAL.itemsize)
+
+
+def rex_bytes(rex_meshes: Optional[List[RexMesh]] = None,
+              rex_material: Optional[List[RexMaterial]] = None) -> bytearray:
+    """REX file of meshes and materials, in memory.
+
+    Data ids are given in order, first to the meshes and then to the materials.
+    """
+    rex_meshes, rex_material = rex_meshes or [], rex_material or []
+    buffer = bytearray(rex_size(rex_meshes, rex_material))
+    write_rex_blocks(memoryview(buffer), rex_meshes, rex_material)
+    return buffer
+
+
+def write_rex(path: str, rex_meshes: Optional[List[RexMesh]] = None,
+              rex_material: Optional[List[RexMaterial]] = None) -> int:
+    """Write a REX file of meshes and materials through a memory map, so scenes
+    larger than memory are paged out to disk as they are written.
+
+    Args:
+        path (str): Path of the file, including the extension
+        rex_meshes (List[RexMesh]):
+        rex_material (List[RexMaterial]):
+
+    Returns:
+        int: Bytes written
+    """
+    rex_meshes, rex_material = rex_meshes or [], rex_material or []
+    size = rex_size(rex_meshes, rex_material)
+    with open(path, "w+b") as file:
+        file.truncate(size)
+        with mmap.mmap(file.fileno(), size) as buffer:
+            view = memoryview(buffer)
+            try:
+                write_rex_blocks(view, rex_meshes, rex_material)
+            finally:
+                view.release()
+    return size
+
+
+def write_rex_blocks(buffer: Union[memoryview, bytearray], rex_meshes: Sequence[RexMesh],
+                     rex_material: Sequence[RexMaterial], srid: int = 3876, offsets=None) -> int:
+    """Write the file header and every data block into a buffer of at least
+    `rex_size` bytes.
+
+    Returns:
+        int: Bytes written
+    """
+    offset = file_header_size
+    data_id = 0
+    for rex_mesh in rex_meshes:
+        offset = _write_mesh(buffer, offset, rex_mesh, data_id)
+        data_id += 1
+    for material in rex_material:
+        offset = _write_material(buffer, offset, material, data_id)
+        data_id += 1
+
+    header = _record(buffer, 0, _FILE_HEADER)
+    header["magic"] = b"REX1"
+    header["version"] = 1
+    header["n_data_blocks"] = data_id
+    header["start_data"] = file_header_size
+    header["size_data_blocks"] = offset - file_header_size
+    header["reserved"] = b"0" * 42
+    header["srid"] = srid
+    header["name_size"] = 4
+    header["name"] = b"EPSG"
+    header["offsets"] = [0, 0, 0] if offsets is None else offsets
+    return offset
+
+
+def _record(buffer, offset: int, dtype: np.dtype) -> np.ndarray:
+    """Writable record of a structured dtype on the buffer, zero filled."""
+    record = np.frombuffer(buffer, dtype=dtype, count=1, offset=offset)
+    record[...] = np.zeros((), dtype=dtype)
+    return record[0]
+
+
+def _write_array(buffer, offset: int, values: np.ndarray, dtype: str) -> int:
+    values = np.asarray(values).ravel()
+    np.frombuffer(buffer, dtype=dtype, count=values.size, offset=offset)[:] = values
+    return offset + values.size * 4
+
+
+def _write_data_block_header(buffer, offset: int, data_type: int, size: int, data_id: int) -> int:
+    header = _record(buffer, offset, _DATA_BLOCK_HEADER)
+    header["data_type"] = data_type
+    header["version"] = 1
+    header["size"] = size
+    header["data_id"] = data_id
+    return offset + rexDataBlockHeaderSize
+
+
+def _mesh_block_size(rex_mesh: RexMesh) -> int:
+    return rexDataBlockHeaderSize + mesh_header_size + \
+        4 * (np.size(rex_mesh.vertex) + np.size(rex_mesh.color) + np.size(rex_mesh.edges))
+
+
+def _write_mesh(buffer, offset: int, rex_mesh: RexMesh, data_id: int) -> int:
+    name = rex_mesh.name.encode()
+    if len(name) > 74:
+        raise ValueError(f"REX mesh names must be at most 74 bytes, not {len(name)}: {rex_mesh.name}.")
+    n_vtx_coord, n_vtx_colors = np.size(rex_mesh.vertex), np.size(rex_mesh.color)
+    material_id = rex_mesh.material_id
+    if np.size(material_id) == 0:
+        material_id = NO_MATERIAL
+
+    offset = _write_data_block_header(buffer, offset, _MESH, _mesh_block_size(rex_mesh) - rexDataBlockHeaderSize,
+                                      data_id)
+    header = _record(buffer, offset, _MESH_HEADER)
+    header["lod"] = rex_mesh.lod
+    header["max_lod"] = rex_mesh.max_lod
+    header["n_vtx_coord"] = n_vtx_coord // 3
+    header["n_vtx_colors"] = n_vtx_colors // 3
+    header["n_triangles"] = np.size(rex_mesh.edges) // 3
+    header["start_vtx_coord"] = mesh_header_size
+    header["start_nor_coord"] = header["start_tex_coord"] = header["start_vtx_colors"] = \
+        mesh_header_size + n_vtx_coord * 4
+    header["start_triangles"] = mesh_header_size + (n_vtx_coord + n_vtx_colors) * 4
+    header["material_id"] = material_id
+    header["name_size"] = len(name)
+    header["name"] = name.ljust(74)
+
+    offset = _write_array(buffer, offset + mesh_header_size, rex_mesh.vertex, "<f4")
+    offset = _write_array(buffer, offset, rex_mesh.color, "<f4")
+    return _write_array(buffer, offset, rex_mesh.edges, "<u4")
+
+
+def _write_material(buffer, offset: int, material: RexMaterial, data_id: int) -> int:
+    offset = _write_data_block_header(buffer, offset, _MATERIAL_STANDARD, _MATERIAL.itemsize, data_id)
+    record = _record(buffer, offset, _MATERIAL)
+    for name in _MATERIAL.names:
+        record[name] = getattr(material, name)
+    return offset + _MATERIAL.itemsize
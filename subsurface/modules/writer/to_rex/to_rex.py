@@ -1,12 +1,13 @@
 from typing import List
 
-from subsurface.writer.to_rex.common import file_header_size, encode
-from subsurface.writer.to_rex.data_struct import RexLineSet, RexMesh, RexMaterial
-from subsurface.writer.to_rex.material_encoder import material_encode
-from subsurface.writer.to_rex.mesh_encoder import mesh_encode
+from .common import file_header_size, encode
+from .data_struct import RexLineSet, RexMesh, RexMaterial
+from .material_encoder import material_encode
+from .mesh_encoder import mesh_encode
+from .rex_writer import rex_bytes, write_rex
 
 
-__all__ = ['numpy_to_rex', 'w_data_blocks', 'w_block_data_type',
+__all__ = ['numpy_to_rex', 'write_rex', 'w_data_blocks', 'w_block_data_type',
            'w_file_header_and_coord_system_block',
            'w_file_header_and_coord_system_block', 'write_rex_file',
            'read_rex_file']
@@ -17,26 +18,15 @@ def numpy_to_rex(
         rex_meshes: List[RexMesh] = None,
         rex_material: List[RexMaterial] = None
 ):
-    if rex_line_set is None:
-        rex_line_set = list()
-    if rex_meshes is None:
-        rex_meshes = list()
-    if rex_material is None:
-        rex_material = list()
+    """REX file of meshes and materials, written into one preallocated buffer
+    (see `rex_writer`). Use `write_rex` to write large scenes straight to disk.
 
-    data_block_bytes = bytearray()
-    byte_size = 0
-
-    data_block_bytes, data_id = w_data_blocks(rex_meshes, rex_material)
-
-    n_data_blocks = data_id
-    header_and_coord_block_bytes = w_file_header_and_coord_system_block(
-        n_data_blocks=n_data_blocks,
-        size_data_blocks=len(data_block_bytes),
-        start_data=file_header_size
-    )
+    Line sets are not supported yet and are ignored.
 
-    return header_and_coord_block_bytes + data_block_bytes
+    Returns:
+        bytearray
+    """
+    return rex_bytes(rex_meshes, rex_material)
 
 
 def w_data_blocks(rex_meshes: List[RexMesh], rex_material: List[RexMaterial]):
@@ -107,4 +107,20 @@ def require_subsurface():
         import subsurface
     except ImportError:
         raise ImportError("The subsurface package is required to run this function.")
-    return subsurface
\ No newline at end of file
+    return subsurface
+
+
+def require_dask():
+    try:
+        import dask.array
+    except ImportError:
+        raise ImportError("The dask package is required to run this function.")
+    return dask
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("The pyarrow package is required to run this function.")
+    return pyarrow
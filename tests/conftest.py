@@ -1,4 +1,6 @@
 import enum
+import time
+from typing import Any, Callable, Tuple
 
 import pytest
 
@@ -35,6 +37,34 @@ def check_requirements(minimum_level: RequirementsLevel):
     return RequirementsLevel.REQUIREMENT_LEVEL_TO_TEST().value < minimum_level.value
 
 
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS", "False").lower() in ("true", "1")
+large_benchmark = pytest.mark.skipif(not RUN_BENCHMARKS, reason="Set RUN_BENCHMARKS=True to run the benchmarks")
+
+
+def timed(function: Callable, *args, repeats: int = 1, **kwargs) -> Tuple[Any, float]:
+    """Result of calling `function` and its mean wall time in seconds over
+    `repeats` calls."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) / repeats
+
+
+def synthetic_survey_df(n_wells: int, n_stations: int = 10, max_md: float = 1500., seed: int = 0) -> pd.DataFrame:
+    """Deviated wells with random inclination and azimuth indexed by well name,
+    as returned by `read_survey`."""
+    rng = np.random.default_rng(seed)
+    md = np.sort(rng.uniform(0, max_md, (n_wells, n_stations)), axis=1)
+    md[:, 0] = 0
+    inc = rng.uniform(0, 60, (n_wells, n_stations))
+    azi = rng.uniform(0, 360, (n_wells, n_stations))
+    ids = np.repeat([f"well_{i:06d}" for i in range(n_wells)], n_stations)
+    return pd.DataFrame(
+        data={'md': md.ravel(), 'inc': inc.ravel(), 'azi': azi.ravel()},
+        index=pd.Index(ids, name='id')
+    )
+
+
 @pytest.fixture(scope='session')
 def data_path():
     return os.path.abspath(os.path.dirname(__file__) + '/data')
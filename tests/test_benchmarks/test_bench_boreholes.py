@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from conftest import synthetic_survey_df, large_benchmark, timed
+from subsurface.core.geological_formats.boreholes.boreholes import BoreholeSet, MergeOptions
+from subsurface.core.geological_formats.boreholes.collars import Collars
+from subsurface.core.geological_formats.boreholes.survey import Survey
+
+pytestmark = large_benchmark
+
+
+def _time_borehole_set(n_wells: int) -> float:
+    survey = Survey.from_df(synthetic_survey_df(n_wells=n_wells))
+    rng = np.random.default_rng(0)
+    collars = Collars.from_df(pd.DataFrame(rng.uniform(0, 1e5, (n_wells, 3)), columns=['x', 'y', 'z'], index=list(survey.ids)))
+
+    borehole_set, elapsed = timed(BoreholeSet, collars=collars, survey=survey, merge_option=MergeOptions.INTERSECT)
+
+    assert borehole_set.combined_trajectory.data.n_points == survey.survey_trajectory.data.n_points
+    print(f"\n{n_wells} wells: BoreholeSet {elapsed:.3f} s ({elapsed / n_wells * 1e6:.2f} us/well)")
+    return elapsed
+
+
+def test_bench_borehole_set_scales_linearly():
+    sizes = [1_000, 10_000, 100_000]
+    per_well = [_time_borehole_set(n) / n for n in sizes]
+    # A per-well filter would make the cost per well grow 100 times from 1k to 100k wells
+    assert per_well[-1] < 5 * per_well[0]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from conftest import large_benchmark, timed
+from subsurface.core.structs.base_structures import UnstructuredData
+from subsurface.modules.reader.from_container import read_container
+from subsurface.modules.reader.read_netcdf import read_unstruct
+from subsurface.modules.writer.block_codecs import BlockCompression
+from subsurface.modules.writer.to_container import base_struct_to_container
+
+COMPRESSIONS = {
+        "raw"            : None,
+        "zlib (no filter)": BlockCompression("zlib", shuffle=False, delta=False),
+        "zlib"           : "zlib",
+        "lzma (no filter)": BlockCompression("lzma", shuffle=False, delta=False),
+        "lzma"           : "lzma",
+}
+
+pytestmark = large_benchmark
+
+
+def _codec_table(tmp_path, unstruct: UnstructuredData, title: str):
+    raw_nbytes = None
+    rows = []
+    for label, compression in COMPRESSIONS.items():
+        path = tmp_path / "mesh.sub"
+        _, write_time = timed(base_struct_to_container, path, unstruct, compression=compression)
+        read, read_time = timed(read_container, path, mmap=False)
+        np.testing.assert_array_equal(read.cells, unstruct.cells)
+
+        nbytes = path.stat().st_size
+        raw_nbytes = raw_nbytes or nbytes
+        rows.append(f"{label:<17} {nbytes / 1e6:>9.2f} {raw_nbytes / nbytes:>7.1f} "
+                    f"{raw_nbytes / 1e6 / write_time:>11.1f} {raw_nbytes / 1e6 / read_time:>10.1f}")
+
+    print(f"\n{title}\n{'codec':<17} {'size (MB)':>9} {'ratio':>7} {'write MB/s':>11} {'read MB/s':>10}")
+    print("\n".join(rows))
+
+
+@pytest.mark.parametrize("file_name", ["wells.nc", "interpolator_meshes.nc"])
+def test_bench_codecs_test_data(tmp_path, data_path, file_name):
+    _codec_table(tmp_path, read_unstruct(f"{data_path}/{file_name}"), file_name)
+
+
+def test_bench_codecs_large_surface(tmp_path):
+    # Regular grid surface with 2M triangles
+    n = 1000
+    x, y = np.meshgrid(np.arange(n, dtype=float), np.arange(n, dtype=float))
+    z = np.sin(x / 50) * np.cos(y / 70) * 100
+    ids = np.arange(n * n).reshape(n, n)
+    quads = np.stack([ids[:-1, :-1], ids[:-1, 1:], ids[1:, 1:], ids[1:, :-1]], axis=-1).reshape(-1, 4)
+    cells = np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    unstruct = UnstructuredData.from_array(np.column_stack([x.ravel(), y.ravel(), z.ravel()]), cells)
+    _codec_table(tmp_path, unstruct, "2M triangle surface")
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from conftest import large_benchmark, timed
+from subsurface.modules.writer.to_rex.common import file_header_size
+from subsurface.modules.writer.to_rex.data_struct import RexMaterial, RexMesh
+from subsurface.modules.writer.to_rex.to_rex import numpy_to_rex, w_data_blocks, \
+    w_file_header_and_coord_system_block, write_rex
+
+pytestmark = large_benchmark
+
+
+def _rex_meshes(n_meshes: int, n_triangles: int):
+    rng = np.random.default_rng(0)
+    n_vertex = n_triangles // 2
+    return [RexMesh(name=f"surface {i}", vertex=rng.random((n_vertex, 3)),
+                    edges=rng.integers(0, n_vertex, (n_triangles, 3)), color=rng.random((n_vertex, 3)),
+                    material_id=n_meshes + i)
+            for i in range(n_meshes)]
+
+
+def _encoded_rex(rex_meshes, rex_material) -> bytes:
+    """Previous writer: every block encoded to bytes and concatenated."""
+    data_block_bytes, n_data_blocks = w_data_blocks(rex_meshes, rex_material)
+    return w_file_header_and_coord_system_block(
+        n_data_blocks=n_data_blocks,
+        size_data_blocks=len(data_block_bytes),
+        start_data=file_header_size
+    ) + data_block_bytes
+
+
+@pytest.mark.parametrize("n_meshes, n_triangles", [(200, 2_000), (20, 1_000_000)])
+def test_bench_rex(n_meshes, n_triangles, tmp_path):
+    rex_meshes = _rex_meshes(n_meshes, n_triangles)
+    rex_material = [RexMaterial() for _ in range(n_meshes)]
+
+    rex_bytes, in_memory = timed(numpy_to_rex, rex_meshes=rex_meshes, rex_material=rex_material)
+    size, to_file = timed(write_rex, str(tmp_path / "scene.rex"), rex_meshes, rex_material)
+    expected, encoded = timed(_encoded_rex, rex_meshes, rex_material)
+    assert rex_bytes == expected and size == len(expected)
+
+    megabytes = size / 2 ** 20
+    print(f"\n{n_meshes} meshes of {n_triangles} triangles ({megabytes:.0f} MB): "
+          f"numpy_to_rex {megabytes / in_memory:.0f} MB/s, write_rex {megabytes / to_file:.0f} MB/s, "
+          f"block encoders {megabytes / encoded:.0f} MB/s")
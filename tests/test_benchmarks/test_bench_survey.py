@@ -0,0 +1,15 @@
+import pytest
+
+from conftest import synthetic_survey_df, large_benchmark, timed
+from subsurface.core.geological_formats.boreholes.survey import Survey
+
+pytestmark = large_benchmark
+
+
+@pytest.mark.parametrize("n_wells", [1_000, 10_000, 100_000])
+def test_bench_survey_from_df(n_wells):
+    df = synthetic_survey_df(n_wells=n_wells)
+    survey, elapsed = timed(Survey.from_df, df)
+
+    assert survey.survey_trajectory.data.n_points > df.shape[0]
+    print(f"\n{n_wells} wells, {survey.survey_trajectory.data.n_points} stations: Survey.from_df {elapsed:.3f} s")
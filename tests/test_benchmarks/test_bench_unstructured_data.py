@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import large_benchmark, timed
+from subsurface.core.structs.base_structures import UnstructuredData
+
+pytestmark = large_benchmark
+
+
+@pytest.mark.parametrize("n_rows, repeats", [(10, 1000), (10_000_000, 3)])
+def test_bench_constructors(n_rows, repeats):
+    rng = np.random.default_rng(0)
+    vertex = rng.random((n_rows, 3))
+    vertex_attr = pd.DataFrame(rng.random((n_rows, 2)), columns=["a", "b"])
+
+    _, from_array = timed(UnstructuredData.from_array, vertex, "lines", vertex_attr=vertex_attr, repeats=repeats)
+    _, unchecked = timed(UnstructuredData.from_arrays_unchecked, vertex, "lines", vertex_attr=vertex_attr,
+                         repeats=repeats)
+    _, many = timed(UnstructuredData.from_many, [vertex] * repeats, "lines", vertex_attr=[vertex_attr] * repeats)
+
+    print(f"\n{n_rows} rows: from_array {from_array * 1e3:.3f} ms, from_arrays_unchecked {unchecked * 1e3:.3f} ms, "
+          f"from_many {many / repeats * 1e3:.3f} ms per object")
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import synthetic_survey_df
+from subsurface.core.geological_formats.boreholes.boreholes import BoreholeSet, MergeOptions
+from subsurface.core.geological_formats.boreholes.collars import Collars
+from subsurface.core.geological_formats.boreholes.survey import Survey
+
+
+@pytest.fixture(scope="module")
+def survey():
+    return Survey.from_df(synthetic_survey_df(n_wells=10, n_stations=5, max_md=500))
+
+
+@pytest.fixture(scope="module")
+def collars_df(survey):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(0, 1000, (10, 3)), columns=['x', 'y', 'z'], index=list(survey.ids))
+    return df.iloc[::-1]  # Collars do not need to follow the survey order
+
+
+def test_borehole_set_intersect(survey, collars_df):
+    collars = Collars.from_df(collars_df.iloc[:6])
+    borehole_set = BoreholeSet(collars=collars, survey=survey, merge_option=MergeOptions.INTERSECT)
+
+    trajectory = borehole_set.combined_trajectory.data
+    survey_data = survey.survey_trajectory.data
+    survey_well_id = survey_data.points_attributes['well_id'].values.astype(int)
+    kept = np.isin(np.asarray(survey.ids)[survey_well_id], collars.ids)
+
+    offsets = collars_df.loc[np.asarray(survey.ids)[survey_well_id[kept]], ['x', 'y', 'z']].values
+    np.testing.assert_allclose(trajectory.vertex, survey_data.vertex[kept] + offsets)
+
+    well_id = trajectory.points_attributes['well_id'].values.astype(int)
+    assert trajectory.n_elements == kept.sum() - len(collars.ids)  # One segment less than vertices per well
+    assert (well_id[trajectory.cells[:, 0]] == well_id[trajectory.cells[:, 1]]).all()
+    assert (trajectory.attributes['well_id'].values == well_id[trajectory.cells[:, 0]]).all()
+
+
+def test_borehole_set_raise(survey, collars_df):
+    BoreholeSet(collars=Collars.from_df(collars_df), survey=survey, merge_option=MergeOptions.RAISE)
+
+    with pytest.raises(ValueError, match="do not match"):
+        BoreholeSet(collars=Collars.from_df(collars_df.iloc[:6]), survey=survey, merge_option=MergeOptions.RAISE)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from conftest import synthetic_survey_df
+from subsurface import optional_requirements
+from subsurface.core.geological_formats.boreholes._min_curvature import resample_minimum_curvature
+from subsurface.core.geological_formats.boreholes.survey import Survey, STEP, _correct_angles
+
+
+@pytest.fixture(scope="module")
+def survey_df():
+    df = synthetic_survey_df(n_wells=20, n_stations=6, max_md=800)
+    return df.loc[df.index.unique()[::-1]]  # Wells do not need to come sorted
+
+
+def test_resample_minimum_curvature_matches_wellpathpy(survey_df):
+    wp = optional_requirements.require_wellpathpy()
+    df = _correct_angles(survey_df.copy())
+
+    expected = []
+    for borehole_id, data in df.groupby(level=0):
+        dev = wp.deviation(md=data['md'], inc=data['inc'], azi=data['azi'])
+        depths = list(range(0, int(dev.md[-1]) + 1, STEP))
+        pos = dev.minimum_curvature().resample(depths=depths)
+        expected.append(np.column_stack([pos.northing, pos.easting, pos.depth]))
+    expected = np.vstack(expected)
+
+    df = df.sort_index(kind='stable')
+    offsets = np.r_[0, np.cumsum(df.groupby(level=0).size().values)]
+    trajectories = resample_minimum_curvature(df['md'], df['inc'], df['azi'], offsets, STEP)
+    result = np.column_stack([trajectories.northing, trajectories.easting, trajectories.tvd])
+
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+
+
+def test_survey_from_df(survey_df):
+    survey = Survey.from_df(survey_df.copy())
+    ud = survey.survey_trajectory.data
+
+    assert len(survey.ids) == 20
+    assert ud.n_points == ud.points_attributes.shape[0]
+    # Cells never connect two different wells
+    well_id = ud.points_attributes['well_id'].values.astype(int)
+    assert (well_id[ud.cells[:, 0]] == well_id[ud.cells[:, 1]]).all()
+    assert (ud.attributes['well_id'].values == well_id[ud.cells[:, 0]]).all()
+
+
+def test_resample_minimum_curvature_raises_on_single_station():
+    with pytest.raises(ValueError, match="two survey stations"):
+        resample_minimum_curvature(
+            md=np.array([0., 10., 0.]),
+            inc=np.zeros(3),
+            azi=np.zeros(3),
+            offsets=np.array([0, 2, 3]),
+            step=STEP
+        )
+
+
+def test_assign_intervals():
+    from subsurface.core.geological_formats.boreholes._intervals import assign_intervals
+
+    assignment = assign_intervals(
+        vertex_well=np.array([0, 0, 0, 0, 1, 1]),
+        vertex_depth=np.array([-5., -15., -25., -35., -5., -15.]),
+        interval_well=np.array([0, 0, 1, 0]),
+        interval_bottom=np.array([-10., -40., -10., -30.]),
+        interval_top=np.array([0., -20., 0., -25.])
+    )
+
+    np.testing.assert_array_equal(assignment.interval, [0, -1, 3, 1, 2, -1])
+    np.testing.assert_array_equal(assignment.n_intervals, [1, 0, 2, 1, 1, 0])
+    np.testing.assert_array_equal(assignment.unassigned, [1, 5])
+    np.testing.assert_array_equal(assignment.overlapping, [2])
+
+
+def test_update_survey_with_lith(survey_df):
+    import pandas as pd
+    survey = Survey.from_df(survey_df.copy())
+    lith = pd.DataFrame(
+        data={
+                'top'           : [300, 2000, 2000],
+                'base'          : [0, 300, 0],
+                'component lith': ['sand', 'shale', 'sand']
+        },
+        index=[survey.ids[0], survey.ids[0], survey.ids[1]]
+    )
+
+    assignment = survey.update_survey_with_lith(lith)
+
+    attrs = survey.survey_trajectory.data.points_attributes
+    in_well_0_or_1 = np.isin(attrs['well_id'].values.astype(int), [0, 1])
+    assert (attrs['lith_ids'][~in_well_0_or_1] == -1).all()
+    assert (attrs['component lith'][in_well_0_or_1].isin(['sand', 'shale'])).all()
+    np.testing.assert_array_equal(assignment.unassigned, np.flatnonzero(~in_well_0_or_1))
+
+
+def test_update_survey_with_lith_of_unknown_wells(survey_df):
+    import pandas as pd
+    survey = Survey.from_df(survey_df.copy())
+    lith = pd.DataFrame({'top': [300], 'base': [0], 'component lith': ['sand']}, index=['not a well'])
+
+    assignment = survey.update_survey_with_lith(lith)
+
+    attrs = survey.survey_trajectory.data.points_attributes
+    assert (attrs['lith_ids'] == -1).all()
+    assert (assignment.interval == -1).all()
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+import subsurface
+
+HEAVY_MODULES = ["pyvista", "vtk", "vtkmodules", "scipy", "matplotlib", "omfvista", "dotenv"]
+
+
+def _fresh_import(statement: str = "") -> list:
+    """Heavy modules loaded by `import subsurface` and then `statement`, in a
+    new interpreter importing from the same tree as the test session."""
+    script = (f"import json, sys\nimport subsurface\n{statement}\n"
+              f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(subsurface.__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([root, os.environ.get("PYTHONPATH", "")])}
+    output = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def test_import_subsurface_is_lazy():
+    assert _fresh_import() == []
+
+
+def test_lazy_submodules():
+    assert "dotenv" in _fresh_import("subsurface.modules.reader")
+
+    from subsurface.modules import visualization
+    assert subsurface.visualization is visualization
+    assert "visualization" in dir(subsurface)
+
+
+def test_import_surface():
+    # Submodules reachable as attributes after `import subsurface`, as with the eager imports
+    loaded = _fresh_import("[subsurface.api.interfaces, subsurface.modules.reader, subsurface.modules.writer, "
+                           "subsurface.visualization]")
+    assert "pyvista" in loaded
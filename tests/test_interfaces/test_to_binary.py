@@ -93,3 +93,68 @@ def test_profile_to_binary(data_path):
     new_file.write(texture_binary)
 
     return mesh_binary
+
+
+def test_read_binary_unstruct(tmp_path):
+    from subsurface.modules.writer import base_structs_to_binary_file
+    from subsurface.modules.reader.from_binary import read_binary_unstruct
+    import pandas as pd
+
+    unstruct = UnstructuredData.from_array(
+        vertex=np.random.default_rng(0).random((5, 3)),
+        cells="lines",
+        cells_attr=pd.DataFrame({'foo': np.arange(4)}),
+        vertex_attr=pd.DataFrame({'bar': np.arange(5.), 'baz': np.arange(5.) * 2})
+    )
+    base_structs_to_binary_file(str(tmp_path / "lines"), unstruct)
+    read = read_binary_unstruct(tmp_path / "lines.json", tmp_path / "lines.le")
+
+    # Typed, read-only views of the memory-mapped file
+    assert read.vertex.dtype == np.float32 and read.cells.dtype == np.int32
+    assert isinstance(read.vertex.base, np.memmap) and not read.vertex.flags.writeable
+    np.testing.assert_allclose(read.vertex, unstruct.vertex.astype('float32'))
+    np.testing.assert_array_equal(read.cells, unstruct.cells)
+    np.testing.assert_array_equal(read.attributes, unstruct.attributes)
+    assert list(read.points_attributes.columns) == ['bar', 'baz']
+    np.testing.assert_array_equal(read.points_attributes, unstruct.points_attributes)
+
+
+def test_base_structs_to_binary_file(tmp_path):
+    from subsurface.modules.writer import base_structs_to_binary_file
+    from subsurface.modules.reader.from_binary import read_binary_unstruct
+    import pandas as pd
+
+    unstruct = UnstructuredData.from_array(
+        vertex=np.random.default_rng(0).random((100, 3)),
+        cells="points",
+        vertex_attr=pd.DataFrame({'bar': np.arange(100), 'baz': np.arange(100) * 2})
+    )
+    # Small chunks so every block is written in several pieces
+    base_structs_to_binary_file(str(tmp_path / "points"), unstruct, chunk_size=16)
+
+    bytearray_le, header = unstruct.to_binary()
+    assert (tmp_path / "points.le").read_bytes() == bytearray_le
+    with open(tmp_path / "points.json") as f:
+        written_header = json.load(f)
+    assert written_header['vertex_offset'] == 0
+    assert written_header['cell_offset'] == 100 * 3 * 4
+    assert written_header['vertex_attr_offset'] == 100 * 3 * 4 + 100 * 4
+    assert written_header['vertex_attr_types'] == ['int64', 'int64']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['points.json', 'points.le']
+
+    read = read_binary_unstruct(tmp_path / "points.json", tmp_path / "points.le")
+    np.testing.assert_array_equal(read.points_attributes, unstruct.points_attributes)
+
+
+def test_dump_json_atomically_errors(tmp_path):
+    from subsurface.modules.writer.to_binary import _dump_json_atomically
+
+    # The temporary file is removed
+    with pytest.raises(TypeError):
+        _dump_json_atomically({'foo': object()}, str(tmp_path / "header.json"))
+    assert list(tmp_path.iterdir()) == []
+
+    # The temporary file is never created, and the original error is raised
+    with pytest.raises(FileNotFoundError) as error:
+        _dump_json_atomically({}, str(tmp_path / "missing" / "header.json"))
+    assert error.value.__context__ is None
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from subsurface import UnstructuredData, StructuredData
+from subsurface.modules.reader.from_container import read_container, read_container_toc, read_container_attribute
+from subsurface.modules.writer.block_codecs import BlockCompression
+from subsurface.modules.writer.to_container import base_struct_to_container, ALIGNMENT
+
+
+@pytest.fixture(scope='module')
+def unstruct():
+    rng = np.random.default_rng(0)
+    return UnstructuredData.from_array(
+        vertex=rng.random((50, 3)),
+        cells=rng.integers(0, 50, (30, 3)),
+        cells_attr=pd.DataFrame({'id': np.arange(30)}),
+        vertex_attr=pd.DataFrame({'depth': rng.random(50), 'porosity': rng.random(50)}),
+        xarray_attributes={'name': 'surface'}
+    )
+
+
+def test_container_unstructured_data(tmp_path, unstruct):
+    path = tmp_path / "mesh.sub"
+    base_struct_to_container(path, unstruct)
+
+    toc = read_container_toc(path)
+    assert [block['name'] for block in toc['blocks']] == \
+           ['vertex', 'cells', 'cell_attrs/0', 'vertex_attrs/0', 'vertex_attrs/1']
+    assert all(block['offset'] % ALIGNMENT == 0 for block in toc['blocks'])
+
+    read = read_container(path, verify=True)
+    # Dtypes are kept
+    np.testing.assert_array_equal(read.vertex, unstruct.vertex)
+    np.testing.assert_array_equal(read.cells, unstruct.cells)
+    pd.testing.assert_frame_equal(read.attributes, unstruct.attributes)
+    pd.testing.assert_frame_equal(read.points_attributes, unstruct.points_attributes)
+    assert read.data.attrs == {'name': 'surface'}
+
+
+def test_container_structured_data(tmp_path):
+    struct = StructuredData.from_numpy(
+        np.random.default_rng(0).random((3, 4, 5)).astype('float32'),
+        coords={'x': [1, 2, 3], 'y': list('abcd')}
+    )
+    path = tmp_path / "grid.sub"
+    base_struct_to_container(path, struct)
+
+    read = read_container(path, verify=True)
+    xr.testing.assert_identical(read.data, struct.data)
+    assert read.data_array_name == struct.data_array_name
+
+
+def test_container_random_access(tmp_path, unstruct):
+    path = tmp_path / "mesh.sub"
+    base_struct_to_container(path, unstruct)
+
+    # Corrupt the vertex block. Reading one attribute never touches it
+    vertex_offset = read_container_toc(path)['blocks'][0]['offset']
+    with open(path, 'r+b') as f:
+        f.seek(vertex_offset)
+        f.write(b'\xff' * 8)
+
+    porosity = read_container_attribute(path, 'porosity', verify=True)
+    np.testing.assert_array_equal(porosity, unstruct.points_attributes['porosity'])
+
+    with pytest.raises(ValueError, match="CRC"):
+        read_container(path, verify=True)
+
+
+def test_container_not_a_container(tmp_path):
+    path = tmp_path / "foo.sub"
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        read_container(path)
+
+
+@pytest.mark.parametrize("compression", [
+        "zlib",
+        "lzma",
+        BlockCompression("zlib", level=9, shuffle=False, delta=False),
+        {"cells": BlockCompression("lzma"), "vertex_attrs/1": "zlib"},
+])
+def test_container_compression(tmp_path, unstruct, compression):
+    path = tmp_path / "mesh.sub"
+    base_struct_to_container(path, unstruct, compression=compression)
+
+    blocks = {block['name']: block for block in read_container_toc(path)['blocks']}
+    if compression == "zlib":
+        assert blocks['cells']['filters'] == ['delta']
+        assert blocks['vertex']['filters'] == ['shuffle']
+
+    read = read_container(path, verify=True)
+    np.testing.assert_array_equal(read.vertex, unstruct.vertex)
+    np.testing.assert_array_equal(read.cells, unstruct.cells)
+    pd.testing.assert_frame_equal(read.points_attributes, unstruct.points_attributes)
+    np.testing.assert_array_equal(read_container_attribute(path, 'porosity'), unstruct.points_attributes['porosity'])
+
+
+def test_container_delta_float_block(tmp_path, unstruct):
+    with pytest.raises(ValueError):
+        base_struct_to_container(tmp_path / "mesh.sub", unstruct, compression=BlockCompression(delta=True))
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from subsurface import TriSurf, UnstructuredData
+from subsurface.modules.writer.to_rex.common import file_header_size
+from subsurface.modules.writer.to_rex.data_struct import RexMaterial, RexMesh
+from subsurface.modules.writer.to_rex.to_rex import numpy_to_rex, w_data_blocks, \
+    w_file_header_and_coord_system_block, write_rex
+
+
+def _rex_meshes():
+    rng = np.random.default_rng(0)
+    return [
+        RexMesh(name="surface", vertex=rng.random((40, 3)), edges=rng.integers(0, 40, (60, 3)),
+                color=rng.random((40, 3)), material_id=1, lod=0, max_lod=2),
+        RexMesh(name="fault", vertex=rng.random((10, 3)), edges=rng.integers(0, 10, (8, 3)), material_id=0)
+    ]
+
+
+def _encoded(rex_meshes, rex_material) -> bytes:
+    """Block by block encoding."""
+    data_block_bytes, n_data_blocks = w_data_blocks(rex_meshes, rex_material)
+    return w_file_header_and_coord_system_block(
+        n_data_blocks=n_data_blocks,
+        size_data_blocks=len(data_block_bytes),
+        start_data=file_header_size
+    ) + data_block_bytes
+
+
+def test_numpy_to_rex_matches_block_encoders():
+    rex_meshes, rex_material = _rex_meshes(), [RexMaterial(), RexMaterial(kd_red=0.5)]
+    rex_bytes = numpy_to_rex(rex_meshes=rex_meshes, rex_material=rex_material)
+    assert bytes(rex_bytes) == bytes(_encoded(rex_meshes, rex_material))
+
+    # Mesh header of the first mesh, after the file and data block headers
+    header = np.frombuffer(rex_bytes, dtype="<u2", count=2, offset=file_header_size + 16)
+    np.testing.assert_array_equal(header, [0, 2])
+    counts = np.frombuffer(rex_bytes, dtype="<u4", count=5, offset=file_header_size + 20)
+    np.testing.assert_array_equal(counts, [40, 0, 0, 40, 60])
+
+
+def test_write_rex(tmp_path):
+    rex_meshes = _rex_meshes()
+    path = tmp_path / "scene.rex"
+    size = write_rex(str(path), rex_meshes, [RexMaterial()])
+    assert path.stat().st_size == size
+    assert path.read_bytes() == bytes(numpy_to_rex(rex_meshes=rex_meshes, rex_material=[RexMaterial()]))
+
+    with pytest.raises(ValueError):
+        numpy_to_rex(rex_meshes=[RexMesh(name="x" * 75, vertex=np.zeros((3, 3)), edges=np.zeros((1, 3)))])
+
+
+def test_rex_mesh_from_tri_surf_lod():
+    n = 101
+    x, y = np.meshgrid(np.linspace(0, 100, n), np.linspace(0, 100, n))
+    corner = (np.arange(n - 1)[:, None] * n + np.arange(n - 1)).ravel()
+    tri_surf = TriSurf(UnstructuredData.from_arrays_unchecked(
+        vertex=np.column_stack([x.ravel(), y.ravel(), np.sin(x.ravel() / 10)]),
+        cells=np.concatenate([np.column_stack([corner, corner + 1, corner + n + 1]),
+                              np.column_stack([corner, corner + n + 1, corner + n])])
+    ))
+
+    def lod_header(rex_mesh):
+        rex_bytes = numpy_to_rex(rex_meshes=[rex_mesh])
+        return np.frombuffer(rex_bytes, dtype="<u2", count=2, offset=file_header_size + 16).tolist()
+
+    # Levels are counted from 1, like a single mesh
+    full = RexMesh.from_tri_surf(tri_surf, "surface")
+    assert lod_header(full) == [1, 1]
+    assert lod_header(RexMesh(name="surface", vertex=full.vertex, edges=full.edges)) == [1, 1]
+
+    pyramid = tri_surf.lod_pyramid()
+    coarse = RexMesh.from_tri_surf(tri_surf, "surface", max_triangles=pyramid.n_triangles[1])
+    assert coarse.edges.shape[0] == pyramid.n_triangles[1]
+    assert lod_header(coarse) == [2, len(pyramid)]
@@ -1,3 +1,4 @@
+import numpy as np
 import pyvista
 from dotenv import dotenv_values
 
@@ -83,3 +84,81 @@ def test_omf_from_stream_to_unstruct_all_surfaces():
         list_of_polydata.append(s)
 
     pv_plot(list_of_polydata, image_2d=True)
+
+
+@pytest.fixture(scope="module")
+def omf_project_path(tmp_path_factory):
+    omf = pytest.importorskip("omf")
+    rng = np.random.default_rng(0)
+    project = omf.Project(name='project', origin=[10., 0, 0])
+    project.elements = [
+        omf.PointSetElement(
+            name='points',
+            geometry=omf.PointSetGeometry(vertices=rng.random((10, 3))),
+            data=[omf.ScalarData(name='s', array=np.arange(10.), location='vertices')]),
+        omf.LineSetElement(
+            name='lines',
+            geometry=omf.LineSetGeometry(vertices=rng.random((4, 3)), segments=[[0, 1], [1, 2], [2, 3]]),
+            data=[omf.ScalarData(name='segment', array=[1., 2, 3], location='segments')]),
+        omf.SurfaceElement(
+            name='surface',
+            geometry=omf.SurfaceGeometry(vertices=rng.random((4, 3)), triangles=[[0, 1, 2], [1, 2, 3]],
+                                         origin=[0, 0, 1.]),
+            data=[omf.ScalarData(name='f', array=[5., 6], location='faces'),
+                  omf.MappedData(name='m', array=[0, 1, 1, 0], location='vertices',
+                                 legends=[omf.Legend(name='l', values=omf.StringArray(array=['a', 'b']))]),
+                  omf.Vector3Data(name='v', array=np.ones((4, 3)), location='vertices')]),
+        omf.SurfaceElement(
+            name='grid',
+            geometry=omf.SurfaceGridGeometry(tensor_u=[1., 1, 2], tensor_v=[1., 1], offset_w=np.arange(12.)),
+            data=[omf.ScalarData(name='g', array=np.arange(6.), location='faces')]),
+        omf.VolumeElement(
+            name='volume',
+            geometry=omf.VolumeGridGeometry(tensor_u=[1., 1], tensor_v=[1., 1, 1], tensor_w=[2., 2, 2, 2]),
+            data=[omf.ScalarData(name='c', array=np.arange(24.), location='cells')]),
+    ]
+    path = str(tmp_path_factory.mktemp('omf') / 'project.omf')
+    omf.OMFWriter(project, path)
+    return path
+
+
+def test_omf_stream_to_structs(omf_project_path):
+    from subsurface import PointSet, LineSet, StructuredGrid
+    from subsurface.modules.reader import omf_stream_to_structs
+
+    points, lines, surface, grid, volume = omf_stream_to_structs(omf_project_path, n_workers=2)
+    expected = optional_requirements.require_omf().load_project(omf_project_path)
+
+    assert isinstance(points, PointSet) and isinstance(lines, LineSet) and isinstance(surface, TriSurf)
+    assert points.data.data.attrs['name'] == 'points'
+    np.testing.assert_allclose(points.data.vertex, expected['points'].points)
+    np.testing.assert_array_equal(points.data.points_attributes['s'], np.arange(10.))
+    np.testing.assert_allclose(lines.data.vertex, expected['lines'].points)
+    np.testing.assert_array_equal(lines.data.cells, [[0, 1], [1, 2], [2, 3]])
+    np.testing.assert_array_equal(lines.data.attributes['segment'], [1, 2, 3])
+
+    # The origin of the geometry is added, omfvista ignores it
+    np.testing.assert_allclose(surface.mesh.vertex, expected['surface'].points + [0, 0, 1])
+    np.testing.assert_array_equal(surface.mesh.attributes['f'], [5, 6])
+    assert list(surface.mesh.points_attributes.columns) == ['m', 'v_x', 'v_y', 'v_z']
+    assert surface.mesh.data.attrs['legends'] == {'m': {'l': ['a', 'b']}}
+
+    # Two triangles per face of the grid
+    np.testing.assert_allclose(grid.mesh.vertex, expected['grid'].points)
+    assert grid.mesh.n_elements == 12
+    np.testing.assert_array_equal(grid.mesh.attributes['g'], np.repeat(np.arange(6.), 2))
+    np.testing.assert_allclose(pyvista.PolyData(grid.mesh.vertex, np.insert(grid.mesh.cells, 0, 3, axis=1)).area,
+                               expected['grid'].area)
+
+    assert isinstance(volume, StructuredGrid)
+    np.testing.assert_array_equal(volume.ds.data['x'], [10.5, 11.5])
+    np.testing.assert_array_equal(volume.ds.data['z'], [1, 3, 5, 7])
+    np.testing.assert_array_equal(volume.ds.data['c'].values.ravel('F'), expected['volume']['c'])
+
+
+def test_omf_stream_to_unstructs(omf_project_path):
+    with open(omf_project_path, "rb") as stream:
+        list_unstructs = subsurface.modules.reader.omf_stream_to_unstructs(stream)
+
+    assert [unstruct.data.attrs['name'] for unstruct in list_unstructs] == ['surface']
+    assert list_unstructs[0].cells.shape == (2, 3)
@@ -105,5 +105,58 @@ class TestReadDxfNoPlot:
         vertex, cells, cell_attr, cell_attr_map = dxf_file_to_unstruct_input(path)
         print("Vertex shape: ", vertex.shape)
 
+    def test_read_dxf_welded(self, data_path):
+        path = data_path + '/surfaces/shafts_small.dxf'
+        from subsurface.modules.reader.mesh.dxf_reader import dxf_file_to_unstruct_input
+        vertex, cells, cell_attr, cell_attr_map = dxf_file_to_unstruct_input(path, weld_tolerance=0.)
+        soup_vertex, soup_cells, _, _ = dxf_file_to_unstruct_input(path)
+        # Faces are not welded by default
+        assert soup_vertex.shape[0] == 3 * soup_cells.shape[0]
 
+        assert vertex.shape[0] == np.unique(soup_vertex, axis=0).shape[0]
+        np.testing.assert_array_equal(vertex[cells], soup_vertex[soup_cells])
+        assert cell_attr.shape[0] == cells.shape[0]
 
+    def test_read_dxf_streaming(self, data_path):
+        path = data_path + '/surfaces/shafts_small.dxf'
+        from subsurface.modules.reader.mesh.dxf_reader import dxf_file_to_unstruct_input
+        expected = dxf_file_to_unstruct_input(path)
+        # Blocks smaller than an entity
+        with open(path, 'rb') as stream:
+            from subsurface.modules.reader.mesh._dxf_stream import read_dxf_entities
+            entities = read_dxf_entities(stream, block_size=100)
+        streamed = dxf_file_to_unstruct_input(path, streaming=True)
+
+        assert entities.triangles.cells.shape[0] == expected[1].shape[0]
+        for expected_array, array in zip(expected[:3], streamed[:3]):
+            np.testing.assert_array_equal(expected_array, array)
+        assert expected[3] == streamed[3]
+
+    def test_read_dxf_streaming_entities(self, tmp_path):
+        ezdxf = optional_requirements.require_ezdxf()
+        from subsurface.modules.reader.mesh.dxf_reader import dxf_file_to_unstruct_input, \
+            dxf_file_to_lines_unstruct_input
+
+        doc = ezdxf.new()
+        msp = doc.modelspace()
+        msp.add_3dface([(0, 0, 0), (1, 0, 0), (1, 1, 0), (1, 1, 0)], dxfattribs={'layer': 'B'})
+        msp.add_3dface([(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)], dxfattribs={'layer': 'A'})
+        msp.add_line((0, 0, 0), (5, 5, 5), dxfattribs={'layer': 'L'})
+        polyface = msp.add_polyface(dxfattribs={'layer': 'P'})
+        polyface.append_face([(0, 0, 2), (1, 0, 2), (1, 1, 2), (0, 1, 2)])
+        # Not in the model space
+        doc.blocks.new('block').add_3dface([(9, 9, 9)] * 4)
+        doc.layout().add_3dface([(7, 7, 7), (8, 7, 7), (8, 8, 7), (8, 8, 7)])
+        path = tmp_path / 'entities.dxf'
+        doc.saveas(path)
+
+        vertex, cells, cell_attr, cell_attr_map = dxf_file_to_unstruct_input(path, weld_tolerance=0., streaming=True)
+        assert cells.shape == (5, 3)
+        assert vertex.shape[0] == 11
+        assert cell_attr_map == {'A': 1, 'B': 2, 'P': 3}
+        np.testing.assert_array_equal(cell_attr, [2, 1, 1, 3, 3])
+        np.testing.assert_array_equal(vertex[cells[3]], [[0, 0, 2], [1, 0, 2], [1, 1, 2]])
+
+        vertex, cells, cell_attr, cell_attr_map = dxf_file_to_lines_unstruct_input(path)
+        np.testing.assert_array_equal(vertex[cells[0]], [[0, 0, 0], [5, 5, 5]])
+        assert cell_attr_map == {'L': 1}
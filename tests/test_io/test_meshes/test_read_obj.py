@@ -1,4 +1,5 @@
 ﻿import pytest
+import numpy as np
 import pyvista as pv
 from dotenv import dotenv_values
 
@@ -19,4 +20,43 @@ def test_read_obj():
     if plot := False:
         mesh.plot()
     
-    
\ No newline at end of file
+    
+
+
+def test_read_obj_to_trisurf(tmp_path):
+    from subsurface.modules.reader.mesh.obj_reader import obj_file_to_trisurf
+
+    path = tmp_path / 'mesh.obj'
+    path.write_bytes(
+        b"# quad, a triangle with relative indices and a triangle on a seam of the texture\r\n"
+        b"mtllib mesh.mtl\r\nv 0 0 0\r\nv 1 0 0\r\nv 1 1 0\r\nv 0 1 0 1.0\r\n"
+        b"vt 0 0\r\nvt 1 0\r\nvt 1 1\r\nvt 0 1\r\nvt 0.5 0.5\r\nvn 0 0 1\r\nusemtl material\r\n"
+        b"f 1/1/1 2/2/1 3/3/1 4/4/1\r\nv 2 0 0\r\nf -4/-5/1 -1/-1/1 -3/-4/1\r\nf 3/3/1 5/5/1 2/2/1"
+    )
+    for block_size in (7, 2 ** 20):
+        tri_surf = obj_file_to_trisurf(path, block_size=block_size)
+        np.testing.assert_array_equal(tri_surf.triangles, [[0, 1, 2], [0, 2, 3], [4, 5, 6], [2, 5, 1]])
+        # (1, 0, 0) has two texture coordinates, so it is duplicated
+        np.testing.assert_array_equal(tri_surf.mesh.vertex[4:], [[1, 0, 0], [2, 0, 0], [1, 1, 0]])
+        np.testing.assert_array_equal(tri_surf.mesh.points_attributes[['u', 'v']],
+                                      [[0, 0], [1, 0], [1, 1], [0, 1], [0, 0], [.5, .5], [1, 0]])
+
+    path.write_bytes(b"v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1//1 2//1 3//1\nf 1//1 3//1 4//1\n")
+    tri_surf = obj_file_to_trisurf(path)
+    assert tri_surf.mesh.vertex.shape == (4, 3)
+    assert tri_surf.mesh.points_attributes.shape[1] == 0
+    np.testing.assert_array_equal(tri_surf.triangles, [[0, 1, 2], [0, 2, 3]])
+
+
+def test_read_obj_indented_lines_and_comments(tmp_path):
+    from subsurface.modules.reader.mesh.obj_reader import obj_file_to_trisurf
+
+    path = tmp_path / 'mesh.obj'
+    path.write_bytes(
+        b"  # indented comment\nv 0 0 0 # origin\n\tv 1 0 0\nv 1 1 0#no space\n  v 0 1 0\n"
+        b"  f 1 2 3\nf 1 3 4 # second face\n#f 1 2 4\n   \n"
+    )
+    for block_size in (5, 2 ** 20):
+        tri_surf = obj_file_to_trisurf(path, block_size=block_size)
+        np.testing.assert_array_equal(tri_surf.mesh.vertex, [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+        np.testing.assert_array_equal(tri_surf.triangles, [[0, 1, 2], [0, 2, 3]])
@@ -96,4 +96,6 @@ def test_tri_surf_from_traces_and_png_uv(data_path):
 )
 def test_line_set_from_trace(data_path):
     m = lineset_from_trace(data_path + '/profiles/Traces.shp')
+    merged = lineset_from_trace(data_path + '/profiles/Traces.shp', merge=True)
+    assert len(merged) == 1 and merged[0].n_cells == sum(mesh.n_cells for mesh in m)
     pv_plot(m, image_2d=True)
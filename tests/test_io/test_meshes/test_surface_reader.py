@@ -128,3 +128,55 @@ def test_read_from_multiple_files():
     ts = TriSurf(ud)
     s = to_pyvista_mesh(ts)
     pv_plot([s], image_2d=True)
+
+
+def test_read_single_csv_in_one_pass():
+    import io
+    import numpy as np
+    from subsurface.core.reader_helpers.readers_data import SupportedFormats
+    from subsurface.modules.reader.mesh.csv_mesh_reader import is_single_csv, mesh_csv_to_arrays
+    from subsurface.modules.reader.mesh.surface_reader import read_mesh_file_to_vertex, read_mesh_file_to_cells
+
+    fp = input_path + "/vertices_and_edges.csv"
+    reader_unstruc = ReaderUnstructuredHelper(
+        reader_vertex_args=GenericReaderFilesHelper(fp, usecols=['x', 'y', 'z']),
+        reader_cells_args=GenericReaderFilesHelper(fp, usecols=['0', '1', '2'],
+                                                   columns_map={'0': 'e1', '1': 'e2', '2': 'e3'}),
+        reader_vertex_attr_args=GenericReaderFilesHelper(fp, usecols=['z'])
+    )
+    assert is_single_csv(reader_unstruc)
+
+    vertex, cells, cells_attr, vertex_attr = mesh_csv_to_arrays(reader_unstruc, chunksize=5)
+    np.testing.assert_array_equal(vertex, read_mesh_file_to_vertex(reader_unstruc.reader_vertex_args))
+    np.testing.assert_array_equal(cells, read_mesh_file_to_cells(reader_unstruc.reader_cells_args))
+    assert cells_attr is None
+    np.testing.assert_array_equal(vertex_attr['z'], vertex[:, 2])
+
+    # A buffer can only be read once
+    with open(input_path + "/well_based_temperature.csv") as file:
+        buffer = io.StringIO(file.read())
+    reader_unstruc = ReaderUnstructuredHelper(
+        reader_vertex_args=GenericReaderFilesHelper(buffer, usecols=['x', 'y', 'z'], format=SupportedFormats.CSV),
+        reader_vertex_attr_args=GenericReaderFilesHelper(buffer, usecols=['T'], format=SupportedFormats.CSV)
+    )
+    ud = read_2d_mesh_to_unstruct(reader_unstruc, delaunay=False)
+    assert ud.points_attributes.columns.tolist() == ['T']
+
+    # Different options, so one read per helper
+    reader_unstruc.reader_vertex_attr_args = GenericReaderFilesHelper(fp, usecols=['z'])
+    assert not is_single_csv(reader_unstruc)
+
+
+def test_read_single_csv_from_bytes_buffer():
+    import io
+    import numpy as np
+    from subsurface.core.reader_helpers.readers_data import SupportedFormats
+
+    vertex = np.arange(12, dtype=float).reshape(4, 3)
+    text = "x,y,z\n" + "\n".join(",".join(str(value) for value in row) for row in vertex) + "\n"
+    for buffer in (io.BytesIO(text.encode()), io.TextIOWrapper(io.BytesIO(text.encode()))):
+        reader_unstruc = ReaderUnstructuredHelper(
+            reader_vertex_args=GenericReaderFilesHelper(buffer, usecols=['x', 'y', 'z'], format=SupportedFormats.CSV)
+        )
+        ud = read_2d_mesh_to_unstruct(reader_unstruc, delaunay=False)
+        np.testing.assert_array_equal(ud.vertex, vertex)
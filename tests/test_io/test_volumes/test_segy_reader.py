@@ -126,3 +126,51 @@ def test_plot_segy_as_struct_data_with_coords_dict(get_structured_data, get_imag
 
         s = to_pyvista_mesh(ts)
         pv_plot([s], image_2d=True)
+
+
+def test_read_segy_bulk(tmp_path):
+    segyio = optional_requirements.require_segyio()
+    file_path = input_path + '/test.segy'
+    with segyio.open(file_path, ignore_geometry=True) as segyfile:
+        traces = np.asarray([np.copy(tr) for tr in segyfile.trace[:]])
+        inlines = segyfile.attributes(segyio.TraceField.INLINE_3D)[:]
+    with segyio.open(file_path) as segyfile:
+        cube = segyio.tools.cube(segyfile)
+
+    # Small trace ranges so several threads are used
+    sd = segy_reader.read_in_segy(file_path, chunk_traces=7, n_workers=4)
+    np.testing.assert_array_equal(sd.values, traces)
+    np.testing.assert_array_equal(sd.data['inline'], inlines)
+
+    sd = segy_reader.read_in_segy(file_path, geometry=True, out=str(tmp_path / 'cube.npy'))
+    np.testing.assert_array_equal(sd.values, cube)
+    np.testing.assert_array_equal(np.load(tmp_path / 'cube.npy'), cube)
+    assert sd.data['sample'].size == cube.shape[2]
+
+
+def test_read_segy_bulk_no_geometry():
+    with pytest.raises(ValueError):
+        segy_reader.read_in_segy(input_path + '/E5_MIG_DMO_FINAL_DEPTH.sgy', geometry=True)
+
+
+def test_read_segy_integer_samples(tmp_path):
+    segyio = optional_requirements.require_segyio()
+    spec = segyio.spec()
+    spec.format, spec.samples, spec.tracecount = 3, np.arange(5), 4
+    traces = np.arange(20, dtype=np.int16).reshape(4, 5) - 10
+    file_path = str(tmp_path / 'int16.segy')
+    with segyio.create(file_path, spec) as segyfile:
+        for i, trace in enumerate(traces):
+            segyfile.header[i] = {segyio.TraceField.INLINE_3D: 1, segyio.TraceField.CROSSLINE_3D: i}
+            segyfile.trace[i] = trace
+
+    # Float32, as segyio gives
+    sd = segy_reader.read_in_segy(file_path)
+    assert sd.values.dtype == np.float32
+    np.testing.assert_array_equal(sd.values, traces)
+
+    sd = segy_reader.read_in_segy(file_path, keep_dtype=True, coords={'sample': ('y', np.arange(5) * 2.)})
+    assert sd.values.dtype == np.int16
+    np.testing.assert_array_equal(sd.values, traces)
+    np.testing.assert_array_equal(sd.data['sample'], np.arange(5) * 2.)
+    np.testing.assert_array_equal(sd.data['crossline'], np.arange(4))
@@ -40,6 +40,325 @@ def test_unstructured_data():
         print(foo)
 
 
+def test_unstructured_data_attributes_view():
+    foo = UnstructuredData.from_array(
+        vertex=np.ones((5, 3)),
+        cells=np.ones((4, 3)),
+        cells_attr=pd.DataFrame({'foo': np.arange(4.), 'bar': np.arange(4.) * 2}),
+        vertex_attr=pd.DataFrame({'baz': np.arange(5.)})
+    )
+    view = foo.cell_attributes_view
+    assert list(view) == ['foo', 'bar']
+    np.testing.assert_array_equal(view['bar'], np.arange(4.) * 2)
+    # Zero-copy columns that are only built once
+    assert np.shares_memory(view['foo'], foo.data['cell_attrs'].values)
+    assert foo.cell_attributes_view['foo'] is view['foo']
+
+    # The DataFrames are copies
+    attributes = foo.attributes
+    attributes['foo'] = -1
+    np.testing.assert_array_equal(foo.attributes['foo'], np.arange(4.))
+
+    # Writes invalidate the cache
+    foo.points_attributes = pd.DataFrame({'baz': np.arange(5.) + 10})
+    np.testing.assert_array_equal(foo.points_attributes_view['baz'], np.arange(5.) + 10)
+    foo.data = foo.data.assign_coords(cell_attr=['qux', 'bar'])
+    assert list(foo.attributes.columns) == ['qux', 'bar']
+
+    # and so do writes through the Dataset
+    foo.data['vertex_attrs'].values = np.arange(5.)[:, None] + 20
+    np.testing.assert_array_equal(foo.points_attributes['baz'], np.arange(5.) + 20)
+    foo.data['cell_attrs'].values = np.zeros((4, 2))
+    np.testing.assert_array_equal(foo.attributes['bar'], np.zeros(4))
+    np.testing.assert_array_equal(foo.cell_attributes_view['qux'], np.zeros(4))
+
+
+def test_unstructured_data_from_arrays_unchecked():
+    vertex = np.random.default_rng(0).random((5, 3))
+    cells = np.array([[0, 1, 2], [2, 3, 4]])
+    cells_attr = pd.DataFrame({'foo': [1., 2.]})
+    vertex_attr = pd.DataFrame({'bar': np.arange(5.)})
+
+    fast = UnstructuredData.from_arrays_unchecked(vertex, cells, cells_attr=cells_attr, vertex_attr=vertex_attr)
+    reference = UnstructuredData.from_array(vertex, cells, cells_attr=cells_attr, vertex_attr=vertex_attr)
+    assert fast.data.identical(reference.data)
+
+    fast = UnstructuredData.from_arrays_unchecked(vertex, "lines", vertex_attr={'bar': np.arange(5.)})
+    assert fast.data.identical(UnstructuredData.from_array(vertex, "lines", vertex_attr=vertex_attr).data)
+
+    with pytest.raises(AttributeError):
+        UnstructuredData.from_arrays_unchecked(vertex, cells, cells_attr={'foo': np.arange(3.)})
+
+    many = UnstructuredData.from_many([vertex, vertex[:3]], "points", vertex_attr=[vertex_attr, vertex_attr[:3]])
+    assert [unstruct.n_points for unstruct in many] == [5, 3]
+    assert many[1].data.identical(UnstructuredData.from_array(vertex[:3], "points", vertex_attr=vertex_attr[:3]).data)
+
+
+def test_unstructured_data_from_arrays_unchecked_public_constructor():
+    vertex = np.random.default_rng(0).random((5, 3))
+    cells = np.array([[0, 1, 2], [2, 3, 4]])
+    reference = UnstructuredData.from_array(vertex, cells, cells_attr=pd.DataFrame({'foo': [1., 2.]}))
+
+    unstruct = UnstructuredData.from_arrays_unchecked(vertex, cells, cells_attr={'foo': np.array([1., 2.])})
+    assert unstruct.data.identical(reference.data)
+    # Same Dataset as the public constructor of xarray gives from the variables
+    public = xr.Dataset(
+        {name: variable for name, variable in unstruct.data.data_vars.items()},
+        coords=xr.Coordinates(dict(unstruct.data.coords.variables), indexes=dict(unstruct.data.xindexes))
+    )
+    assert unstruct.data.identical(public)
+    assert np.shares_memory(unstruct.vertex, vertex)
+    # Same instance attributes as the checked constructor
+    assert vars(unstruct).keys() == vars(UnstructuredData(unstruct.data)).keys()
+
+
+def test_unstructured_data_concat():
+    lines = UnstructuredData.from_array(
+        vertex=np.zeros((3, 3)),
+        cells="lines",
+        cells_attr=pd.DataFrame({'foo': [1., 2.]}),
+        vertex_attr=pd.DataFrame({'bar': [1, 2, 3]})
+    )
+    other = UnstructuredData.from_array(
+        vertex=np.ones((4, 3)),
+        cells="lines",
+        vertex_attr=pd.DataFrame({'baz': [1., 2., 3., 4.], 'bar': [4, 5, 6, 7]})
+    )
+    merged = UnstructuredData.concat([lines, other], source_attr_name='source')
+
+    assert merged.n_points == 7
+    np.testing.assert_array_equal(merged.cells, [[0, 1], [1, 2], [3, 4], [4, 5], [5, 6]])
+    assert list(merged.points_attributes.columns) == ['bar', 'baz', 'source']
+    np.testing.assert_array_equal(merged.points_attributes_view['bar'], [1, 2, 3, 4, 5, 6, 7])
+    np.testing.assert_array_equal(merged.points_attributes_view['baz'], [np.nan] * 3 + [1., 2., 3., 4.])
+    np.testing.assert_array_equal(merged.cell_attributes_view['foo'], [1., 2., np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(merged.cell_attributes_view['source'], [0, 0, 1, 1, 1])
+
+    assert UnstructuredData.concat([lines]).data.identical(lines.data)
+    with pytest.raises(ValueError):
+        UnstructuredData.concat([lines, UnstructuredData.from_array(np.ones((4, 3)), cells="points")])
+
+
+def test_unstructured_data_split_by():
+    wells = UnstructuredData.from_array(
+        vertex=np.arange(18.).reshape(6, 3),
+        cells=np.array([[0, 1], [1, 2], [3, 4], [4, 5]]),
+        cells_attr=pd.DataFrame({'lith': [1., 2., 2., 1.]}),
+        vertex_attr=pd.DataFrame({'well_id': [0., 0., 0., 1., 1., 1.]})
+    )
+    per_well = wells.split_by('well_id')
+    assert list(per_well) == [0., 1.]
+    np.testing.assert_array_equal(per_well[1.].cells, [[0, 1], [1, 2]])
+    np.testing.assert_array_equal(per_well[1.].vertex, wells.vertex[3:])
+    np.testing.assert_array_equal(per_well[1.].cell_attributes_view['lith'], [2., 1.])
+    # Sorted vertex are not copied
+    assert np.shares_memory(per_well[1.].vertex, wells.vertex)
+
+    # Unsorted groups
+    shuffled = UnstructuredData.from_array(
+        vertex=np.arange(12.).reshape(4, 3),
+        cells=np.array([[0, 2], [1, 3]]),
+        vertex_attr=pd.DataFrame({'well_id': [1., 0., 1., 0.]})
+    )
+    per_well = shuffled.split_by('well_id')
+    np.testing.assert_array_equal(per_well[0.].vertex, shuffled.vertex[[1, 3]])
+    np.testing.assert_array_equal(per_well[0.].cells, [[0, 1]])
+
+    per_lith = wells.split_by('lith', cells=True)
+    np.testing.assert_array_equal(per_lith[2.].vertex, wells.vertex[[1, 2, 3, 4]])
+    np.testing.assert_array_equal(per_lith[2.].cells, [[0, 1], [2, 3]])
+    np.testing.assert_array_equal(per_lith[2.].points_attributes_view['well_id'], [0., 0., 1., 1.])
+
+    with pytest.raises(KeyError):
+        wells.split_by('foo')
+
+
+def test_unstructured_data_split_by_point_set(point_set_fixture):
+    # Float cells without vertex, as in the fixture
+    points = UnstructuredData.from_array(
+        vertex=point_set_fixture.data.vertex,
+        cells=point_set_fixture.data.cells,
+        cells_attr=point_set_fixture.data.cell_attributes,
+        vertex_attr=pd.DataFrame({'half': np.arange(point_set_fixture.n_points) % 2})
+    )
+    per_half = points.split_by('half')
+    np.testing.assert_array_equal(per_half[1].vertex, points.vertex[1::2])
+    assert per_half[1].cells.shape == (points.n_points // 2, 0)
+    np.testing.assert_array_equal(per_half[1].cell_attributes_view['foo'], np.arange(1, points.n_points, 2))
+
+    # Empty cells that are not one per point
+    points = UnstructuredData.from_array(np.arange(12.).reshape(4, 3), np.zeros((2, 0), dtype=int),
+                                         vertex_attr=pd.DataFrame({'half': [0., 1., 0., 1.]}))
+    assert points.split_by('half')[0.].cells.shape == (2, 0)
+
+
+def test_unstructured_data_spatial_index():
+    vertex = np.random.default_rng(0).random((1000, 3)) * 100
+    foo = UnstructuredData.from_array(vertex, cells="points")
+
+    distances, indices = foo.query_nearest(vertex[[3, 7]] + 1e-3)
+    np.testing.assert_array_equal(indices, [3, 7])
+
+    in_radius = foo.query_radius(vertex[0], 10.)
+    np.testing.assert_array_equal(in_radius, np.flatnonzero(np.linalg.norm(vertex - vertex[0], axis=1) <= 10.))
+
+    box_min, box_max = [10, 20, 30], [40, 50, 90]
+    inside = ((vertex >= box_min) & (vertex <= box_max)).all(axis=1)
+    np.testing.assert_array_equal(foo.query_box(box_min, box_max), np.flatnonzero(inside))
+
+    # Cached until the vertex change
+    index = foo.spatial_index
+    assert foo.spatial_index is index
+    foo.vertex = vertex + 1000
+    assert foo.spatial_index is not index
+    assert foo.query_box(box_min, box_max).size == 0
+
+
+def test_unstructured_data_crop():
+    n = 50
+    x, y = np.meshgrid(np.arange(n, dtype=float), np.arange(n, dtype=float))
+    vertex = np.column_stack([x.ravel(), y.ravel(), np.zeros(n * n)])
+    idx = np.arange(n * n).reshape(n, n)
+    a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, 1:].ravel(), idx[1:, :-1].ravel()
+    cells = np.concatenate([np.column_stack([a, b, c]), np.column_stack([a, c, d])])
+    foo = UnstructuredData.from_array(vertex, cells, vertex_attr=pd.DataFrame({'x': vertex[:, 0]}))
+
+    def area(unstruct):
+        p = unstruct.vertex[unstruct.cells]
+        return 0.5 * np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])[:, 2]
+
+    cropped = foo.crop(extent=[10.5, 20.5, 5.2, 30.7])
+    assert area(cropped).sum() == 9 * 24
+    assert cropped.n_points == 10 * 25
+
+    clipped = foo.crop(extent=[10.5, 20.5, 5.2, 30.7], clip=True)
+    np.testing.assert_allclose(area(clipped).sum(), 10 * 25.5)
+    assert (area(clipped) > 0).all()
+    np.testing.assert_allclose(clipped.points_attributes_view['x'], clipped.vertex[:, 0])
+
+    # Same vertex and cells with the cached spatial index
+    foo.spatial_index
+    assert foo.crop(extent=[10.5, 20.5, 5.2, 30.7]).data.identical(cropped.data)
+
+    polygon = np.array([[10, 10], [30, 12], [25, 35], [8, 30]])
+    clipped = foo.crop(polygon=polygon, clip=True)
+    np.testing.assert_allclose(area(clipped).sum(), 410.)
+    assert len(np.unique(clipped.vertex, axis=0)) == clipped.n_points
+
+    points = UnstructuredData.from_array(vertex, cells="points")
+    assert points.crop(extent=[0, 3, 0, 3, -1, 1]).n_points == 16
+
+    with pytest.raises(ValueError):
+        foo.crop(polygon=[[0, 0], [10, 0], [5, 1], [5, 10]], clip=True)
+
+
+def test_unstructured_data_crop_point_set(point_set_fixture):
+    points = point_set_fixture.data
+    inside = (points.vertex[:, :2] <= .5).all(axis=1)
+    cropped = points.crop(extent=[0, .5, 0, .5])
+    np.testing.assert_array_equal(cropped.vertex, points.vertex[inside])
+    assert cropped.cells.shape == (inside.sum(), 0)
+    np.testing.assert_array_equal(cropped.cell_attributes_view['foo'], np.flatnonzero(inside))
+
+    # Empty cells that are not one per point are rebuilt, without attributes
+    x, y = np.meshgrid(np.arange(10.), np.arange(10.))
+    vertex = np.column_stack([x.ravel(), y.ravel(), np.zeros(100)])
+    points = UnstructuredData.from_array(vertex, np.zeros((3, 0), dtype=int), cells_attr=pd.DataFrame({'a': [1, 2, 3]}))
+    cropped = points.crop(extent=[0, 3, 0, 3])
+    assert cropped.n_points == 16
+    assert cropped.cells.shape == (16, 0)
+
+
+def test_unstructured_data_weld():
+    vertex = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=float)
+    # Triangle soup of two triangles, with some noise on the shared vertex
+    soup = np.concatenate([vertex[[0, 1, 2]], vertex[[1, 3, 2]] + 1e-9, vertex[[0, 0, 3]]])
+    foo = UnstructuredData.from_array(
+        soup, np.arange(9).reshape(-1, 3),
+        vertex_attr=pd.DataFrame({'id': np.arange(9)}),
+        cells_attr=pd.DataFrame({'layer': [1, 2, 3]})
+    )
+
+    welded = foo.weld(1e-6)
+    np.testing.assert_allclose(welded.vertex, vertex, atol=1e-8)
+    # The last triangle collapses
+    np.testing.assert_array_equal(welded.cells, [[0, 1, 2], [1, 3, 2]])
+    np.testing.assert_array_equal(welded.cell_attributes['layer'], [1, 2])
+    np.testing.assert_array_equal(welded.points_attributes['id'], [0, 1, 2, 4])
+    np.testing.assert_allclose(foo.weld(1e-6, "mean").points_attributes['id'], [13 / 3, 2, 3.5, 6])
+
+    # Exact welding does not merge the noisy vertex
+    assert foo.weld().n_points == 7
+
+    points = UnstructuredData.from_array(soup, cells="points").weld(1e-6)
+    np.testing.assert_array_equal(points.cells.ravel(), np.arange(4))
+
+
+def _grid_surface(n: int) -> UnstructuredData:
+    x, y = np.meshgrid(np.linspace(0, 100, n), np.linspace(0, 100, n))
+    vertex = np.column_stack([x.ravel(), y.ravel(), np.sin(x.ravel() / 10)])
+    corner = (np.arange(n - 1)[:, None] * n + np.arange(n - 1)).ravel()
+    cells = np.concatenate([np.column_stack([corner, corner + 1, corner + n + 1]),
+                            np.column_stack([corner, corner + n + 1, corner + n])])
+    return UnstructuredData.from_array(
+        vertex, cells,
+        vertex_attr=pd.DataFrame({'z': vertex[:, 2]}),
+        cells_attr=pd.DataFrame({'half': np.repeat([0, 1], corner.size)})
+    )
+
+
+def test_unstructured_data_decimate():
+    foo = _grid_surface(101)
+    decimated = foo.decimate(4)
+    assert decimated.n_elements < foo.n_elements / 4
+    # Every vertex is used, and no triangle collapses or repeats
+    assert np.unique(decimated.cells).size == decimated.n_points
+    sorted_cells = np.sort(decimated.cells, axis=1)
+    assert (sorted_cells[:, 1:] != sorted_cells[:, :-1]).all()
+    assert np.unique(sorted_cells, axis=0).shape[0] == decimated.n_elements
+    # Attributes are kept: averaged on the vertex, as they were on the triangles
+    np.testing.assert_allclose(decimated.points_attributes['z'], decimated.vertex[:, 2])
+    assert set(decimated.cell_attributes['half']) == {0, 1}
+
+    with pytest.raises(ValueError):
+        foo.decimate(0)
+
+
+def test_trisurf_lod_pyramid():
+    tri_surf = TriSurf(_grid_surface(101))
+    pyramid = tri_surf.lod_pyramid(min_triangles=500)
+    assert pyramid[0] is tri_surf.mesh
+    n_triangles = pyramid.n_triangles
+    assert n_triangles[-1] <= 500 < n_triangles[-2]
+    assert all(coarse < fine for fine, coarse in zip(n_triangles, n_triangles[1:]))
+    # Cached until the mesh changes
+    assert tri_surf.lod_pyramid(min_triangles=500) is pyramid
+
+    assert pyramid.select() == 0
+    assert pyramid.select(n_triangles[1]) == 1
+    assert pyramid.select(1) == pyramid.coarsest_level
+    assert tri_surf.mesh_for_budget(n_triangles[0]) is tri_surf.mesh
+    assert tri_surf.mesh_for_budget(5000).n_elements <= 5000
+
+
+def test_trisurf_lod_pyramid_invalidation():
+    tri_surf = TriSurf(_grid_surface(101))
+    assert (tri_surf.mesh_for_budget(5000).points_attributes['z'] != 1).any()
+
+    # New attributes
+    tri_surf.mesh.points_attributes = tri_surf.mesh.points_attributes.assign(z=1.)
+    np.testing.assert_array_equal(tri_surf.mesh_for_budget(5000).points_attributes['z'], 1.)
+
+    # Vertex replaced through the Dataset
+    tri_surf.mesh.data['vertex'].values = tri_surf.mesh.vertex + 1000
+    assert (tri_surf.mesh_for_budget(5000).vertex[:, 0] >= 1000).all()
+
+    # In place writes need a reset
+    tri_surf.mesh.vertex[:, 0] -= 1000
+    tri_surf.reset_lod_pyramid()
+    assert (tri_surf.mesh_for_budget(5000).vertex[:, 0] < 1000).all()
+
+
 def test_unstructured_data_no_cells():
     foo = UnstructuredData.from_array(np.ones((5, 3)), cells="points")
     print(foo)
@@ -201,3 +520,27 @@ def test_remove_outliers(data_path):
     replace_outliers(struct, 'topography', 0.99)
     print(struct.data['topography'])
     print(struct.data['topography'].min())
+
+
+def test_read_struct_lazy(data_path, tmp_path):
+    pytest.importorskip("dask")
+    from subsurface.modules.writer import base_structs_to_binary_file
+
+    eager = read_struct(data_path + '/interpolator_regular_grid.nc')
+    lazy = read_struct(data_path + '/interpolator_regular_grid.nc', chunks={'X': 16, 'Y': 16, 'Z': 16})
+    lazy.data_array_name = eager.data_array_name = 'scalar_field_matrix'
+    assert lazy.is_lazy and not eager.is_lazy
+
+    attribute_slice = {'Features': 'Default series'}
+    eager_mesh = to_pyvista_grid(StructuredGrid(eager), 'scalar_field_matrix', attribute_slice)
+    lazy_mesh = to_pyvista_grid(StructuredGrid(lazy), 'scalar_field_matrix', attribute_slice)
+    np.testing.assert_array_equal(lazy_mesh['scalar_field_matrix'], eager_mesh['scalar_field_matrix'])
+
+    base_structs_to_binary_file(str(tmp_path / "eager"), eager)
+    base_structs_to_binary_file(str(tmp_path / "lazy"), lazy)
+    assert (tmp_path / "lazy.le").read_bytes() == (tmp_path / "eager.le").read_bytes()
+
+    lazy_data = replace_outliers(lazy, 'scalar_field_matrix', 0.9, replace_for='max')
+    eager_data = replace_outliers(eager, 'scalar_field_matrix', 0.9, replace_for='max')
+    assert lazy_data['scalar_field_matrix'].chunks is not None
+    np.testing.assert_allclose(lazy_data['scalar_field_matrix'].values, eager_data['scalar_field_matrix'].values)
@@ -1,9 +1,11 @@
 import pytest
 
-from subsurface.core.structs import StructuredGrid
+from subsurface.core.structs import StructuredGrid, LineSet
 from subsurface.core.structs.base_structures import UnstructuredData, StructuredData
 from subsurface.modules.visualization.to_pyvista import to_pyvista_points, pv_plot, \
-    to_pyvista_mesh, to_pyvista_line, to_pyvista_tetra, to_pyvista_grid
+    to_pyvista_mesh, to_pyvista_line, to_pyvista_tetra, to_pyvista_grid, to_pyvista_tubes, \
+    to_pyvista_line_impostors, PyvistaScalarType
+import numpy as np
 import xarray as xr
 
 pv = pytest.importorskip("pyvista")
@@ -19,12 +21,52 @@ def test_pyvista_tri_surf(tri_surf):
     pv_plot([s], image_2d=True)
 
 
+def test_pyvista_tri_surf_shares_attributes():
+    from subsurface.core.structs import TriSurf
+
+    unstruct = UnstructuredData.from_arrays_unchecked(
+        vertex=np.random.default_rng(0).random((4, 3)),
+        cells=np.array([[0, 1, 2], [1, 2, 3]]),
+        cells_attr={'id': np.arange(2.), 'value': np.ones(2)},
+        vertex_attr={'z': np.arange(4.)}
+    )
+    s = to_pyvista_mesh(TriSurf(unstruct))
+    # Attributes are stored column-major, so VTK takes them without copies
+    for name in ['id', 'value']:
+        assert np.shares_memory(s.cell_data[name], unstruct.data['cell_attrs'].values)
+    assert np.shares_memory(s.point_data['z'], unstruct.data['vertex_attrs'].values)
+
+
 def test_pyvista_line_set(line_set):
     s = to_pyvista_line(line_set, as_tube=True)
 
     pv_plot([s], image_2d=True, add_mesh_kwargs={'line_width': 5})
 
 
+def test_pyvista_line_set_batched_tubes(line_set):
+    n_segments = line_set.data.n_elements
+    s = to_pyvista_tubes(line_set, radius=0.2, n_sides=5, scalar_type=PyvistaScalarType.CELL, active_scalar='foo')
+    assert s.n_cells == n_segments * 10
+    np.testing.assert_array_equal(s.cell_data['foo'], np.repeat(line_set.data.cell_attributes_view['foo'], 10))
+    # Every tube vertex is at the radius of its segment, and consecutive segments share their ring
+    axis_vertex = line_set.data.vertex[line_set.data.cells].repeat(5, axis=1).reshape(-1, 3)
+    np.testing.assert_allclose(np.linalg.norm(s.points - axis_vertex, axis=1), 0.2)
+    np.testing.assert_allclose(s.points[5:10], s.points[10:15])
+    pv_plot([s], image_2d=True)
+
+    radius = np.linspace(0.1, 0.5, n_segments)
+    line_set = LineSet(UnstructuredData.from_arrays_unchecked(line_set.data.vertex, line_set.data.cells,
+                                                             cells_attr={'radius': radius}))
+    s = to_pyvista_tubes(line_set, radius_attr='radius', n_sides=3)
+    np.testing.assert_allclose(np.linalg.norm(s.points[::6] - line_set.data.vertex[line_set.data.cells[:, 0]], axis=1),
+                               radius)
+
+    s = to_pyvista_line_impostors(line_set, radius_attr='radius')
+    assert s.n_lines == n_segments
+    np.testing.assert_array_equal(s.cell_data['radius'], radius)
+    pv_plot([s], image_2d=True, add_mesh_kwargs={'render_lines_as_tubes': True, 'line_width': 5})
+
+
 def test_pyvista_tetra(tetra_set):
     s = to_pyvista_tetra(tetra_set)
     pv_plot([s], image_2d=True)